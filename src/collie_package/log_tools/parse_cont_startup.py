@@ -1,4 +1,7 @@
+import bisect
+import gzip
 import json
+import heapq
 import html
 import io
 import os
@@ -6,12 +9,20 @@ import re
 import shutil
 import tempfile
 import zipfile
-from collections import defaultdict
+from collections import Counter, defaultdict
 from contextlib import contextmanager, redirect_stdout, redirect_stderr
 from datetime import datetime, timedelta
+from functools import lru_cache
 from importlib import resources
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - 运行环境未安装 orjson 时降级为标准库 json
+    orjson = None
+
 from .. import state
 from ..config_loader import (
     load_app_list_config,
@@ -368,6 +379,9 @@ WM_RESUMED_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# min_score 描述中括号内的标记，如 "xxx(FOREGROUND)" -> FOREGROUND
+MIN_SCORE_PAREN_PATTERN = re.compile(r"\(([^()]*)\)")
+
 HOME_PACKAGES = set(
     _PARSE_RULES.get(
         "home_packages",
@@ -479,10 +493,11 @@ def _within_time_range(ts_obj: Optional[datetime], start_time: Optional[datetime
     return True
 
 
+@lru_cache(maxsize=4096)
 def _base_name(name: str) -> str:
     if not isinstance(name, str):
         return ""
-    return name.split(":")[0]
+    return name.partition(":")[0]
 
 
 def _ordered_startup_list() -> List[str]:
@@ -1395,6 +1410,42 @@ def _calc_stats(values):
         'max': float(vals[-1]),
     }
 
+
+_MEM_METRIC_KEYS = ('mem_free', 'file_pages', 'anon_pages', 'swap_free')
+
+
+def _calc_stats_batch(sample_dict, metrics=_MEM_METRIC_KEYS):
+    """一次性计算多个指标的统计值，返回 {metric: stats}，缺失指标按空样本处理"""
+    get = sample_dict.get
+    return {metric: _calc_stats(get(metric) or ()) for metric in metrics}
+
+
+def _build_dist_curve(values, max_points=80):
+    """将样本排序后等距抽取至多 max_points 个点，返回分布曲线 {labels, values, count}"""
+    vals = [iv for iv in map(_safe_int, values or ()) if iv is not None]
+    vals.sort()
+    n = len(vals)
+    if n == 0:
+        return {"labels": [], "values": [], "count": 0}
+    if n == 1:
+        return {"labels": ["100%"], "values": [vals[0]], "count": 1}
+
+    points = min(max_points, n)
+    span = points - 1
+    idxs = [round(i * (n - 1) / span) for i in range(points)]
+    return {
+        "labels": [f"{int(round((idx + 1) * 100 / n))}%" for idx in idxs],
+        "values": [vals[idx] for idx in idxs],
+        "count": n,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _format_thousands(n: int) -> str:
+    """整数千分位格式化；报表单元格里的计数大量重复（0、小计数），缓存结果直接复用"""
+    return f"{n:,}"
+
+
 def _format_duration(seconds: float) -> str:
     """将秒数格式化为简洁的 h/m/s 字符串"""
     if seconds is None:
@@ -1416,6 +1467,13 @@ def _format_dt(dt: Optional[datetime]) -> str:
     return dt.strftime("%m-%d %H:%M:%S")
 
 
+def _format_ts_ms(dt: datetime) -> str:
+    """格式化为 MM-DD HH:MM:SS.mmm，等价于 strftime("%m-%d %H:%M:%S.%f")[:-3]，但省去格式串解析"""
+    return "%02d-%02d %02d:%02d:%02d.%03d" % (
+        dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond // 1000
+    )
+
+
 def merge_kill_amkill(events, window_seconds: int = 3):
     """
     合并同一事件的 kill ki 与 am_kill：优先保留 kill ki 内容，
@@ -1548,9 +1606,14 @@ def merge_kill_amkill(events, window_seconds: int = 3):
     result.sort(key=lambda x: x['time'])
     return result
 
+
+# 详细事件之间的分隔线
+_SEPARATOR = "-" * 80
+
+
 def format_event_detail(event, idx):
     """格式化单个事件为文本"""
-    time_str = event['time'].strftime("%m-%d %H:%M:%S.%f")[:-3]
+    time_str = _format_ts_ms(event['time'])
     
     # 高亮显示特定进程
     proc_name = event.get('full_name', event['process_name'])
@@ -1585,15 +1648,17 @@ def format_event_detail(event, idx):
     else:
         event_type = event.get('type', '未知事件')
     
-    # 构造详细信息
-    details = []
+    # 构造详细信息（表头两行直接作为列表开头，结尾统一 join，避免再拼一个新列表）
+    details = [f"事件 {idx+1}", f"{time_str}  {event_type}  {proc_display}"]
     if event['type'] == 'start':
         d = event.get("details", {})
-        details.append(f"  进程信息:")
-        details.append(f"    PID: {d.get('pid', '')}, UID: {d.get('uid', '')}")
-        details.append(f"    启动方式: {d.get('start_type', '')}")
-        details.append(f"    组件: {d.get('component', '')}")
-        details.append(f"    是否子进程: {'是' if event['is_subprocess'] else '否'}")
+        details.extend((
+            "  进程信息:",
+            f"    PID: {d.get('pid', '')}, UID: {d.get('uid', '')}",
+            f"    启动方式: {d.get('start_type', '')}",
+            f"    组件: {d.get('component', '')}",
+            f"    是否子进程: {'是' if event['is_subprocess'] else '否'}",
+        ))
         if d.get("displayed_component"):
             details.append(f"    Displayed组件: {d.get('displayed_component', '')}")
         if d.get("displayed_latency"):
@@ -1614,11 +1679,13 @@ def format_event_detail(event, idx):
             details.append(f"    启动前后台存活列表: {', '.join(alive_list) if alive_list else '无'}")
     elif event['type'] == 'proc_start_only':
         d = event.get("details", {})
-        details.append("  进程信息:")
-        details.append(f"    PID: {d.get('pid', '')}, UID: {d.get('uid', '')}")
-        details.append(f"    启动方式: {d.get('start_type', '')}")
-        details.append(f"    组件: {d.get('component', '')}")
-        details.append("    判定: 疑似后台启动（未匹配到WM前台切换）")
+        details.extend((
+            "  进程信息:",
+            f"    PID: {d.get('pid', '')}, UID: {d.get('uid', '')}",
+            f"    启动方式: {d.get('start_type', '')}",
+            f"    组件: {d.get('component', '')}",
+            "    判定: 疑似后台启动（未匹配到WM前台切换）",
+        ))
     elif event['type'] == 'lmk':
         d = event['details']
         kill_reason = d.get("reason") or d.get("kill_reason") or "未知"
@@ -1626,12 +1693,14 @@ def format_event_detail(event, idx):
         def kv(label: str, value: str) -> str:
             return f"    {label:<14}: {value}"
 
-        details.append("  进程信息:")
-        details.append(kv("pid", d.get("pid", "")))
-        details.append(kv("adj", d.get("adj", "")))
-        details.append(kv("min_adj", d.get("min_adj", "")))
-        details.append(kv("rss_kb", d.get("rss_kb", "")))
-        details.append(kv("reason", kill_reason))
+        details.extend((
+            "  进程信息:",
+            kv("pid", d.get("pid", "")),
+            kv("adj", d.get("adj", "")),
+            kv("min_adj", d.get("min_adj", "")),
+            kv("rss_kb", d.get("rss_kb", "")),
+            kv("reason", kill_reason),
+        ))
         if d.get("tail"):
             details.append(kv("tail", d.get("tail", "")))
 
@@ -1667,19 +1736,21 @@ def format_event_detail(event, idx):
                     if val == "":
                         continue
                     kv_lines.append(f"      {label:<12}: {val}")
-                # 组合展示文件页、匿名页
-                af = _safe_int(parsed_fields.get("active_file_kb"))
-                inf = _safe_int(parsed_fields.get("inactive_file_kb"))
-                if af is not None and inf is not None:
-                    kv_lines.append(f"      file_pages   : {af + inf} (inactive {inf} active {af})")
-                aa = _safe_int(parsed_fields.get("active_anon_kb"))
-                ina = _safe_int(parsed_fields.get("inactive_anon_kb"))
-                if aa is not None and ina is not None:
-                    kv_lines.append(f"      anon_pages   : {aa + ina} (inactive {ina} active {aa})")
+                # 组合展示文件页、匿名页（精简格式 killinfo 不含这些字段，先判断键存在再解析）
+                if "active_file_kb" in parsed_fields and "inactive_file_kb" in parsed_fields:
+                    af = _safe_int(parsed_fields["active_file_kb"])
+                    inf = _safe_int(parsed_fields["inactive_file_kb"])
+                    if af is not None and inf is not None:
+                        kv_lines.append(f"      file_pages   : {af + inf} (inactive {inf} active {af})")
+                if "active_anon_kb" in parsed_fields and "inactive_anon_kb" in parsed_fields:
+                    aa = _safe_int(parsed_fields["active_anon_kb"])
+                    ina = _safe_int(parsed_fields["inactive_anon_kb"])
+                    if aa is not None and ina is not None:
+                        kv_lines.append(f"      anon_pages   : {aa + ina} (inactive {ina} active {aa})")
                 if not kv_lines:
                     raw_line = "      raw: [" + ", ".join(ki.get("raw_fields", [])) + "]"
                     kv_lines.append(raw_line)
-                ki_time = ki["time"].strftime("%m-%d %H:%M:%S.%f")[:-3]
+                ki_time = _format_ts_ms(ki["time"])
                 details.append(f"    {ki_time}")
                 details.extend(kv_lines)
         else:
@@ -1693,50 +1764,51 @@ def format_event_detail(event, idx):
         imp_mark = f" [重要进程]" if p.get('isImp', 'false') == 'true' else ''
         main_mark = f" [主进程]" if p.get('isMain', 'false') == 'true' else ''
         
-        details.append(f"  查杀信息:")
-        details.append(f"    查杀类型: {k.get('killTypeDesc', k['killType'])} ({k['killType']})")  
-        details.append(f"    可查杀最低分值: {k['minScore']} ({k.get('minScoreDesc', describe_min_score(k['minScore']))})")
-        details.append(f"    可查杀进程数: {k['killableProcCount']}")
-        details.append(f"    重要应用数量: {k['importantAppCount']}")
-        details.append(f"    本次已清理进程数: {k['killedCount']}")
-        details.append(f"    已清理重要进程数: {k['killedImpCount']}")
-        details.append(f"    跳过计数: {k['skipCount']}")
-        details.append(f"    目标内存: {k['targetMem']} KB")
-        details.append(f"    需要释放内存: {k['targetReleaseMem']} KB")
+        details.extend((
+            "  查杀信息:",
+            f"    查杀类型: {k.get('killTypeDesc', k['killType'])} ({k['killType']})",
+            f"    可查杀最低分值: {k['minScore']} ({k.get('minScoreDesc', describe_min_score(k['minScore']))})",
+            f"    可查杀进程数: {k['killableProcCount']}",
+            f"    重要应用数量: {k['importantAppCount']}",
+            f"    本次已清理进程数: {k['killedCount']}",
+            f"    已清理重要进程数: {k['killedImpCount']}",
+            f"    跳过计数: {k['skipCount']}",
+            f"    目标内存: {k['targetMem']} KB",
+            f"    需要释放内存: {k['targetReleaseMem']} KB",
+        ))
         if event['type'] == 'kill':
             details.append(f"    已释放内存: {k['killedPss']} KB")
         
         if event['type'] != 'trig':  # trig事件没有具体进程信息
-            details.append(f"  进程信息:")
-            details.append(f"    UID: {p['uid']}, PID: {p['pid']}{imp_mark}{main_mark}")
-            details.append(f"    进程优先级: {p['adj']}")
-            details.append(f"    评分: {p['score']}")
-            details.append(f"    PSS内存: {p['pss']} KB")
-            details.append(f"    交换内存: {p['swapUsed']} KB")
+            details.extend((
+                "  进程信息:",
+                f"    UID: {p['uid']}, PID: {p['pid']}{imp_mark}{main_mark}",
+                f"    进程优先级: {p['adj']}",
+                f"    评分: {p['score']}",
+                f"    PSS内存: {p['pss']} KB",
+                f"    交换内存: {p['swapUsed']} KB",
+            ))
             if event['type'] == 'kill':
                 details.append(f"    实际释放内存: {p['ret']} KB")
         
-        details.append(f"  当前内存信息:")
-        details.append(f"    空闲内存: {m['memFree']} KB")
-        details.append(f"    可用内存: {m['memAvail']} KB")
-        details.append(f"    文件缓存: {m['memFile']} KB")
-        details.append(f"    匿名内存: {m['memAnon']} KB")
-        details.append(f"    空闲交换区: {m['memSwapFree']} KB")
-        details.append(f"    CMA空闲内存: {m['cmaFree']} KB")
-    
-    # 组合所有部分
-    result = [
-        f"事件 {idx+1}",
-        f"{time_str}  {event_type}  {proc_display}",
-        *details,
-        "-" * 80
-    ]
+        # 内存段合并为一个多行字符串；缺字段时显示 ? 而不是整条事件报错
+        mget = m.get
+        details.append(
+            "  当前内存信息:\n"
+            f"    空闲内存: {mget('memFree', '?')} KB\n"
+            f"    可用内存: {mget('memAvail', '?')} KB\n"
+            f"    文件缓存: {mget('memFile', '?')} KB\n"
+            f"    匿名内存: {mget('memAnon', '?')} KB\n"
+            f"    空闲交换区: {mget('memSwapFree', '?')} KB\n"
+            f"    CMA空闲内存: {mget('cmaFree', '?')} KB"
+        )
     
-    return "\n".join(result)
+    details.append(_SEPARATOR)
+    return "\n".join(details)
 
 def format_event_simple(event, idx):
     """格式化单个事件为文本"""
-    time_str = event['time'].strftime("%m-%d %H:%M:%S.%f")[:-3]
+    time_str = _format_ts_ms(event['time'])
     
     # 高亮显示特定进程
     proc_name = event.get('full_name', event['process_name'])
@@ -1777,52 +1849,59 @@ def format_event_simple(event, idx):
         event_type = event.get('type', '未知事件')
 
     
-    # 组合所有部分
-    result = [
-        f"事件 {idx+1} {time_str}  {event_type}  {proc_display}"
-    ]
-    
-    return "\n".join(result)
+    return f"事件 {idx+1} {time_str}  {event_type}  {proc_display}"
+
+# 事件时间戳基准（不依赖本地时区，避免 datetime.timestamp() 受夏令时影响）
+_TS_EPOCH = datetime(2000, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _new_residency_state() -> dict:
+    """高亮主进程驻留统计的初始状态，alive_since 为事件 _ts_us 整数微秒"""
+    return {'durations': [], 'starts': 0, 'kills': 0, 'alive': False, 'alive_since': None}
+
 
 def compute_summary_data(events):
     """计算统计数据，返回 summary 字典，供文本/HTML复用"""
+    # 各类型事件数量用 Counter 一次统计，代替逐类型的多次全量遍历
+    type_counts = Counter(e['type'] for e in events)
     summary = {
         'total_events': len(events),
-        'start_count': sum(1 for e in events if e['type'] == 'start'),
-        'kill_count': sum(1 for e in events if e['type'] == 'kill'),
-        'lmk_count': sum(1 for e in events if e['type'] == 'lmk'),
-        'trig_count': sum(1 for e in events if e['type'] == 'trig'),
-        'skip_count': sum(1 for e in events if e['type'] == 'skip'),
-        'proc_start_only_count': sum(1 for e in events if e['type'] == 'proc_start_only'),
+        'start_count': type_counts['start'],
+        'kill_count': type_counts['kill'],
+        'lmk_count': type_counts['lmk'],
+        'trig_count': type_counts['trig'],
+        'skip_count': type_counts['skip'],
+        'proc_start_only_count': type_counts['proc_start_only'],
         'subprocess_start_count': sum(1 for e in events if e['type'] == 'start' and e['is_subprocess']),
         'highlight_stats': {p: {'start': 0, 'kill': 0, 'lmk': 0, 'skip': 0} for p in HIGHLIGHT_PROCESSES},
         'total_release_mem': 0,
         'total_killed': 0,
         'killed_imp_count': 0,
-        'top_killed': {},
-        'top_lmk_killed': {},
-        'top_skipped': {},
-        'kill_type_stats': {},  # 新增：killType统计
-        'adj_stats': {},  # 新增：adj统计
-        'min_score_stats': {},  # 新增：minScore统计
-        'lmk_reason_stats': defaultdict(int),
-        'lmk_adj_stats': defaultdict(int),
+        'top_killed': Counter(),
+        'top_lmk_killed': Counter(),
+        'top_skipped': Counter(),
+        'kill_type_stats': Counter(),  # 新增：killType统计
+        'adj_stats': Counter(),  # 新增：adj统计
+        'min_score_stats': Counter(),  # 新增：minScore统计
+        'lmk_reason_stats': Counter(),
+        'lmk_adj_stats': Counter(),
         'main_proc_kill_stats': defaultdict(lambda: {'main_kill': 0, 'main_lmk': 0, 'sub_kill': 0, 'sub_lmk': 0}),
         # 主进程专用统计
         'main_overall': {
             'kill': 0,
             'lmk': 0,
-            'kill_type_stats': defaultdict(int),
-            'adj_stats': defaultdict(int),
-            'lmk_adj_stats': defaultdict(int),
-            'min_score_stats': defaultdict(int),
+            'kill_type_stats': Counter(),
+            'adj_stats': Counter(),
+            'lmk_adj_stats': Counter(),
+            'min_score_stats': Counter(),
         },
         'main_proc_detail': defaultdict(lambda: {
             'kill': 0,
             'lmk': 0,
-            'kill_type_stats': defaultdict(int),
-            'adj_stats': defaultdict(int),
-            'lmk_adj_stats': defaultdict(int),
+            'kill_type_stats': Counter(),
+            'adj_stats': Counter(),
+            'lmk_adj_stats': Counter(),
         }),
         # 高亮进程统计（按主包名聚合，含主+子进程）
         'highlight_overall': {
@@ -1830,13 +1909,13 @@ def compute_summary_data(events):
             'main_lmk': 0,
             'sub_kill': 0,
             'sub_lmk': 0,
-            'main_kill_type_stats': defaultdict(int),
-            'sub_kill_type_stats': defaultdict(int),
-            'main_adj_stats': defaultdict(int),
-            'sub_adj_stats': defaultdict(int),
-            'main_lmk_adj_stats': defaultdict(int),
-            'sub_lmk_adj_stats': defaultdict(int),
-            'main_min_score_stats': defaultdict(int),
+            'main_kill_type_stats': Counter(),
+            'sub_kill_type_stats': Counter(),
+            'main_adj_stats': Counter(),
+            'sub_adj_stats': Counter(),
+            'main_lmk_adj_stats': Counter(),
+            'sub_lmk_adj_stats': Counter(),
+            'main_min_score_stats': Counter(),
         },
         'highlight_event_ids': defaultdict(lambda: {'kill': [], 'lmk': []}),
         'highlight_proc_detail': defaultdict(lambda: {
@@ -1844,12 +1923,12 @@ def compute_summary_data(events):
             'main_lmk': 0,
             'sub_kill': 0,
             'sub_lmk': 0,
-            'main_kill_type_stats': defaultdict(int),
-            'sub_kill_type_stats': defaultdict(int),
-            'main_adj_stats': defaultdict(int),
-            'sub_adj_stats': defaultdict(int),
-            'main_lmk_adj_stats': defaultdict(int),
-            'sub_lmk_adj_stats': defaultdict(int),
+            'main_kill_type_stats': Counter(),
+            'sub_kill_type_stats': Counter(),
+            'main_adj_stats': Counter(),
+            'sub_adj_stats': Counter(),
+            'main_lmk_adj_stats': Counter(),
+            'sub_lmk_adj_stats': Counter(),
         }),
         # 新增：被杀时的平均内存指标
         'mem_metrics': {
@@ -1870,7 +1949,7 @@ def compute_summary_data(events):
         'low_memfree_kills': [],
         # 新增：高亮主进程驻留统计
         'highlight_residency_stats': {
-            'per_proc': defaultdict(lambda: {'durations': [], 'starts': 0, 'kills': 0, 'alive': False, 'alive_since': None}),
+            'per_proc': {},
             'alive_now': [],
             'all_durations': [],
             'avg_duration_sec': 0.0,
@@ -1896,29 +1975,46 @@ def compute_summary_data(events):
                 bucket[k] += val
                 samples[k].append(val)
     
+    # 按进程的热点计数用元组键扁平累加，省去多层 defaultdict 的逐级查找，循环结束后再还原为嵌套结构
+    proc_counters = defaultdict(int)
+    event_ids = defaultdict(list)
+
     # 辅助：高亮驻留状态表
     hl_res_state = summary['highlight_residency_stats']['per_proc']
 
-        # 统计高亮进程和内存信息
+    # 预先为每个事件计算一次整数微秒时间戳，驻留时长直接做数值减法，避免逐次构造 timedelta
+    # （用整数微秒而非浮点秒，结果与 timedelta.total_seconds() 逐位一致）
+    for event in events:
+        event['_ts_us'] = (event['time'] - _TS_EPOCH) // _ONE_US
+
+    # 高亮进程成员判断用 frozenset，避免对列表做 O(k) 线性查找
+    hl_set = frozenset(HIGHLIGHT_PROCESSES)
+
+    # 统计高亮进程和内存信息
     for idx, event in enumerate(events):
-        if event['process_name'] in HIGHLIGHT_PROCESSES:
-            if event['type'] == 'start':
-                summary['highlight_stats'][event['process_name']]['start'] += 1
-            elif event['type'] == 'kill':
-                summary['highlight_stats'][event['process_name']]['kill'] += 1
-            elif event['type'] == 'lmk':
-                summary['highlight_stats'][event['process_name']]['lmk'] += 1
-            elif event['type'] == 'skip':
-                summary['highlight_stats'][event['process_name']]['skip'] += 1
+        # 循环内反复使用的字段只取一次
+        etype = event['type']
+        proc = event['process_name']
+        is_sub = event.get('is_subprocess', False)
+        if proc in hl_set:
+            if etype == 'start':
+                summary['highlight_stats'][proc]['start'] += 1
+            elif etype == 'kill':
+                summary['highlight_stats'][proc]['kill'] += 1
+            elif etype == 'lmk':
+                summary['highlight_stats'][proc]['lmk'] += 1
+            elif etype == 'skip':
+                summary['highlight_stats'][proc]['skip'] += 1
         
-        base_name = event['process_name'].split(':')[0]
+        base_name = proc.partition(':')[0]
         valid_pkg = _looks_like_package(base_name)
-        is_anomaly_start = _is_possible_anomaly_start_record(event.get("details", {}))
+        details = event.get("details") or _EMPTY_DETAILS
+        is_anomaly_start = _is_possible_anomaly_start_record(details)
 
-        if event['type'] == 'start' and not event.get('is_subprocess') and not is_anomaly_start:
+        if etype == 'start' and not is_sub and not is_anomaly_start:
             cs = summary['cont_startup_stats']
             cs['target_start_total'] += 1
-            start_kind = event.get('details', {}).get('start_kind')
+            start_kind = details.get('start_kind')
             if start_kind == 'cold':
                 cs['cold_count'] += 1
             elif start_kind == 'hot':
@@ -1926,7 +2022,7 @@ def compute_summary_data(events):
             else:
                 cs['unknown_count'] += 1
 
-            round_no = event.get('details', {}).get('round')
+            round_no = details.get('round')
             if round_no == 2:
                 if start_kind == 'cold':
                     cs['second_round_cold'] += 1
@@ -1935,30 +2031,30 @@ def compute_summary_data(events):
                 else:
                     cs['second_round_unknown'] += 1
 
-        if event['type'] == 'kill':
+        if etype == 'kill':
             try:
                 summary['total_release_mem'] += int(event['details']['kill_info']['killedPss'])
                 summary['total_killed'] += 1
                 
                 # 统计被杀进程
-                proc_name = event['process_name']
-                summary['top_killed'][proc_name] = summary['top_killed'].get(proc_name, 0) + 1
+                proc_name = proc
+                summary['top_killed'][proc_name] += 1
                 if valid_pkg:
-                    if event.get('is_subprocess', False):
-                        summary['main_proc_kill_stats'][base_name]['sub_kill'] += 1
+                    if is_sub:
+                        proc_counters['main_proc_kill_stats', base_name, 'sub_kill'] += 1
                     else:
-                        summary['main_proc_kill_stats'][base_name]['main_kill'] += 1
+                        proc_counters['main_proc_kill_stats', base_name, 'main_kill'] += 1
                         summary['main_overall']['kill'] += 1
-                        summary['main_proc_detail'][base_name]['kill'] += 1
+                        proc_counters['main_proc_detail', base_name, 'kill'] += 1
                     # 高亮进程统计（主名命中即可）
-                    if base_name in HIGHLIGHT_PROCESSES:
-                        if event.get('is_subprocess', False):
+                    if base_name in hl_set:
+                        if is_sub:
                             summary['highlight_overall']['sub_kill'] += 1
-                            summary['highlight_proc_detail'][base_name]['sub_kill'] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'sub_kill'] += 1
                         else:
                             summary['highlight_overall']['main_kill'] += 1
-                            summary['highlight_proc_detail'][base_name]['main_kill'] += 1
-                            summary['highlight_event_ids'][base_name]['kill'].append(idx + 1)
+                            proc_counters['highlight_proc_detail', base_name, 'main_kill'] += 1
+                            event_ids[base_name, 'kill'].append(idx + 1)
                 
                 # 统计重要进程
                 if event['details']['proc_info'].get('isImp', 'false') == 'true':
@@ -1967,127 +2063,126 @@ def compute_summary_data(events):
                 # 统计killType分布
                 kill_type = event['details']['kill_info']['killType']
                 kill_type_desc = event['details']['kill_info'].get('killTypeDesc', kill_type)
-                summary['kill_type_stats'][kill_type_desc] = summary['kill_type_stats'].get(kill_type_desc, 0) + 1
+                summary['kill_type_stats'][kill_type_desc] += 1
                 if valid_pkg:
-                    if not event.get('is_subprocess', False):
+                    if not is_sub:
                         summary['main_overall']['kill_type_stats'][kill_type_desc] += 1
-                        summary['main_proc_detail'][base_name]['kill_type_stats'][kill_type_desc] += 1
-                    if base_name in HIGHLIGHT_PROCESSES:
-                        if event.get('is_subprocess', False):
+                        proc_counters['main_proc_detail', base_name, 'kill_type_stats', kill_type_desc] += 1
+                    if base_name in hl_set:
+                        if is_sub:
                             summary['highlight_overall']['sub_kill_type_stats'][kill_type_desc] += 1
-                            summary['highlight_proc_detail'][base_name]['sub_kill_type_stats'][kill_type_desc] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'sub_kill_type_stats', kill_type_desc] += 1
                         else:
                             summary['highlight_overall']['main_kill_type_stats'][kill_type_desc] += 1
-                            summary['highlight_proc_detail'][base_name]['main_kill_type_stats'][kill_type_desc] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'main_kill_type_stats', kill_type_desc] += 1
 
                 # 统计minScore分布
                 min_score = event['details']['kill_info'].get('minScore', '')
                 min_score_desc = event['details']['kill_info'].get('minScoreDesc') or describe_min_score(min_score)
-                summary['min_score_stats'][min_score_desc] = summary['min_score_stats'].get(min_score_desc, 0) + 1
-                if valid_pkg and not event.get('is_subprocess', False):
+                summary['min_score_stats'][min_score_desc] += 1
+                if valid_pkg and not is_sub:
                     summary['main_overall']['min_score_stats'][min_score_desc] += 1
-                    if base_name in HIGHLIGHT_PROCESSES:
+                    if base_name in hl_set:
                         summary['highlight_overall']['main_min_score_stats'][min_score_desc] += 1
                 
                 # 统计adj分布
                 adj = event['details']['proc_info']['adj']
-                summary['adj_stats'][adj] = summary['adj_stats'].get(adj, 0) + 1
+                summary['adj_stats'][adj] += 1
                 if valid_pkg:
-                    if not event.get('is_subprocess', False):
+                    if not is_sub:
                         summary['main_overall']['adj_stats'][adj] += 1
-                        summary['main_proc_detail'][base_name]['adj_stats'][adj] += 1
-                    if base_name in HIGHLIGHT_PROCESSES:
-                        if event.get('is_subprocess', False):
+                        proc_counters['main_proc_detail', base_name, 'adj_stats', adj] += 1
+                    if base_name in hl_set:
+                        if is_sub:
                             summary['highlight_overall']['sub_adj_stats'][adj] += 1
-                            summary['highlight_proc_detail'][base_name]['sub_adj_stats'][adj] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'sub_adj_stats', adj] += 1
                         else:
                             summary['highlight_overall']['main_adj_stats'][adj] += 1
-                            summary['highlight_proc_detail'][base_name]['main_adj_stats'][adj] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'main_adj_stats', adj] += 1
             except:
                 pass
-        elif event['type'] == 'lmk':
-            summary['top_lmk_killed'][event['process_name']] = summary['top_lmk_killed'].get(event['process_name'], 0) + 1
+        elif etype == 'lmk':
+            summary['top_lmk_killed'][proc] += 1
             adj = event['details'].get('adj', '')
             if adj:
                 summary['lmk_adj_stats'][adj] += 1
             reason = event['details'].get('reason') or "未知"
             if reason:
                 summary['lmk_reason_stats'][reason] += 1
-            base_name = event['process_name'].split(':')[0]
             if valid_pkg:
-                if event.get('is_subprocess', False):
-                    summary['main_proc_kill_stats'][base_name]['sub_lmk'] += 1
+                if is_sub:
+                    proc_counters['main_proc_kill_stats', base_name, 'sub_lmk'] += 1
                 else:
-                    summary['main_proc_kill_stats'][base_name]['main_lmk'] += 1
+                    proc_counters['main_proc_kill_stats', base_name, 'main_lmk'] += 1
                     summary['main_overall']['lmk'] += 1
-                    summary['main_proc_detail'][base_name]['lmk'] += 1
+                    proc_counters['main_proc_detail', base_name, 'lmk'] += 1
                     if adj:
                         summary['main_overall']['lmk_adj_stats'][adj] += 1
-                        summary['main_proc_detail'][base_name]['lmk_adj_stats'][adj] += 1
-                if base_name in HIGHLIGHT_PROCESSES:
-                    if event.get('is_subprocess', False):
+                        proc_counters['main_proc_detail', base_name, 'lmk_adj_stats', adj] += 1
+                if base_name in hl_set:
+                    if is_sub:
                         summary['highlight_overall']['sub_lmk'] += 1
-                        summary['highlight_proc_detail'][base_name]['sub_lmk'] += 1
+                        proc_counters['highlight_proc_detail', base_name, 'sub_lmk'] += 1
                         if adj:
                             summary['highlight_overall']['sub_lmk_adj_stats'][adj] += 1
-                            summary['highlight_proc_detail'][base_name]['sub_lmk_adj_stats'][adj] += 1
+                            proc_counters['highlight_proc_detail', base_name, 'sub_lmk_adj_stats', adj] += 1
                     else:
                         summary['highlight_overall']['main_lmk'] += 1
-                        summary['highlight_proc_detail'][base_name]['main_lmk'] += 1
-                        summary['highlight_event_ids'][base_name]['lmk'].append(idx + 1)
+                        proc_counters['highlight_proc_detail', base_name, 'main_lmk'] += 1
+                        event_ids[base_name, 'lmk'].append(idx + 1)
                         if adj:
                             summary['highlight_overall']['main_lmk_adj_stats'][adj] += 1
-                            summary['highlight_proc_detail'][base_name]['main_lmk_adj_stats'][adj] += 1
-        elif event['type'] == 'skip':
+                            proc_counters['highlight_proc_detail', base_name, 'main_lmk_adj_stats', adj] += 1
+        elif etype == 'skip':
             try:
                 # 统计跳过进程
-                proc_name = event['process_name']
-                summary['top_skipped'][proc_name] = summary['top_skipped'].get(proc_name, 0) + 1
+                proc_name = proc
+                summary['top_skipped'][proc_name] += 1
             except:
                 pass
 
         # 记录内存指标（kill 和 lmk）
-        if event['type'] in ('kill', 'lmk', 'trig'):
+        if etype in ('kill', 'lmk', 'trig'):
             metrics = _extract_mem_metrics(event)
             if metrics:
                 _accumulate('all', metrics)
-                if not event.get('is_subprocess', False):
+                if not is_sub:
                     _accumulate('main', metrics)
-                    if event['process_name'].split(':')[0] in HIGHLIGHT_PROCESSES:
+                    if base_name in hl_set:
                         _accumulate('highlight_main', metrics)
-                if event['type'] == 'trig':
+                if etype == 'trig':
                     _accumulate('trig', metrics)
                 # 记录 kill 事件的 mem_free，用于后续 TOP10 统计
-                if event['type'] == 'kill':
+                if etype == 'kill':
                     mem_free_val = metrics.get('mem_free')
                     if mem_free_val is not None:
                         summary['low_memfree_kills'].append({
                             'mem_free': mem_free_val,
-                            'process': event.get('full_name', event['process_name']),
+                            'process': event.get('full_name', proc),
                             'event_id': idx + 1,
                             'time': event.get('time'),
                             'type': event.get('type')
                         })
 
         # 高亮主进程驻留统计（仅主进程）
-        base = event['process_name'].split(':')[0]
-        if base in HIGHLIGHT_PROCESSES and not event.get('is_subprocess', False):
-            state = hl_res_state[base]
-            if event['type'] == 'start':
-                if _is_possible_anomaly_start_record(event.get("details", {})):
+        if base_name in hl_set and not is_sub:
+            state = hl_res_state.get(base_name) or hl_res_state.setdefault(base_name, _new_residency_state())
+            alive_since = state['alive_since']
+            if etype == 'start':
+                if is_anomaly_start:
                     continue
                 # 若已有存活实例，视为重启，先结算上一段
-                if state['alive'] and state['alive_since']:
-                    duration = (event['time'] - state['alive_since']).total_seconds()
+                if state['alive'] and alive_since is not None:
+                    duration = (event['_ts_us'] - alive_since) / 1e6
                     if duration >= 0:
                         state['durations'].append(duration)
                         summary['highlight_residency_stats']['all_durations'].append(duration)
                 state['alive'] = True
-                state['alive_since'] = event['time']
+                state['alive_since'] = event['_ts_us']
                 state['starts'] += 1
-            elif event['type'] in ('kill', 'lmk'):
-                if state['alive'] and state['alive_since']:
-                    duration = (event['time'] - state['alive_since']).total_seconds()
+            elif etype in ('kill', 'lmk'):
+                if state['alive'] and alive_since is not None:
+                    duration = (event['_ts_us'] - alive_since) / 1e6
                     if duration >= 0:
                         state['durations'].append(duration)
                         summary['highlight_residency_stats']['all_durations'].append(duration)
@@ -2095,6 +2190,16 @@ def compute_summary_data(events):
                 state['alive_since'] = None
                 state['kills'] += 1
 
+    # 还原按进程的嵌套统计（保持首次出现顺序）
+    for key, count in proc_counters.items():
+        entry = summary[key[0]][key[1]]
+        if len(key) == 3:
+            entry[key[2]] += count
+        else:
+            entry[key[2]][key[3]] += count
+    for (base, kind), ids in event_ids.items():
+        summary['highlight_event_ids'][base][kind].extend(ids)
+
     # 计算平均值
     summary['mem_avg'] = {}
     for key, bucket in summary['mem_metrics'].items():
@@ -2108,19 +2213,17 @@ def compute_summary_data(events):
         }
 
     # 计算内存统计（中位数/P95/最小/最大）
-    summary['mem_stats'] = {}
-    for key, sample_dict in summary['mem_samples'].items():
-        summary['mem_stats'][key] = {}
-        for metric in ('mem_free', 'file_pages', 'anon_pages', 'swap_free'):
-            stats = _calc_stats(sample_dict.get(metric, []))
-            summary['mem_stats'][key][metric] = stats
+    summary['mem_stats'] = {
+        key: _calc_stats_batch(sample_dict)
+        for key, sample_dict in summary['mem_samples'].items()
+    }
 
     # 结算仍存活的高亮主进程驻留时长（到日志结束）
     if events:
-        end_time = events[-1]['time']
+        end_ts_us = events[-1]['_ts_us']
         for base, state in hl_res_state.items():
-            if state['alive'] and state.get('alive_since'):
-                duration = (end_time - state['alive_since']).total_seconds()
+            if state['alive'] and state.get('alive_since') is not None:
+                duration = (end_ts_us - state['alive_since']) / 1e6
                 if duration >= 0:
                     state['durations'].append(duration)
                     summary['highlight_residency_stats']['all_durations'].append(duration)
@@ -2147,20 +2250,29 @@ def compute_summary_data(events):
 
     # 取 memfree 最低的查杀 TOP10
     if summary['low_memfree_kills']:
-        summary['low_memfree_kills'] = sorted(
+        summary['low_memfree_kills'] = heapq.nsmallest(
+            10,
             summary['low_memfree_kills'],
             key=lambda x: x.get('mem_free', float('inf'))
-        )[:10]
+        )
 
     return summary
 
 
-def generate_summary(events):
-    """生成分析总结报告"""
+# 文本报告驻留率表的行模板：轮次 启动类型 序号 应用 存活/总 全部 前1..前5
+_RESIDENCY_ROW_FMT = "%2s %-4s %2s %-24s %s/%s %-18s %-20s %-20s %-20s %-20s %-20s"
+# 驻留率报表展示的前 N 次窗口序号（前1~前5）
+_RESIDENCY_WINDOW_NS = (1, 2, 3, 4, 5)
+
+
+def generate_summary(events, buf=None):
+    """生成分析总结报告；传入 buf（文件句柄/StringIO）时直接写入 buf 并返回空串，否则返回报告文本"""
     summary = compute_summary_data(events)
-    highlight_timeline = build_highlight_timeline(events)
+    # 只排序一次，供各构建函数共用
+    events_sorted = sorted(events, key=itemgetter('time'))
+    highlight_timeline = build_highlight_timeline(events_sorted, presorted=True)
     highlight_residency = build_highlight_residency(events)
-    highlight_runs = compute_highlight_runs(events)
+    highlight_runs = compute_highlight_runs(events_sorted, presorted=True)
 
     def _fmt_mem_lines(key, label):
         stats_map = summary.get('mem_stats', {}).get(key, {})
@@ -2180,8 +2292,9 @@ def generate_summary(events):
         lines.append(_fmt_metric('swapfree', 'swap_free'))
         return lines
     
-    # 生成总结文本
-    report = [
+    # 生成总结文本：逐行直接写入 out（文件句柄或 StringIO），不再先攒列表再 join
+    out = buf if buf is not None else io.StringIO()
+    print(
         f"=" * 50 + " 分析总结 " + "=" * 50 + f"",
         f"总事件数: {summary['total_events']} (启动: {summary['start_count']}, 查杀: {summary['kill_count']}, LMK查杀: {summary['lmk_count']}, "
         f"触发查杀: {summary['trig_count']}, 跳过: {summary['skip_count']})",
@@ -2190,110 +2303,116 @@ def generate_summary(events):
         f"总释放内存: {summary['total_release_mem']:,} KB ({summary['total_release_mem']/1024:.2f} MB)",
         f"总杀死进程数: {summary['total_killed']} (含重要进程: {summary['killed_imp_count']})",
         f"\n被杀/触发时内存统计 (单位KB):",
-        f"\n查杀类型分布:"
-    ]
+        f"\n查杀类型分布:",
+        sep="\n",
+        file=out,
+    )
     cs = summary.get("cont_startup_stats", {})
     if cs.get("target_start_total", 0) > 0:
-        report.append(
+        print(
             f"\n连续启动判定(启动APP主进程): 总启动 {cs['target_start_total']}, "
-            f"冷启动 {cs['cold_count']}, 热启动 {cs['hot_count']}, 未知 {cs['unknown_count']}"
+            f"冷启动 {cs['cold_count']}, 热启动 {cs['hot_count']}, 未知 {cs['unknown_count']}",
+            file=out,
         )
-        report.append(
-            f"第二轮判定: 冷启动 {cs['second_round_cold']}, 热启动 {cs['second_round_hot']}, 未知 {cs['second_round_unknown']}"
+        print(
+            f"第二轮判定: 冷启动 {cs['second_round_cold']}, 热启动 {cs['second_round_hot']}, 未知 {cs['second_round_unknown']}",
+            file=out,
         )
-    report.extend(_fmt_mem_lines('all', '全部进程'))
-    report.extend(_fmt_mem_lines('main', '主进程'))
-    report.extend(_fmt_mem_lines('highlight_main', '高亮主进程(主)'))
-    report.extend(_fmt_mem_lines('trig', '触发事件'))
+    print(*_fmt_mem_lines('all', '全部进程'), sep="\n", file=out)
+    print(*_fmt_mem_lines('main', '主进程'), sep="\n", file=out)
+    print(*_fmt_mem_lines('highlight_main', '高亮主进程(主)'), sep="\n", file=out)
+    print(*_fmt_mem_lines('trig', '触发事件'), sep="\n", file=out)
     # 高亮进程驻留表（前两轮）
     if highlight_runs:
-        report.append("\n高亮主进程驻留表（前两轮）:")
+        print("\n高亮主进程驻留表（前两轮）:", file=out)
         for r in highlight_runs:
-            report.append(
+            print(
                 f"  {r['proc']}: 冷启动(第2轮) {r['second_cold']} | "
                 f"启动1 {r['start1']} -> 被杀1 {r['kill1']} | 驻留1 {r['dur1']} | "
                 f"启动2 {r['start2']} -> 被杀2 {r['kill2']} | 驻留2 {r['dur2']} | "
-                f"平均驻留 {r['avg']}"
+                f"平均驻留 {r['avg']}",
+                file=out,
             )
     # 添加killType分布统计
     if summary['kill_type_stats']:
-        for kill_type, count in sorted(summary['kill_type_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"  {kill_type:<20} {count:>3}次")
+        for kill_type, count in summary['kill_type_stats'].most_common():
+            print(f"  {kill_type:<20} {count:>3}次", file=out)
     
     # 添加 minScore 分布统计
-    report.append(f"\n可查杀最低分值分布:")
+    print(f"\n可查杀最低分值分布:", file=out)
     if summary['min_score_stats']:
-        for ms, count in sorted(summary['min_score_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"  {ms:<30} {count:>3}次")
+        for ms, count in summary['min_score_stats'].most_common():
+            print(f"  {ms:<30} {count:>3}次", file=out)
 
     # 添加adj分布统计
-    report.append(f"\n进程优先级(adj)分布:")
+    print(f"\n进程优先级(adj)分布:", file=out)
     if summary['adj_stats']:
-        for adj, count in sorted(summary['adj_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"  adj={adj:<5} {count:>3}次")
+        for adj, count in summary['adj_stats'].most_common():
+            print(f"  adj={adj:<5} {count:>3}次", file=out)
 
     # LMK 统计
-    report.append(f"\nLMK 查杀原因分布:")
+    print(f"\nLMK 查杀原因分布:", file=out)
     if summary['lmk_reason_stats']:
-        for reason, count in sorted(summary['lmk_reason_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"  {reason:<20} {count:>3}次")
-    report.append(f"\nLMK 进程优先级(adj)分布:")
+        for reason, count in summary['lmk_reason_stats'].most_common():
+            print(f"  {reason:<20} {count:>3}次", file=out)
+    print(f"\nLMK 进程优先级(adj)分布:", file=out)
     if summary['lmk_adj_stats']:
-        for adj, count in sorted(summary['lmk_adj_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"  adj={adj:<5} {count:>3}次")
+        for adj, count in summary['lmk_adj_stats'].most_common():
+            print(f"  adj={adj:<5} {count:>3}次", file=out)
     
     # 添加高亮进程统计
-    report.append(f"\n高亮进程统计:")
+    print(f"\n高亮进程统计:", file=out)
     for proc, stats in summary['highlight_stats'].items():
-        if stats['start'] > 0 or stats['kill'] > 0 or stats['skip'] > 0 or stats['lmk'] > 0:
+        if any(stats.values()):
             ratio_kill = stats['kill']/stats['start'] if stats['start'] > 0 else float('inf')
             ratio_lmk = stats['lmk']/stats['start'] if stats['start'] > 0 else float('inf')
             ratio_skip = stats['skip']/stats['start'] if stats['start'] > 0 else float('inf')
             ratio_kill_str = f"{ratio_kill:.2f}" if ratio_kill != float('inf') else "N/A"
             ratio_lmk_str = f"{ratio_lmk:.2f}" if ratio_lmk != float('inf') else "N/A"
             ratio_skip_str = f"{ratio_skip:.2f}" if ratio_skip != float('inf') else "N/A"
-            report.append(f"  {proc:<30} 启动: {stats['start']:>3}次, 查杀: {stats['kill']:>3}次, LMK查杀: {stats['lmk']:>3}次, 跳过: {stats['skip']:>3}次, "
-                         f"查杀/启动比: {ratio_kill_str}, LMK/启动比: {ratio_lmk_str}, 跳过/启动比: {ratio_skip_str}")
+            print(f"  {proc:<30} 启动: {stats['start']:>3}次, 查杀: {stats['kill']:>3}次, LMK查杀: {stats['lmk']:>3}次, 跳过: {stats['skip']:>3}次, "
+                         f"查杀/启动比: {ratio_kill_str}, LMK/启动比: {ratio_lmk_str}, 跳过/启动比: {ratio_skip_str}",
+    file=out,)
     
     # 添加最常被杀进程
     if summary['top_killed']:
-        top_killed = sorted(summary['top_killed'].items(), key=lambda x: x[1], reverse=True)[:10]
-        report.append(f"\n最常被杀进程 TOP10:")
+        top_killed = summary['top_killed'].most_common(10)
+        print(f"\n最常被杀进程 TOP10:", file=out)
         for proc, count in top_killed:
             is_highlight = "是" if proc in HIGHLIGHT_PROCESSES else "否"
-            report.append(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}")
+            print(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}", file=out)
 
     if summary['top_lmk_killed']:
-        top_lmk = sorted(summary['top_lmk_killed'].items(), key=lambda x: x[1], reverse=True)[:10]
-        report.append(f"\n最常 LMK 查杀进程 TOP10:")
+        top_lmk = summary['top_lmk_killed'].most_common(10)
+        print(f"\n最常 LMK 查杀进程 TOP10:", file=out)
         for proc, count in top_lmk:
             is_highlight = "是" if proc in HIGHLIGHT_PROCESSES else "否"
-            report.append(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}")
+            print(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}", file=out)
     
     # 主进程专项摘要
-    report.append(f"\n主进程查杀专题:")
+    print(f"\n主进程查杀专题:", file=out)
     main_total_kill = summary['main_overall']['kill']
     main_total_lmk = summary['main_overall']['lmk']
-    report.append(f"  主进程总计: kill {main_total_kill} 次, lmk {main_total_lmk} 次")
+    print(f"  主进程总计: kill {main_total_kill} 次, lmk {main_total_lmk} 次", file=out)
     if main_total_kill:
-        report.append("  主进程查杀类型分布:")
-        for kt, c in sorted(summary['main_overall']['kill_type_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"    {kt:<20} {c}")
+        print("  主进程查杀类型分布:", file=out)
+        for kt, c in summary['main_overall']['kill_type_stats'].most_common():
+            print(f"    {kt:<20} {c}", file=out)
         if summary['main_overall']['min_score_stats']:
-            report.append("  主进程 minScore 分布:")
-            for ms, c in sorted(summary['main_overall']['min_score_stats'].items(), key=lambda x: x[1], reverse=True):
-                report.append(f"    {ms:<24} {c}")
+            print("  主进程 minScore 分布:", file=out)
+            for ms, c in summary['main_overall']['min_score_stats'].most_common():
+                print(f"    {ms:<24} {c}", file=out)
     if summary['main_overall']['adj_stats']:
-        report.append("  主进程查杀 adj 分布:")
-        for adj, c in sorted(summary['main_overall']['adj_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"    adj={adj:<5} {c}")
+        print("  主进程查杀 adj 分布:", file=out)
+        for adj, c in summary['main_overall']['adj_stats'].most_common():
+            print(f"    adj={adj:<5} {c}", file=out)
     if summary['main_overall']['lmk_adj_stats']:
-        report.append("  主进程 LMK adj 分布:")
-        for adj, c in sorted(summary['main_overall']['lmk_adj_stats'].items(), key=lambda x: x[1], reverse=True):
-            report.append(f"    adj={adj:<5} {c}")
+        print("  主进程 LMK adj 分布:", file=out)
+        for adj, c in summary['main_overall']['lmk_adj_stats'].most_common():
+            print(f"    adj={adj:<5} {c}", file=out)
     # 按包名列出主进程详情
     if summary['main_proc_detail']:
-        report.append("  主进程明细:")
+        print("  主进程明细:", file=out)
         ranked_base = sorted(
             summary['main_proc_detail'].items(),
             key=lambda kv: (kv[1]['kill'] + kv[1]['lmk']),
@@ -2303,50 +2422,55 @@ def generate_summary(events):
             total = stats['kill'] + stats['lmk']
             if total == 0:
                 continue
-            report.append(f"    {base}: kill {stats['kill']}, lmk {stats['lmk']}")
+            print(f"    {base}: kill {stats['kill']}, lmk {stats['lmk']}", file=out)
             if stats['kill_type_stats']:
-                kt_parts = [f"{kt}:{cnt}" for kt, cnt in sorted(stats['kill_type_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      killType -> {'; '.join(kt_parts)}")
+                kt_parts = [f"{kt}:{cnt}" for kt, cnt in stats['kill_type_stats'].most_common()]
+                print(f"      killType -> {'; '.join(kt_parts)}", file=out)
             if stats['adj_stats']:
-                adj_parts = [f"{adj}:{cnt}" for adj, cnt in sorted(stats['adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      adj(kill) -> {'; '.join(adj_parts)}")
+                adj_parts = [f"{adj}:{cnt}" for adj, cnt in stats['adj_stats'].most_common()]
+                print(f"      adj(kill) -> {'; '.join(adj_parts)}", file=out)
             if stats['lmk_adj_stats']:
-                lmk_adj_parts = [f"{adj}:{cnt}" for adj, cnt in sorted(stats['lmk_adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      adj(lmk) -> {'; '.join(lmk_adj_parts)}")
+                lmk_adj_parts = [f"{adj}:{cnt}" for adj, cnt in stats['lmk_adj_stats'].most_common()]
+                print(f"      adj(lmk) -> {'; '.join(lmk_adj_parts)}", file=out)
 
     # 高亮进程专题
-    report.append(f"\n高亮进程专题（仅主进程）:")
+    print(f"\n高亮进程专题（仅主进程）:", file=out)
     hl_main_kill = summary['highlight_overall']['main_kill']
     hl_main_lmk = summary['highlight_overall']['main_lmk']
-    report.append(f"  总计: kill {hl_main_kill} 次, lmk {hl_main_lmk} 次")
+    print(f"  总计: kill {hl_main_kill} 次, lmk {hl_main_lmk} 次", file=out)
     if summary['highlight_overall']['main_kill_type_stats']:
-        parts = [f"{kt}:{c}" for kt, c in sorted(summary['highlight_overall']['main_kill_type_stats'].items(), key=lambda x: x[1], reverse=True)]
-        report.append(f"  查杀类型: {'; '.join(parts)}")
+        parts = [f"{kt}:{c}" for kt, c in summary['highlight_overall']['main_kill_type_stats'].most_common()]
+        print(f"  查杀类型: {'; '.join(parts)}", file=out)
     if summary['highlight_overall']['main_min_score_stats']:
-        parts = [f"{ms}:{c}" for ms, c in sorted(summary['highlight_overall']['main_min_score_stats'].items(), key=lambda x: x[1], reverse=True)]
-        report.append(f"  minScore: {'; '.join(parts)}")
+        parts = [f"{ms}:{c}" for ms, c in summary['highlight_overall']['main_min_score_stats'].most_common()]
+        print(f"  minScore: {'; '.join(parts)}", file=out)
     if summary['highlight_overall']['main_adj_stats']:
-        parts = [f"{adj}:{c}" for adj, c in sorted(summary['highlight_overall']['main_adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-        report.append(f"  adj分布(kill): {'; '.join(parts)}")
+        parts = [f"{adj}:{c}" for adj, c in summary['highlight_overall']['main_adj_stats'].most_common()]
+        print(f"  adj分布(kill): {'; '.join(parts)}", file=out)
     if summary['highlight_overall']['main_lmk_adj_stats']:
-        parts = [f"{adj}:{c}" for adj, c in sorted(summary['highlight_overall']['main_lmk_adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-        report.append(f"  adj分布(lmk): {'; '.join(parts)}")
+        parts = [f"{adj}:{c}" for adj, c in summary['highlight_overall']['main_lmk_adj_stats'].most_common()]
+        print(f"  adj分布(lmk): {'; '.join(parts)}", file=out)
     # 高亮驻留统计
     hres = summary.get('highlight_residency_stats', {})
     avg_res = hres.get('avg_duration_sec', 0)
-    report.append(f"  平均驻留时长: {_format_duration(avg_res)}")
+    print(f"  平均驻留时长: {_format_duration(avg_res)}", file=out)
     alive_now = hres.get('alive_now', [])
     if alive_now:
-        report.append(f"  当前仍存活: {', '.join(alive_now)}")
+        print(f"  当前仍存活: {', '.join(alive_now)}", file=out)
     if hres.get('per_proc'):
-        report.append(f"  进程驻留明细:")
-        for base, st in sorted(hres['per_proc'].items(), key=lambda kv: -(sum(kv[1]['durations'])/len(kv[1]['durations']) if kv[1]['durations'] else 0)):
+        print(f"  进程驻留明细:", file=out)
+        # 平均驻留只算一次，同时用作排序键与展示值
+        ranked_res = [
+            (base, sum(st['durations']) / len(st['durations']) if st['durations'] else 0, st)
+            for base, st in hres['per_proc'].items()
+        ]
+        ranked_res.sort(key=itemgetter(1), reverse=True)
+        for base, avg, st in ranked_res:
             if not st['durations']:
                 continue
-            avg = sum(st['durations'])/len(st['durations'])
-            report.append(f"    {base}: 平均{_format_duration(avg)} | 启动 {st['starts']} | kill/lmk {st['kills']} | 段数 {len(st['durations'])}")
+            print(f"    {base}: 平均{_format_duration(avg)} | 启动 {st['starts']} | kill/lmk {st['kills']} | 段数 {len(st['durations'])}", file=out)
     if summary['highlight_proc_detail']:
-        report.append("  高亮进程明细:")
+        print("  高亮进程明细:", file=out)
         ranked_hl = sorted(
             summary['highlight_proc_detail'].items(),
             key=lambda kv: (kv[1]['main_kill'] + kv[1]['main_lmk']),
@@ -2356,28 +2480,28 @@ def generate_summary(events):
             total = stats['main_kill'] + stats['main_lmk']
             if total == 0:
                 continue
-            report.append(f"    {base}: kill {stats['main_kill']}, lmk {stats['main_lmk']}")
+            print(f"    {base}: kill {stats['main_kill']}, lmk {stats['main_lmk']}", file=out)
             evt_ids = summary.get('highlight_event_ids', {}).get(base, {})
             if evt_ids:
                 kill_ids = evt_ids.get('kill') or []
                 lmk_ids = evt_ids.get('lmk') or []
                 if kill_ids:
-                    report.append(f"      事件号(kill): {', '.join(map(str, kill_ids))}")
+                    print(f"      事件号(kill): {', '.join(map(str, kill_ids))}", file=out)
                 if lmk_ids:
-                    report.append(f"      事件号(lmk): {', '.join(map(str, lmk_ids))}")
+                    print(f"      事件号(lmk): {', '.join(map(str, lmk_ids))}", file=out)
             if stats['main_kill_type_stats']:
-                kt_parts = [f"{kt}:{cnt}" for kt, cnt in sorted(stats['main_kill_type_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      killType -> {'; '.join(kt_parts)}")
+                kt_parts = [f"{kt}:{cnt}" for kt, cnt in stats['main_kill_type_stats'].most_common()]
+                print(f"      killType -> {'; '.join(kt_parts)}", file=out)
             if stats['main_adj_stats']:
-                adj_parts = [f"{adj}:{cnt}" for adj, cnt in sorted(stats['main_adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      adj(kill) -> {'; '.join(adj_parts)}")
+                adj_parts = [f"{adj}:{cnt}" for adj, cnt in stats['main_adj_stats'].most_common()]
+                print(f"      adj(kill) -> {'; '.join(adj_parts)}", file=out)
             if stats['main_lmk_adj_stats']:
-                lmk_adj_parts = [f"{adj}:{cnt}" for adj, cnt in sorted(stats['main_lmk_adj_stats'].items(), key=lambda x: x[1], reverse=True)]
-                report.append(f"      adj(lmk) -> {'; '.join(lmk_adj_parts)}")
+                lmk_adj_parts = [f"{adj}:{cnt}" for adj, cnt in stats['main_lmk_adj_stats'].most_common()]
+                print(f"      adj(lmk) -> {'; '.join(lmk_adj_parts)}", file=out)
 
     # 高亮进程启动/查杀时间线（主进程）
     if highlight_timeline:
-        report.append(f"\n高亮进程时间线（仅主进程）:")
+        print(f"\n高亮进程时间线（仅主进程）:", file=out)
         max_len = 0
         for it in highlight_timeline:
             if it.get('label_class', '').startswith('start'):
@@ -2386,70 +2510,61 @@ def generate_summary(events):
                 max_len = max(max_len, len(f"{it['process']}   {it['label']}"))
         inner_width = max(max_len, 70)
         def _fmt_line(it):
-            ts = it['time']
-            label = it['label']
-            proc = it['process']
+            # 定宽填充交给 %-*s / %*s 完成，省去中间的 ljust/rjust 字符串
             if it.get('label_class', '').startswith('start'):
-                content = f"{label}    {proc}".ljust(inner_width)
-            else:
-                content = f"{proc}   {label}".rjust(inner_width)
-            return f"- {ts:<19} | {content} |"
+                return "- %-19s | %-*s |" % (it['time'], inner_width, f"{it['label']}    {it['process']}")
+            return "- %-19s | %*s |" % (it['time'], inner_width, f"{it['process']}   {it['label']}")
         for item in highlight_timeline:
-            report.append(_fmt_line(item))
+            print(_fmt_line(item), file=out)
 
     if highlight_residency:
-        report.append(f"\n高亮进程驻留率（前5次窗口 & 全量，主进程）:")
-        report.append("轮次 启动类型 序号 应用 启动前存活数/总(前5) 全部存活/总 前1 前2 前3 前4 前5")
+        print(f"\n高亮进程驻留率（前5次窗口 & 全量，主进程）:", file=out)
+        print("轮次 启动类型 序号 应用 启动前存活数/总(前5) 全部存活/总 前1 前2 前3 前4 前5", file=out)
+        # 全量平均驻留率在输出表格的同一轮遍历中累加
+        all_rates_sum = 0.0
+        all_rates_n = 0
         for rec in highlight_residency:
             round_txt = rec.get("round") if rec.get("round") is not None else "-"
             start_kind_txt = rec.get("start_kind_cn", "未知")
             if rec.get("is_anomaly"):
                 note_txt = rec.get("anomaly_note", "") or POSSIBLE_ANOMALY_START_NOTE
-                report.append(
+                print(
                     f"{str(round_txt):>2} {start_kind_txt:<4} {rec['seq']:>2} "
-                    f"{rec['process']:<24} - - - - - - -  [{POSSIBLE_ANOMALY_START_LABEL}: {note_txt}]"
+                    f"{rec['process']:<24} - - - - - - -  [{POSSIBLE_ANOMALY_START_LABEL}: {note_txt}]",
+                    file=out,
                 )
                 continue
-            row = (
-                f"{str(round_txt):>2} {start_kind_txt:<4} {rec['seq']:>2} "
-                f"{rec['process']:<24} "
-                f"{rec['alive_cnt']}/{rec['window_total']} "
-                f"{rec['all_rate']:<18} "
-                f"{rec['per_window'][1]['rate']:<20} "
-                f"{rec['per_window'][2]['rate']:<20} "
-                f"{rec['per_window'][3]['rate']:<20} "
-                f"{rec['per_window'][4]['rate']:<20} "
-                f"{rec['per_window'][5]['rate']:<20}"
+            pw = rec['per_window']
+            row = _RESIDENCY_ROW_FMT % (
+                round_txt, start_kind_txt, rec['seq'], rec['process'],
+                rec['alive_cnt'], rec['window_total'], rec['all_rate'],
+                pw[1]['rate'], pw[2]['rate'], pw[3]['rate'], pw[4]['rate'], pw[5]['rate'],
             )
-            report.append(row)
+            print(row, file=out)
             if rec['killed_list']:
-                report.append(f"    被杀: {', '.join(rec['killed_list'])}")
-        # 全量平均驻留率
-        all_rates = []
-        for rec in highlight_residency:
-            if rec.get("is_anomaly"):
-                continue
+                print(f"    被杀: {', '.join(rec['killed_list'])}", file=out)
             pct_full = rec.get("all_rate_value")
             if pct_full is not None:
-                all_rates.append(pct_full)
-        if all_rates:
-            avg_full = sum(all_rates) / len(all_rates)
-            report.append(f"  全部前序平均驻留率: {avg_full:.1f}%")
+                all_rates_sum += pct_full
+                all_rates_n += 1
+        if all_rates_n:
+            avg_full = all_rates_sum / all_rates_n
+            print(f"  全部前序平均驻留率: {avg_full:.1f}%", file=out)
 
     # memfree 最低的查杀 TOP10
     low_memfree = summary.get('low_memfree_kills', [])
     if low_memfree:
-        report.append(f"\nmemfree 最低的查杀 TOP10（Kill事件）:")
-        report.append("排名 memfree(KB) 时间 应用 事件号")
+        print(f"\nmemfree 最低的查杀 TOP10（Kill事件）:", file=out)
+        print("排名 memfree(KB) 时间 应用 事件号", file=out)
         for rank, rec in enumerate(low_memfree, 1):
             ts = _format_dt(rec.get('time'))
             proc = rec.get('process', '')
             event_id = rec.get('event_id', '-')
             mem_free = rec.get('mem_free', '-')
-            report.append(f" {rank:>2}  {mem_free:>8}  {ts:<19}  {proc:<30}  #{event_id}")
+            print(f" {rank:>2}  {mem_free:>8}  {ts:<19}  {proc:<30}  #{event_id}", file=out)
 
     # 主/子进程查杀分布
-    report.append(f"\n主进程查杀统计:")
+    print(f"\n主进程查杀统计:", file=out)
     if summary['main_proc_kill_stats']:
         ranked_main = sorted(
             summary['main_proc_kill_stats'].items(),
@@ -2464,35 +2579,34 @@ def generate_summary(events):
                 continue
             if total == 0:
                 continue
-            report.append(
+            print(
                 f"  {base:<30} 主进程: kill {stats['main_kill']}, lmk {stats['main_lmk']} | "
-                f"子进程: kill {stats['sub_kill']}, lmk {stats['sub_lmk']}"
+                f"子进程: kill {stats['sub_kill']}, lmk {stats['sub_lmk']}",
+                file=out,
             )
 
     # 添加最常跳过进程
     if summary['top_skipped']:
-        top_skipped = sorted(summary['top_skipped'].items(), key=lambda x: x[1], reverse=True)[:10]
-        report.append(f"\n最常跳过进程 TOP10:")
+        top_skipped = summary['top_skipped'].most_common(10)
+        print(f"\n最常跳过进程 TOP10:", file=out)
         for proc, count in top_skipped:
             is_highlight = "是" if proc in HIGHLIGHT_PROCESSES else "否"
-            report.append(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}")
+            print(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}", file=out)
     
     # 添加最频繁启动进程
-    start_counts = {}
-    for event in events:
-        if event['type'] == 'start':
-            proc_name = event['process_name']
-            start_counts[proc_name] = start_counts.get(proc_name, 0) + 1
+    start_counts = Counter(event['process_name'] for event in events if event['type'] == 'start')
     
     if start_counts:
-        top_started = sorted(start_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        report.append(f"\n最频繁启动进程 TOP10:")
+        top_started = start_counts.most_common(10)
+        print(f"\n最频繁启动进程 TOP10:", file=out)
         for proc, count in top_started:
             is_highlight = "是" if proc in HIGHLIGHT_PROCESSES else "否"
-            report.append(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}")
+            print(f"  {proc:<30} {count}次 {'[高亮]' if is_highlight == '是' else ''}", file=out)
     
-    report.append("=" * 110)
-    return "\n".join(report)
+    out.write("=" * 110)
+    if buf is None:
+        return out.getvalue()
+    return ""
 
 def generate_report(events, output_file):
     """生成文本报告"""
@@ -2501,18 +2615,24 @@ def generate_report(events, output_file):
         f.write(f"=" * 50 + " 进程启动与查杀分析报告 " + "=" * 50 + f"\n\n")
         
         # 写入统计信息
-        start_count = sum(1 for e in events if e['type'] == 'start')
-        kill_count = sum(1 for e in events if e['type'] == 'kill')
-        lmk_count = sum(1 for e in events if e['type'] == 'lmk')
-        trig_count = sum(1 for e in events if e['type'] == 'trig')
-        skip_count = sum(1 for e in events if e['type'] == 'skip')
-        proc_start_only_count = sum(1 for e in events if e['type'] == 'proc_start_only')
-        subprocess_start_count = sum(1 for e in events if e['type'] == 'start' and e['is_subprocess'])
-        total_release_mem = sum(
-            (_safe_int((e.get('details') or {}).get('kill_info', {}).get('killedPss')) or 0)
-            for e in events
-            if e.get('type') == 'kill'
-        )
+        # 单次遍历统计各类型事件数量
+        type_counts = Counter()
+        subprocess_start_count = 0
+        total_release_mem = 0
+        for e in events:
+            etype = e['type']
+            type_counts[etype] += 1
+            if etype == 'start':
+                if e['is_subprocess']:
+                    subprocess_start_count += 1
+            elif etype == 'kill':
+                total_release_mem += _safe_int((e.get('details') or {}).get('kill_info', {}).get('killedPss')) or 0
+        start_count = type_counts['start']
+        kill_count = type_counts['kill']
+        lmk_count = type_counts['lmk']
+        trig_count = type_counts['trig']
+        skip_count = type_counts['skip']
+        proc_start_only_count = type_counts['proc_start_only']
         total_killed = kill_count  # 每行代表一个被杀死的进程
         
         f.write(f"总事件数: {len(events)}\n")
@@ -2528,27 +2648,92 @@ def generate_report(events, output_file):
         f.write(f"事件时间线:\n")
         f.write(f"{'-' * 100}\n")
         
-        for idx, event in enumerate(events):
-            f.write(format_event_simple(event, idx) + "\n")
+        f.writelines(format_event_simple(event, idx) + "\n" for idx, event in enumerate(events))
 
         f.write(f"{'-' * 100}\n")
 
-        for idx, event in enumerate(events):
-            f.write(format_event_detail(event, idx) + "\n")
+        f.writelines(format_event_detail(event, idx) + "\n" for idx, event in enumerate(events))
         
-        # 写入总结报告
-        f.write(generate_summary(events))
+        # 写入总结报告（直接写入文件句柄）
+        generate_summary(events, buf=f)
+
+
+def _has_container_subclass(obj) -> bool:
+    """判断嵌套结构中是否含有 dict/list 的子类（defaultdict、Counter 等），遇到第一个即返回"""
+    stack = [obj]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        cur = pop()
+        cls = type(cur)
+        if cls is dict:
+            for v in cur.values():
+                if isinstance(v, (dict, list)):
+                    push(v)
+        elif cls is list:
+            for v in cur:
+                if isinstance(v, (dict, list)):
+                    push(v)
+        elif isinstance(cur, (dict, list)):
+            return True
+    return False
 
 
 def _to_plain(obj):
-    """递归将 defaultdict 等转换为普通类型，便于 JSON 序列化"""
-    if isinstance(obj, defaultdict):
-        obj = dict(obj)
-    if isinstance(obj, dict):
-        return {k: _to_plain(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_to_plain(v) for v in obj]
-    return obj
+    """将 defaultdict / Counter 等嵌套容器转换为普通 dict / list，便于 JSON 序列化。
+
+    使用显式栈迭代，不受递归深度限制；标量直接返回原对象，不做拷贝。
+    输入结构保持不变（summary 可能仍被调用方继续使用）；若整棵树已是普通
+    dict / list，则直接返回原对象，省去一次全量拷贝。
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+    if not _has_container_subclass(obj):
+        return obj
+    root = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        src, dst = pop()
+        if isinstance(src, dict):
+            for k, v in src.items():
+                if isinstance(v, dict):
+                    dst[k] = child = {}
+                    push((v, child))
+                elif isinstance(v, list):
+                    dst[k] = child = []
+                    push((v, child))
+                else:
+                    dst[k] = v
+        else:
+            append = dst.append
+            for v in src:
+                if isinstance(v, dict):
+                    child = {}
+                    push((v, child))
+                elif isinstance(v, list):
+                    child = []
+                    push((v, child))
+                else:
+                    child = v
+                append(child)
+    return root
+
+
+def _dumps_script_json(obj) -> str:
+    """序列化注入报告 <script> 的数据常量。
+
+    安装了 orjson 时直接用其 C 实现编码（原生支持 defaultdict / Counter 等 dict
+    子类与非字符串键，无需先经 _to_plain 转换）；未安装或遇到其不支持的值时
+    回退到标准库 json。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(_to_plain(obj), ensure_ascii=False)
 
 
 def _is_possible_anomaly_start_record(details: Optional[dict]) -> bool:
@@ -2556,6 +2741,18 @@ def _is_possible_anomaly_start_record(details: Optional[dict]) -> bool:
     return bool(d.get("possible_anomaly_start"))
 
 
+# 事件缺少 details 时的只读空映射，热循环中复用，避免每次 `or {}` 新建空 dict
+_EMPTY_DETAILS = MappingProxyType({})
+
+
+def _prime_event_keys(events) -> None:
+    """为事件缓存 _base（主包名）与 _anom（是否疑似异常启动），供各构建函数的热循环直接读取"""
+    for e in events:
+        if '_base' not in e:
+            e['_base'] = _base_name(e.get('process_name', ''))
+            e['_anom'] = _is_possible_anomaly_start_record(e.get('details'))
+
+
 def _startup_anomaly_note(details: Optional[dict]) -> str:
     d = details or {}
     note = str(d.get("anomaly_note", "") or "").strip()
@@ -2566,22 +2763,24 @@ def _startup_anomaly_note(details: Optional[dict]) -> str:
     return ""
 
 
-def build_highlight_timeline(events):
-    """构建高亮主进程的启动/查杀时间线"""
+def build_highlight_timeline(events, presorted: bool = False):
+    """构建高亮主进程的启动/查杀时间线；presorted=True 表示 events 已按时间排序"""
+    _prime_event_keys(events)
+    hl_set = frozenset(HIGHLIGHT_PROCESSES)
     items = []
     for e in events:
         if e.get('is_subprocess'):
             continue
-        base = e.get('process_name', '').split(':')[0]
-        if base not in HIGHLIGHT_PROCESSES:
+        base = e['_base']
+        if base not in hl_set:
             continue
         if e.get('type') not in ('start', 'kill', 'lmk'):
             continue
         dt = e['time']
-        time_str = dt.strftime("%m-%d %H:%M:%S.%f")[:-3]
+        time_str = _format_ts_ms(dt)
         if e['type'] == 'start':
-            details = e.get("details") or {}
-            if _is_possible_anomaly_start_record(details):
+            details = e.get("details") or _EMPTY_DETAILS
+            if e['_anom']:
                 label = POSSIBLE_ANOMALY_START_LABEL
                 label_class = "start_anomaly"
             else:
@@ -2607,10 +2806,12 @@ def build_highlight_timeline(events):
             'label': label,
             'label_class': label_class,
             'process': e.get('full_name', e.get('process_name', '')),
-            'is_anomaly': bool(e.get("type") == "start" and _is_possible_anomaly_start_record(e.get("details", {}))),
-            'note': _startup_anomaly_note(e.get("details", {})),
+            'is_anomaly': bool(e.get("type") == "start" and e['_anom']),
+            'note': _startup_anomaly_note(e.get("details")),
         })
-    return sorted(items, key=lambda x: x['dt'])
+    if presorted:
+        return items
+    return sorted(items, key=itemgetter('dt'))
 
 
 def build_highlight_residency(events, window_size: int = 5):
@@ -2620,40 +2821,46 @@ def build_highlight_residency(events, window_size: int = 5):
     返回每次启动的明细，包含前1~前5的存活信息。
     额外增加：对“全部前序启动”进行驻留统计，便于观察在当前启动时此前所有高亮主进程的存活情况。
     """
+    # 单次遍历同时收集启动记录与各进程的 kill/lmk 时间
+    _prime_event_keys(events)
+    hl_set = frozenset(HIGHLIGHT_PROCESSES)
     starts = []
+    kill_map = defaultdict(list)
     for e in events:
-        if e.get("type") != "start" or e.get("is_subprocess"):
+        etype = e.get("type")
+        if etype not in ("start", "kill", "lmk") or e.get("is_subprocess"):
             continue
-        base = e.get("process_name", "").split(":")[0]
-        if base not in HIGHLIGHT_PROCESSES:
+        base = e["_base"]
+        if base not in hl_set:
+            continue
+        if etype != "start":
+            kill_map[base].append(e["time"])
             continue
-        d = e.get("details", {}) or {}
+        d = e.get("details") or _EMPTY_DETAILS
         starts.append(
             {
                 "base": base,
                 "dt": e["time"],
                 "round": d.get("round"),
                 "start_kind": d.get("start_kind", "unknown"),
-                "is_anomaly": _is_possible_anomaly_start_record(d),
+                "is_anomaly": e["_anom"],
                 "anomaly_note": _startup_anomaly_note(d),
             }
         )
-
-    kill_map = defaultdict(list)
-    for e in events:
-        if e.get("type") not in ("kill", "lmk") or e.get("is_subprocess"):
-            continue
-        base = e.get("process_name", "").split(":")[0]
-        if base in HIGHLIGHT_PROCESSES:
-            kill_map[base].append(e["time"])
     for v in kill_map.values():
         v.sort()
 
+    # 内层双重循环频繁调用，预先绑定方法引用
+    kill_map_get = kill_map.get
+    bisect_left = bisect.bisect_left
+    bisect_right = bisect.bisect_right
+
     def is_killed(base, start_dt, ref_dt):
-        for t in kill_map.get(base, []):
-            if start_dt < t < ref_dt:
-                return True
-        return False
+        # kill 时间已排序：二分判断 (start_dt, ref_dt) 开区间内是否存在查杀
+        times = kill_map_get(base)
+        if not times:
+            return False
+        return bisect_right(times, start_dt) < bisect_left(times, ref_dt)
 
     residency = []
     for idx, cur in enumerate(starts):
@@ -2756,24 +2963,30 @@ def build_highlight_residency(events, window_size: int = 5):
         })
     return residency
 
-def compute_highlight_runs(events):
+def compute_highlight_runs(events, presorted: bool = False):
     """
     构建高亮主进程前两轮启动/被杀及驻留时间表。
     返回列表，每个元素包含 proc/start1/kill1/start2/kill2/dur1/dur2/avg/second_cold。
+    presorted=True 表示 events 已按时间排序，跳过内部排序。
     """
     runs = []
-    events_sorted = sorted(events, key=lambda e: e['time'])
+    _prime_event_keys(events)
+    events_sorted = events if presorted else sorted(events, key=itemgetter('time'))
+    # 先按主进程名分桶（仅保留高亮进程），避免每个高亮进程都扫描一遍全部事件
+    highlight_set = set(HIGHLIGHT_PROCESSES)
+    buckets = defaultdict(list)
+    for e in events_sorted:
+        base = e['_base']
+        if base in highlight_set and not e.get('is_subprocess'):
+            buckets[base].append(e)
     for proc in HIGHLIGHT_PROCESSES:
         starts = []
         kills = []
         alive = False
         last_start = None
-        for e in events_sorted:
-            base = e.get('process_name', '').split(':')[0]
-            if base != proc or e.get('is_subprocess'):
-                continue
+        for e in buckets.get(proc, ()):
             if e.get('type') == 'start':
-                if _is_possible_anomaly_start_record(e.get("details", {})):
+                if e['_anom']:
                     continue
                 starts.append(e)
                 alive = True
@@ -2800,7 +3013,7 @@ def compute_highlight_runs(events):
         if not start2_evt:
             second_cold = "无第二轮"
         else:
-            start2_kind = (start2_evt.get('details') or {}).get('start_kind')
+            start2_kind = (start2_evt.get('details') or _EMPTY_DETAILS).get('start_kind')
             if start2_kind == 'cold':
                 second_cold = "是"
             elif start2_kind == 'hot':
@@ -2821,14 +3034,20 @@ def compute_highlight_runs(events):
     return runs
 
 
-def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None):
+def build_startup_survival_heatmap(
+    events,
+    app_list: Optional[List[str]] = None,
+    presorted: bool = False,
+):
     """
     构建“连续启动生存热力图”数据：
     - 纵轴：固定 app 列表（优先外部传入，否则 HIGHLIGHT_PROCESSES）
     - 横轴：固定两轮槽位（R1-01..R1-N, R2-01..R2-N），按日志中主进程启动出现顺序依次落槽
     - 值：0=未存活，1=存活，2=该槽位被启动（且存活）
+    presorted=True 表示 events 已按时间排序，跳过内部排序。
     """
-    events_sorted = sorted(events, key=lambda e: e["time"])
+    _prime_event_keys(events)
+    events_sorted = events if presorted else sorted(events, key=itemgetter("time"))
 
     # 无外部输入时，严格回退到高亮主进程列表
     source_apps = list(app_list) if app_list else list(HIGHLIGHT_PROCESSES)
@@ -2890,13 +3109,13 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
     for idx, e in enumerate(events_sorted):
         if e.get("type") != "start" or e.get("is_subprocess"):
             continue
-        if _is_possible_anomaly_start_record(e.get("details", {})):
+        if e["_anom"]:
             anomaly_start_count += 1
             continue
-        base = _base_name(e.get("process_name", ""))
+        base = e["_base"]
         if base not in app_set:
             continue
-        details = e.get("details", {}) or {}
+        details = e.get("details") or _EMPTY_DETAILS
         seq_slot = details.get("sequence_slot")
         if isinstance(seq_slot, int) and 1 <= seq_slot <= total_slots:
             has_sequence_slot = True
@@ -2914,9 +3133,9 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
         for idx, e in enumerate(events_sorted):
             if e.get("type") != "start" or e.get("is_subprocess"):
                 continue
-            if _is_possible_anomaly_start_record(e.get("details", {})):
+            if e["_anom"]:
                 continue
-            base = _base_name(e.get("process_name", ""))
+            base = e["_base"]
             if base not in app_set:
                 continue
             observed_start_indices.append(idx)
@@ -2935,35 +3154,38 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
             slot_event_idx[match_pos] = obs_idx
             last_expected_pos = match_pos
 
-    # 预计算：每个事件后的存活状态快照
-    alive = {pkg: False for pkg in apps}
-    alive_states_after = []
-    for e in events_sorted:
+    # 预计算：单次遍历维护存活状态，仅在槽位命中的启动事件处留存快照（无需为每个事件复制一份）
+    # 存活状态用整数位图表示：第 i 位对应 apps[i]
+    snapshot_idx = set(slot_event_idx.values())
+    app_pos = {pkg: i for i, pkg in enumerate(apps)}
+    app_bit = {pkg: 1 << i for pkg, i in app_pos.items()}
+    app_range = range(app_count)
+    alive_mask = 0
+    alive_states_after: Dict[int, int] = {}
+    for idx, e in enumerate(events_sorted):
         if not e.get("is_subprocess"):
             etype = e.get("type")
             if etype in ("start", "kill", "lmk"):
-                base = _base_name(e.get("process_name", ""))
-                if base in app_set:
-                    if etype == "start":
-                        if _is_possible_anomaly_start_record(e.get("details", {})):
-                            alive_states_after.append(dict(alive))
-                            continue
-                        alive[base] = True
-                    else:
-                        alive[base] = False
-        alive_states_after.append(dict(alive))
+                bit = app_bit.get(e["_base"])
+                if bit is not None:
+                    if etype != "start":
+                        alive_mask &= ~bit
+                    elif not e["_anom"]:
+                        alive_mask |= bit
+        if idx in snapshot_idx:
+            alive_states_after[idx] = alive_mask
 
     # 严格按给定包名顺序填槽位：
     # - 命中预期启动日志 -> 正常写入
     # - 未命中 -> 标记异常槽位（淡红），其余进程状态沿用上一个槽位
-    last_state = {pkg: False for pkg in apps}
+    last_mask = 0
     for slot_pos, slot in enumerate(slots):
         expected_pkg = slot.get("expected_process")
         start_idx = slot_event_idx.get(slot_pos)
 
         if start_idx is None:
-            snapshot = [1 if last_state[pkg] else 0 for pkg in apps]
-            alive_count = sum(1 for pkg in apps if last_state[pkg])
+            snapshot = [(last_mask >> i) & 1 for i in app_range]
+            alive_count = bin(last_mask).count("1")
             slot.update(
                 {
                     "process": expected_pkg,
@@ -2981,8 +3203,8 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
             continue
 
         event = events_sorted[start_idx]
-        state_now = alive_states_after[start_idx] if 0 <= start_idx < len(alive_states_after) else dict(last_state)
-        details = event.get("details", {}) or {}
+        mask_now = alive_states_after.get(start_idx, last_mask)
+        details = event.get("details") or _EMPTY_DETAILS
         start_kind = details.get("start_kind", "unknown")
         if start_kind == "cold":
             start_kind_cn = "冷启动"
@@ -2991,21 +3213,20 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
         else:
             start_kind_cn = "未知"
 
-        snapshot = []
-        alive_count = 0
-        for pkg in apps:
-            if state_now.get(pkg):
-                snapshot.append(2 if pkg == expected_pkg else 1)
-                alive_count += 1
-            else:
-                snapshot.append(0)
+        # 快照直接由位图展开；位图只含 apps 对应的位，置位数即存活数。
+        # 预期启动进程若存活，其格子标记为 2（本槽位启动）
+        snapshot = [(mask_now >> i) & 1 for i in app_range]
+        alive_count = bin(mask_now).count("1")
+        expected_pos = app_pos.get(expected_pkg)
+        if expected_pos is not None and snapshot[expected_pos]:
+            snapshot[expected_pos] = 2
 
         slot.update(
             {
                 "process": expected_pkg,
                 "start_kind": start_kind,
                 "start_kind_cn": start_kind_cn,
-                "time": event["time"].strftime("%m-%d %H:%M:%S.%f")[:-3] if event.get("time") else "-",
+                "time": _format_ts_ms(event["time"]) if event.get("time") else "-",
                 "alive_count": alive_count,
                 "dead_count": app_count - alive_count,
                 "snapshot": snapshot,
@@ -3014,7 +3235,7 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
                 "is_missing_expected_start": False,
             }
         )
-        last_state = dict(state_now)
+        last_mask = mask_now
 
     label_stride = 1
     if total_slots >= 36:
@@ -3033,20 +3254,16 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
         )
         slot["display_label"] = slot["label"] if show_label else ""
 
-    matrix = []
+    # 槽位快照按列存放，zip(*) 转置为按行矩阵；取值只有 0/1/2，
+    # 行统计用 list.count 在 C 层完成：存活 = 非 0，启动 = 2
+    if slots:
+        matrix = [list(row) for row in zip(*(slot["snapshot"] for slot in slots))]
+    else:
+        matrix = [[] for _ in apps]
     row_stats = []
-    for row_idx, pkg in enumerate(apps):
-        row_vals = []
-        alive_slots = 0
-        launch_slots = 0
-        for slot in slots:
-            v = slot["snapshot"][row_idx]
-            row_vals.append(v)
-            if v > 0:
-                alive_slots += 1
-            if v == 2:
-                launch_slots += 1
-        matrix.append(row_vals)
+    for pkg, row_vals in zip(apps, matrix):
+        alive_slots = total_slots - row_vals.count(0)
+        launch_slots = row_vals.count(2)
         alive_rate = (alive_slots / total_slots * 100.0) if total_slots else 0.0
         row_stats.append(
             {
@@ -3080,176 +3297,1029 @@ def build_startup_survival_heatmap(events, app_list: Optional[List[str]] = None)
     }
 
 
-def generate_report_html(
-    events,
-    summary,
-    output_file,
-    heatmap_apps: Optional[List[str]] = None,
-    device_info: Optional[dict] = None,
-    meminfo_bundle: Optional[dict] = None,
-    include_startup_section: bool = True,
-):
-    """生成仅包含 summary 的 HTML 报告（三板块：全部 / 主进程 / 高亮主进程）。"""
-    s = _to_plain(summary)
-    highlight_timeline = build_highlight_timeline(events)
-    highlight_residency = build_highlight_residency(events)
-    highlight_runs = compute_highlight_runs(events)
-    startup_heatmap = build_startup_survival_heatmap(events, app_list=heatmap_apps)
-    device_info_data = _to_plain(device_info or {})
-    meminfo_data = _to_plain(meminfo_bundle or {})
-
-    def _residency_avg(res_list):
-        valid_res = [rec for rec in (res_list or []) if not rec.get("is_anomaly")]
-        if not valid_res:
-            return {
-                "alive": 0,
-                "rates": {n: 0 for n in range(1, 6)},
-                "all_rate": 0,
-                "all_alive": 0,
-            }
-        rates = {n: [] for n in range(1, 6)}
-        all_rates = []
-        alive_list = []
-        all_alive_list = []
-        for rec in valid_res:
-            alive_list.append(rec.get("alive_cnt", 0))
-            all_alive_list.append(rec.get("all_alive_cnt", 0))
-            # 全量前序均值
-            pct_full = rec.get("all_rate_value")
-            if pct_full is not None:
-                all_rates.append(pct_full)
-            for n in range(1, 6):
-                pct = rec["per_window"][n].get("rate_value")
-                if pct is not None:
-                    rates[n].append(pct)
-        avg_alive = sum(alive_list) / len(alive_list) if alive_list else 0
-        avg_all_alive = sum(all_alive_list) / len(all_alive_list) if all_alive_list else 0
-        avg_rates = {n: (sum(v) / len(v) if v else 0) for n, v in rates.items()}
-        avg_all = sum(all_rates) / len(all_rates) if all_rates else 0
-        return {"alive": avg_alive, "rates": avg_rates, "all_rate": avg_all, "all_alive": avg_all_alive}
-
-    residency_avg = _residency_avg(highlight_residency)
-    html_escape = html.escape
-
-    def _device_info_value(key: str) -> str:
-        value = str(device_info_data.get(key, "") or "").strip()
-        return value if value else "-"
+_CSS_WHITESPACE_PATTERN = re.compile(r"\s+")
+_CSS_PUNCT_SPACE_PATTERN = re.compile(r"\s*([{};,>])\s*")
 
-    device_rows = [
-        ("Build fingerprint", _device_info_value("build_fingerprint")),
-        ("ro.product.device", _device_info_value("ro_product_device")),
-        ("ro.board.platform", _device_info_value("ro_board_platform")),
-        ("/proc/meminfo MemTotal", _device_info_value("mem_total")),
-        ("/proc/meminfo SwapTotal", _device_info_value("swap_total")),
-        ("Linux version", _device_info_value("linux_version")),
-    ]
-    proc_mv_text = str(device_info_data.get("proc_mv", "") or "").strip()
-    if not proc_mv_text:
-        proc_mv_text = "未匹配到 /proc/mv 内容"
-    proc_mv_block_html = html_escape(proc_mv_text)
-    auto_match_info = _to_plain(device_info_data.get("auto_match_info", {}) or {})
-    if auto_match_info:
-        def _bool_cn(v) -> str:
-            return "是" if bool(v) else "否"
 
-        status_text = str(auto_match_info.get("status", "") or "").strip() or "-"
-        device_rows.append(("自动匹配状态", status_text))
-        auto_lines = [
-            f"自动匹配启用: {_bool_cn(auto_match_info.get('enabled'))}",
-            f"目标应用数: {auto_match_info.get('target_app_count', '-')}",
-            f"目标轮次: {auto_match_info.get('rounds', '-')}",
-            f"识别到候选窗口: {_bool_cn(auto_match_info.get('detected'))}",
-            f"采用候选窗口: {_bool_cn(auto_match_info.get('used'))}",
-            f"状态: {status_text}",
-        ]
-        if auto_match_info.get("window_start") or auto_match_info.get("window_end"):
-            auto_lines.append(
-                f"候选时间段: {auto_match_info.get('window_start', '-')}"
-                f" ~ {auto_match_info.get('window_end', '-')}"
-            )
-        if auto_match_info.get("match_score") is not None:
-            auto_lines.append(
-                f"匹配度: {auto_match_info.get('match_score')}% "
-                f"(LCS {auto_match_info.get('matched_start_count', '-')}/"
-                f"{auto_match_info.get('expected_count', '-')})"
-            )
-        if auto_match_info.get("mismatch_count") is not None:
-            auto_lines.append(
-                f"误差/容差: {auto_match_info.get('mismatch_count', '-')}/"
-                f"{auto_match_info.get('tolerance', '-')}"
-            )
-        if auto_match_info.get("observed_count") is not None:
-            auto_lines.append(
-                f"数量校验: 预期 {auto_match_info.get('expected_count', '-')}"
-                f", 实际窗口 {auto_match_info.get('observed_count', '-')}"
-            )
-        if auto_match_info.get("match_variant"):
-            auto_lines.append(f"匹配策略: {auto_match_info.get('match_variant')}")
-        if auto_match_info.get("duration_sec") is not None:
-            auto_lines.append(f"过程时长: {float(auto_match_info.get('duration_sec')):.1f}s")
-        if auto_match_info.get("tail_gap_sec") is not None:
-            auto_lines.append(f"距日志末尾: {float(auto_match_info.get('tail_gap_sec')):.1f}s")
-        if auto_match_info.get("confidence"):
-            auto_lines.append(f"置信度: {auto_match_info.get('confidence')}")
-        if auto_match_info.get("file_end_time"):
-            auto_lines.append(f"日志最晚时间: {auto_match_info.get('file_end_time')}")
-        if auto_match_info.get("bugreport_time_hint"):
-            auto_lines.append(f"bugreport文件时间: {auto_match_info.get('bugreport_time_hint')}")
-        if auto_match_info.get("bugreport_to_log_end_gap_sec") is not None:
-            auto_lines.append(
-                f"bugreport与日志最晚时间差: {float(auto_match_info.get('bugreport_to_log_end_gap_sec')):.1f}s"
-            )
-        if auto_match_info.get("applied_start_time") or auto_match_info.get("applied_end_time"):
-            auto_lines.append(
-                f"最终应用过滤时间段: {auto_match_info.get('applied_start_time', '-')}"
-                f" ~ {auto_match_info.get('applied_end_time', '-')}"
-            )
-        if auto_match_info.get("detection_error"):
-            auto_lines.append(f"自动匹配异常: {auto_match_info.get('detection_error')}")
-    else:
-        auto_lines = ["未提供自动匹配信息"]
-    auto_match_block_html = html_escape("\n".join(str(line) for line in auto_lines if str(line).strip()))
-    device_info_rows_html = "".join(
-        f"<tr><th>{html_escape(label)}</th><td>{html_escape(value)}</td></tr>"
-        for label, value in device_rows
-    )
-    # 预构建高亮驻留表 HTML
-    if highlight_runs:
-        hl_runs_rows = []
-        for r in highlight_runs:
-            hl_runs_rows.append(
-                f"<tr><td>{html_escape(r['proc'])}</td>"
-                f"<td>{r['second_cold']}</td>"
-                f"<td>{r['start1']}</td>"
-                f"<td>{r['kill1']}</td>"
-                f"<td>{r['dur1']}</td>"
-                f"<td>{r['start2']}</td>"
-                f"<td>{r['kill2']}</td>"
-                f"<td>{r['dur2']}</td>"
-                f"<td>{r['avg']}</td></tr>"
-            )
-        hl_runs_table_html = "".join(hl_runs_rows)
-    else:
-        hl_runs_table_html = '<tr><td colspan="9" style="text-align:center;color:#9fb3c8;">无数据</td></tr>'
+def _minify_css(css: str) -> str:
+    """压缩样式表空白：连续空白合并为一个空格，并去掉 { } ; , > 两侧的空白。
 
+    仅处理空白，不改写选择器与取值；样式中不含注释及带这些符号的字符串字面量。
+    """
+    css = _CSS_WHITESPACE_PATTERN.sub(" ", css)
+    return _CSS_PUNCT_SPACE_PATTERN.sub(r"\1", css).strip()
+
+
+# Summary HTML 报告的静态样式表；作为普通字符串常量，不参与每次渲染时的 f-string 花括号转义。
+# 报告需保持单文件可下载查看，样式仍内联，仅在导入时压缩一次空白
+_SUMMARY_REPORT_CSS = _minify_css("""\
+    body { font-family: 'Segoe UI', system-ui, -apple-system, sans-serif; background:#0b1118; color:#e6edf3; margin:0; padding:24px; }
+    .page { max-width:min(1760px,96vw); margin:0 auto; }
+    h1, h2 { margin: 0 0 10px; }
+    h3 { margin: 14px 0 8px; }
+    .section { margin-bottom: 28px; }
+    .cards.single { display:block; }
+    .card { background:#141c26; padding:12px 14px; border-radius:10px; border:1px solid #1f2a36; box-shadow:0 8px 24px rgba(0,0,0,0.35); }
+    .card-wide { width:100%; box-sizing:border-box; }
+    .card-title { font-weight:700; color:#f5f7fb; margin-bottom:10px; letter-spacing:0.3px; font-size:20px; }
+    .card-row { display:flex; align-items:center; justify-content:space-between; gap:12px; padding:6px 0; border-bottom:1px solid #172334; }
+    .card-row:last-child { border-bottom:none; }
+    .row-label { color:#9fb3c8; font-size:13px; }
+    .row-value { color:#f5f7fb; font-weight:600; font-variant-numeric:tabular-nums; }
+    .mem-block-grid { display:grid; grid-template-columns:repeat(4, minmax(0, 1fr)); gap:12px; }
+    .mem-block { display:block; padding:12px; border:1px solid #223142; border-radius:10px; background:#0f1825; }
+    .mem-block-head { display:flex; align-items:baseline; justify-content:space-between; gap:10px; margin-bottom:8px; }
+    .mem-block-title { margin:0; color:#dce9fa; font-size:16px; font-weight:700; letter-spacing:0.2px; }
+    .mem-block-sub { color:#8da6bf; font-size:12px; font-weight:700; letter-spacing:0.2px; }
+    .mem-block-body { min-width:0; }
+    .mem-metric-wrap { display:flex; flex-direction:column; gap:8px; }
+    .mem-empty { padding:10px 12px; border:1px dashed #29415c; border-radius:8px; color:#9fb3c8; background:#0f1722; }
+    .chart-grid { display:grid; grid-template-columns: repeat(auto-fit,minmax(280px,1fr)); gap:16px; }
+    .chart-card { background:#101821; border:1px solid #1f2a36; border-radius:12px; padding:10px; box-shadow:0 6px 18px rgba(0,0,0,0.35); position:relative; }
+    .chart-title { position:absolute; left:12px; top:10px; color:#9fb3c8; font-size:12px; letter-spacing:0.2px; }
+    .chart-card canvas { margin-top:18px; }
+    .timeline { border:1px solid #1f2a36; border-radius:12px; background:#101821; padding:10px; max-width:72%; margin:0 auto; }
+    .timeline-row { display:grid; grid-template-columns:120px 1fr; gap:8px; padding:6px 8px; border-bottom:1px solid #1b2634; align-items:center; }
+    .timeline-row:last-child { border-bottom:none; }
+    .timeline-row.anomaly-row { background:rgba(120, 130, 144, 0.18); }
+    .tl-time { color:#cdd6e3; font-size:12px; letter-spacing:0.2px; }
+    .tl-content { display:flex; justify-content:space-between; width:100%; }
+    .tl-left { color:#f5f7fb; font-size:14px; text-align:left; min-height:1.2em; }
+    .tl-right { color:#f5f7fb; font-size:14px; text-align:right; min-height:1.2em; }
+    .tl-anomaly-note { color:#a8b3c1; font-size:12px; }
+    .tl-legend { display:flex; gap:8px; padding:4px 8px 8px 8px; }
+    .pill { padding:2px 8px; border-radius:999px; font-size:12px; font-weight:700; border:1px solid transparent; }
+    .pill-start { background:#123b26; color:#6cf0a7; border-color:#1f8a52; }
+    .pill-start-cold { background:#3b1a1a; color:#ffb1b1; border-color:#a54444; }
+    .pill-start-hot { background:#123b26; color:#6cf0a7; border-color:#1f8a52; }
+    .pill-start-anomaly { background:#2f3440; color:#d2d9e3; border-color:#768395; }
+    .pill-kill { background:#3b1a1a; color:#ffb1b1; border-color:#a54444; }
+    .pill-lmk { background:#2b2140; color:#d6b6ff; border-color:#6f4bb7; }
+    .hl-res-table-wrapper { max-width:min(1600px,95vw); margin:12px auto 0 auto; overflow-x:auto; }
+    .hl-res-table { width:100%; border-collapse: collapse; background:#101821; border:1px solid #1f2a36; }
+    .hl-res-table th, .hl-res-table td { padding:8px 10px; border-bottom:1px solid #1f2a36; text-align:left; color:#e6edf3; }
+    .hl-res-table th { color:#9fb3c8; font-size:12px; letter-spacing:0.3px; }
+    .hl-res-table tbody tr:hover { background:#142032; }
+    .rate-ok { color:#6cf0a7 !important; font-weight:600; }
+    .rate-bad { color:#ff8b8b !important; font-weight:700; }
+    details summary { cursor:pointer; color:#8fb4ff; }
+    canvas { width:100%; height:240px; }
+    .accordion { border:1px solid #1f2a36; border-radius:12px; background:#0f1722; }
+    .acc-item { border-bottom:1px solid #1f2a36; }
+    .acc-item:last-child { border-bottom:none; }
+    .acc-header { padding:10px 12px; cursor:pointer; display:flex; justify-content:space-between; align-items:center; }
+    .acc-header:hover { background:#131c28; }
+    .acc-title { font-weight:600; color:#f5f7fb; }
+    .acc-meta { color:#9fb3c8; font-size:12px; }
+    .acc-body { display:none; padding:0 12px 12px 12px; font-size:13px; line-height:1.6; color:#d8e2f2; }
+    .hl-event-list { padding:8px 10px; }
+    .hl-event-item { border-bottom:1px solid #1f2a36; padding:6px 0; }
+    .hl-event-item:last-child { border-bottom:none; }
+    .hl-event-item summary { cursor:pointer; color:#cfe1ff; font-size:12px; font-weight:600; overflow-x:auto; }
+    .hl-event-summary-line { display:block; white-space:pre; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:12px; line-height:1.45; letter-spacing:0.1px; }
+    .hl-event-item pre { margin:8px 0 4px 0; padding:8px; background:#0b141f; border:1px solid #1f2a36; border-radius:8px; color:#d8e2f2; white-space:pre-wrap; }
+    .mem-low-event-item { border-bottom:1px solid #1f2a36; padding:6px 0; }
+    .mem-low-event-item:last-child { border-bottom:none; }
+    .mem-low-event-item summary { cursor:pointer; color:#cfe1ff; font-size:12px; font-weight:600; overflow-x:auto; }
+    .mem-low-event-item pre { margin:8px 0 4px 0; padding:8px; background:#0b141f; border:1px solid #1f2a36; border-radius:8px; color:#d8e2f2; white-space:pre-wrap; }
+    .kv { margin:2px 0; }
+    .kv strong { color:#8fb4ff; }
+    .pill { display:inline-block; padding:2px 8px; margin:2px 4px 2px 0; border-radius:999px; background:#16263a; color:#cfe1ff; font-size:12px; }
+    .summary-board { display:grid; grid-template-columns:repeat(3, minmax(0, 1fr)); gap:12px; margin-bottom:16px; }
+    .summary-card { background:#101821; border:1px solid #1f2a36; border-radius:12px; padding:12px; }
+    .summary-title { color:#dce9fa; font-size:15px; font-weight:700; margin-bottom:10px; }
+    .summary-stack { display:flex; flex-direction:column; gap:8px; }
+    .summary-row { display:grid; gap:8px; }
+    .summary-row.cols-2 { grid-template-columns:repeat(2, minmax(0, 1fr)); }
+    .summary-row.cols-3 { grid-template-columns:repeat(3, minmax(0, 1fr)); }
+    .summary-row.cols-6 { grid-template-columns:repeat(6, minmax(0, 1fr)); }
+    .summary-row.cols-7 { grid-template-columns:repeat(7, minmax(0, 1fr)); }
+    .summary-item { background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px 9px; min-height:58px; }
+    .summary-item.compact { padding:7px 8px; min-height:52px; }
+    .summary-item.compact .summary-label { font-size:11px; }
+    .summary-item.compact .summary-value { font-size:17px; }
+    .summary-label { color:#8da6bf; font-size:12px; }
+    .summary-value { color:#f5f7fb; font-size:22px; font-weight:700; line-height:1.2; margin-top:2px; font-variant-numeric:tabular-nums; }
+    .summary-value.danger { color:#ff8b8b; }
+    .summary-value.lmk { color:#d6b6ff; }
+    .summary-mem-note { color:#8da6bf; font-size:11px; margin-bottom:8px; }
+    .summary-mem-table { width:100%; border-collapse:collapse; table-layout:fixed; }
+    .summary-mem-table th, .summary-mem-table td { padding:7px 8px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; font-variant-numeric:tabular-nums; }
+    .summary-mem-table th:first-child, .summary-mem-table td:first-child { text-align:left; }
+    .summary-mem-table th { color:#9fb3c8; font-weight:700; background:#111a27; }
+    .summary-empty { color:#8ea4bc; }
+    .detail-tabs { display:flex; flex-wrap:wrap; gap:8px; margin:0 0 14px 0; }
+    .tab-btn { appearance:none; border:1px solid #2a3b50; background:#0f1722; color:#b9cee5; border-radius:999px; padding:6px 12px; font-size:12px; font-weight:700; cursor:pointer; }
+    .tab-btn:hover { border-color:#4f77a3; color:#dcebff; }
+    .tab-btn.active { border-color:#4f77a3; color:#dcebff; background:#16263a; }
+    .tab-panel { display:none; }
+    .tab-panel.active { display:block; }
+    .subsection { margin-top:12px; }
+    .subsection:first-of-type { margin-top:0; }
+    .kill-scope-single { margin:0 0 10px 0; }
+    .kill-scope-card { background:#0f1722; border:1px solid #1f2a36; border-radius:10px; padding:10px; }
+    .kill-scope-title { color:#dce9fa; font-size:13px; font-weight:700; margin-bottom:8px; }
+    .kill-scope-row { display:flex; justify-content:space-between; align-items:center; gap:8px; color:#9fb3c8; font-size:12px; padding:3px 0; }
+    .kill-scope-row strong { color:#f5f7fb; font-size:16px; font-weight:700; font-variant-numeric:tabular-nums; }
+    .kill-row-5 { display:grid; grid-template-columns:repeat(5, minmax(0,1fr)); gap:14px; }
+    .kill-row-5 canvas { height:185px; }
+    .kill-index-empty { color:#8ea4bc; font-size:12px; }
+    .kill-index-filters { display:grid; grid-template-columns:repeat(3, minmax(0,1fr)); gap:10px; margin-bottom:10px; }
+    .kill-filter-item { background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px; }
+    .kill-filter-item label { display:block; color:#8da6bf; font-size:12px; margin-bottom:6px; }
+    .kill-filter-item select { width:100%; background:#0b141f; color:#dce9fa; border:1px solid #2a3b50; border-radius:6px; padding:6px 8px; font-size:12px; }
+    .mem-table-wrap { width:100%; overflow-x:auto; }
+    .mem-table { width:100%; border-collapse: collapse; table-layout:fixed; }
+    .mem-table th, .mem-table td { padding:7px 10px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; white-space:nowrap; font-variant-numeric:tabular-nums; }
+    .mem-table th:first-child, .mem-table td:first-child { text-align:left; }
+    .mem-table th { color:#9fb3c8; font-weight:700; background:#111a27; }
+    .mem-table tbody tr:hover { background:#142032; }
+    .mem-metric { color:#d6e7ff; font-weight:700; white-space:nowrap; }
+    .mem-empty-cell { color:#8ea4bc; text-align:center !important; font-style:italic; }
+    .hl-run-table { width:100%; border-collapse:collapse; background:#101821; border:1px solid #1f2a36; }
+    .hl-run-table th, .hl-run-table td { padding:6px 8px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:left; }
+    .hl-run-table th { color:#9fb3c8; font-weight:600; }
+    .hl-run-table tbody tr:nth-child(odd) { background:#111b27; }
+    .mem-dist-grid { display:grid; grid-template-columns:repeat(4, minmax(0,1fr)); gap:12px; margin-top:8px; }
+    .mem-dist-grid .chart-card canvas { height:200px; }
+    .mem-low-filters { display:grid; grid-template-columns:repeat(2, minmax(0,1fr)); gap:10px; margin:8px 0 10px 0; }
+    .mem-low-item { background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px; }
+    .mem-low-item label { display:block; color:#8da6bf; font-size:12px; margin-bottom:6px; }
+    .mem-low-item select { width:100%; background:#0b141f; color:#dce9fa; border:1px solid #2a3b50; border-radius:6px; padding:6px 8px; font-size:12px; }
+    .mem-low-note { color:#8ea4bc; font-size:12px; margin-bottom:8px; }
+    .meminfo-source { color:#8da6bf; font-size:12px; margin:2px 0 10px 0; word-break:break-all; }
+    .meminfo-summary-grid { display:grid; grid-template-columns:repeat(4, minmax(0,1fr)); gap:10px; margin-bottom:10px; }
+    .meminfo-chart-grid { display:grid; grid-template-columns:repeat(2, minmax(0,1fr)); gap:12px; margin-bottom:12px; }
+    .meminfo-table-grid { display:grid; grid-template-columns:1.1fr 1fr; gap:12px; }
+    .meminfo-table-wrap { width:100%; overflow-x:auto; border:1px solid #1f2a36; border-radius:10px; background:#101821; }
+    .meminfo-table { width:100%; border-collapse:collapse; table-layout:fixed; }
+    .meminfo-table th, .meminfo-table td { padding:8px 10px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; font-variant-numeric:tabular-nums; }
+    .meminfo-table th:first-child, .meminfo-table td:first-child { text-align:left; }
+    .meminfo-table th:nth-child(2), .meminfo-table td:nth-child(2) { text-align:left; }
+    .meminfo-table th { color:#9fb3c8; font-weight:700; background:#111a27; }
+    .meminfo-table tbody tr:hover { background:#142032; }
+    .meminfo-subtabs { display:flex; gap:8px; margin:8px 0 10px 0; }
+    .meminfo-subtab-btn { appearance:none; border:1px solid #2a3b50; background:#0f1722; color:#b9cee5; border-radius:999px; padding:5px 11px; font-size:12px; font-weight:700; cursor:pointer; }
+    .meminfo-subtab-btn:hover { border-color:#4f77a3; color:#dcebff; }
+    .meminfo-subtab-btn.active { border-color:#4f77a3; color:#dcebff; background:#16263a; }
+    .meminfo-subpanel { display:none; }
+    .meminfo-subpanel.active { display:block; }
+    .meminfo-priority-row { display:grid; grid-template-columns:1fr 340px 1fr; gap:12px; align-items:start; }
+    .meminfo-priority-chart { height:340px; }
+    .meminfo-priority-canvas-wrap { width:min(280px, 100%); height:280px; margin:0 auto; }
+    .meminfo-priority-canvas-wrap canvas { width:100% !important; height:100% !important; margin-top:8px; }
+    .device-table-wrap { width:100%; overflow-x:auto; }
+    .device-info-table { width:100%; border-collapse:collapse; table-layout:fixed; background:#101821; border:1px solid #1f2a36; }
+    .device-info-table th, .device-info-table td { padding:9px 10px; border-bottom:1px solid #1f2a36; text-align:left; color:#e6edf3; font-size:12px; vertical-align:top; }
+    .device-info-table th { width:260px; color:#9fb3c8; font-weight:700; }
+    .device-info-pre { margin:0; padding:10px; color:#dce9fa; background:#0f1722; border:1px solid #1f2a36; border-radius:8px; overflow-x:auto; white-space:pre-wrap; word-break:break-word; font-size:12px; line-height:1.55; }
+    .hl-residency-meta { color:#9fb3c8; font-size:12px; margin:6px 0 8px 0; }
+    .hl-residency-meta strong { color:#f5f7fb; font-variant-numeric:tabular-nums; }
+    .hl-start-cold { color:#6cf0a7 !important; font-weight:700; }
+    .hl-start-hot { color:#ff8b8b !important; font-weight:700; }
+    .hl-start-anomaly { color:#d1dae5 !important; font-weight:700; }
+    .hl-proc-em { color:#8fc8ff !important; font-weight:700; }
+    .hl-anomaly-row { background:#2b3240 !important; opacity:0.72; }
+    .hl-anomaly-cell { color:#a7b4c3 !important; }
+    .hl-anomaly-note { color:#99a9bc; font-size:11px; margin-top:2px; }
+    .start-subtitle { margin-top:16px; }
+    .startup-heatmap-meta { display:flex; flex-wrap:wrap; gap:14px; color:#9fb3c8; font-size:12px; margin:2px 0 8px 0; }
+    .startup-heatmap-meta strong { color:#f5f7fb; font-variant-numeric:tabular-nums; }
+    .startup-heatmap-legend { display:flex; flex-wrap:wrap; gap:12px; color:#9fb3c8; font-size:12px; margin:4px 0 10px 0; }
+    .startup-heatmap-legend span { display:inline-flex; align-items:center; gap:6px; }
+    .startup-heatmap-legend i.startup-heatmap-cell { display:inline-block; }
+    .startup-heatmap-legend .startup-heatmap-cell { width:14px; min-width:14px; height:14px; line-height:0; border-radius:3px; box-sizing:border-box; border:1px solid #2a3443; }
+    .startup-heatmap-wrap { --heat-cell-size: 14px; overflow-x:auto; border:1px solid #1f2a36; border-radius:10px; background:#0f1722; padding:8px; }
+    .startup-heatmap-table { border-collapse:separate; border-spacing:4px; min-width:max-content; table-layout:fixed; }
+    .startup-heatmap-table th, .startup-heatmap-table td { vertical-align:middle; }
+    .startup-heatmap-head { color:#8da6bf; font-size:12px; font-weight:600; text-align:center; white-space:nowrap; }
+    .startup-heatmap-proc-head, .startup-heatmap-proc { position:sticky; left:0; z-index:2; background:#0f1722; }
+    .startup-heatmap-proc { color:#dce9fa; font-size:12px; font-weight:600; text-align:left; padding:0 8px 0 2px; min-width:190px; max-width:320px; white-space:nowrap; }
+    .startup-heatmap-slot-head { position:relative; min-width:var(--heat-cell-size); width:var(--heat-cell-size); max-width:var(--heat-cell-size); height:30px; padding:0; font-variant-numeric:tabular-nums; overflow:visible; }
+    .startup-slot-label { position:absolute; left:50%; top:4px; transform:translateX(-50%) rotate(-28deg); transform-origin:center top; white-space:nowrap; font-size:12px; color:#8da6bf; pointer-events:none; }
+    .startup-slot-label.round-start { color:#b9d9ff; font-weight:700; }
+    .startup-heatmap-stat-head, .startup-heatmap-stat { white-space:nowrap; font-variant-numeric:tabular-nums; color:#cdd6e3; font-size:12px; text-align:left; padding-left:8px; min-width:130px; }
+    td.startup-heatmap-cell {
+      width:var(--heat-cell-size) !important;
+      min-width:var(--heat-cell-size) !important;
+      max-width:var(--heat-cell-size) !important;
+      height:var(--heat-cell-size) !important;
+      min-height:var(--heat-cell-size) !important;
+      max-height:var(--heat-cell-size) !important;
+      aspect-ratio:1 / 1;
+      padding:0 !important;
+      line-height:0;
+      border-radius:3px;
+      box-sizing:border-box;
+      border:1px solid #2a3443;
+      overflow:hidden;
+    }
+    .startup-heatmap-cell span { display:block; width:100%; height:100%; margin:0; padding:0; }
+    .startup-heatmap-cell.lvl-dead { background:#1a2431; border-color:#2a3443; }
+    .startup-heatmap-cell.lvl-alive { background:#1f6f3d; border-color:#2ea043; }
+    .startup-heatmap-cell.lvl-launch { background:#2ea043; border-color:#56d364; box-shadow:0 0 0 1px rgba(86,211,100,0.28); }
+    .startup-heatmap-cell.lvl-miss { background:#5b2a2a; border-color:#d07b7b; box-shadow:0 0 0 1px rgba(208,123,123,0.22); }
+    .startup-heatmap-colstat { color:#9fb3c8; font-size:11px; text-align:center; font-variant-numeric:tabular-nums; }
+    .startup-heatmap-colstat.dead { color:#ffb4b4; }
+    .startup-heatmap-footlabel { position:sticky; left:0; z-index:2; background:#0f1722; color:#8da6bf; font-size:11px; font-weight:600; text-align:left; padding:0 6px 0 2px; }
+    .startup-heatmap-empty { color:#9fb3c8; border:1px dashed #29415c; border-radius:8px; padding:10px 12px; background:#0f1722; }
+    """)
+
+# 窄屏（≤980px）覆盖规则单独成块，以 <style media> 输出；宽屏下浏览器不对其做规则匹配
+_SUMMARY_REPORT_MOBILE_CSS_MEDIA = "(max-width: 980px)"
+_SUMMARY_REPORT_MOBILE_CSS = _minify_css("""\
+    body { padding:14px; }
+    .page { max-width:100%; }
+    .summary-board { grid-template-columns:1fr; }
+    .summary-row.cols-6 { grid-template-columns:repeat(3, minmax(0, 1fr)); }
+    .summary-row.cols-7 { grid-template-columns:repeat(4, minmax(0, 1fr)); }
+    .detail-tabs { gap:6px; }
+    .kill-row-5, .kill-index-filters { grid-template-columns:1fr; gap:10px; }
+    .timeline { max-width:100%; }
+    .mem-block-grid { grid-template-columns:1fr; }
+    .mem-dist-grid { grid-template-columns:1fr; }
+    .mem-low-filters { grid-template-columns:1fr; }
+    .meminfo-summary-grid { grid-template-columns:repeat(2, minmax(0,1fr)); }
+    .meminfo-chart-grid { grid-template-columns:1fr; }
+    .meminfo-table-grid { grid-template-columns:1fr; }
+    .meminfo-priority-row { grid-template-columns:1fr; }
+    .meminfo-priority-canvas-wrap { height:240px; }
+    .mem-block-head { flex-wrap:wrap; gap:6px; margin-bottom:6px; }
+    .mem-block-title { font-size:15px; }
+    .chart-grid { grid-template-columns:1fr; }
+    .hl-event-summary-line { white-space:normal; }
+    .startup-heatmap-proc { min-width:140px; max-width:220px; }
+    """)
+
+
+# Summary HTML 报告的静态脚本（图表渲染与页面交互）；数据常量 charts 由模板在其前方注入，
+# 内存低值事件从 #hlMemLowEventsData 数据标签按需解析
+_SUMMARY_REPORT_SCRIPT = """
+    // 柱状图渐变只与固定的 0→260px 纵向坐标有关，与具体画布无关：首次绘制时创建，之后复用
+    let barGradient = null;
+    function getBarGradient(canvas) {
+      if (!barGradient) {
+        barGradient = canvas.getContext('2d').createLinearGradient(0, 0, 0, 260);
+        barGradient.addColorStop(0, 'rgba(123,198,255,0.9)');
+        barGradient.addColorStop(1, 'rgba(123,198,255,0.2)');
+      }
+      return barGradient;
+    }
 
-    def card(label, value):
-        return f'<div class="card"><div class="label">{label}</div><div class="value">{value}</div></div>'
+    function renderBar(canvasId, dataObj, label) {
+      const ctx = document.getElementById(canvasId);
+      if (!ctx) return;
+      const labels = Object.keys(dataObj || {}); 
+      const values = Object.values(dataObj || {});
+      if (labels.length === 0) {
+        const titleEl = ctx.parentElement.querySelector('.chart-title');
+        const titleHtml = titleEl ? titleEl.outerHTML : '';
+        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
+        return;
+      }
+      const gradient = getBarGradient(ctx);
+      new Chart(ctx, {
+        type: 'bar',
+        data: {
+          labels,
+          datasets: [{
+            label,
+            data: values,
+            backgroundColor: gradient,
+            borderColor: 'rgba(123,198,255,0.95)',
+            borderWidth: 1.2,
+            borderRadius: 6,
+            hoverBackgroundColor: 'rgba(123,198,255,0.95)'
+          }]
+        },
+        options: {
+          responsive: true,
+          plugins: {
+            legend: { display: false },
+            datalabels: {
+              anchor: 'end',
+              align: 'end',
+              color: '#f5f7fb',
+              font: { size: 11, weight: '600' },
+              formatter: (value) => value
+            }
+          },
+          scales: {
+            x: { ticks: { color: '#cdd6e3' } },
+            y: { ticks: { color: '#cdd6e3' }, beginAtZero:true }
+          }
+        }
+      });
+    }
 
-    def card_row(label, value):
-        return f'<div class="card-row"><span class="row-label">{label}</span><span class="row-value">{value}</span></div>'
+    function renderLine(canvasId, curveObj, label) {
+      const ctx = document.getElementById(canvasId);
+      if (!ctx) return;
+      const labels = (curveObj && curveObj.labels) || [];
+      const values = (curveObj && curveObj.values) || [];
+      if (!labels.length || !values.length) {
+        const titleEl = ctx.parentElement.querySelector('.chart-title');
+        const titleHtml = titleEl ? titleEl.outerHTML : '';
+        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
+        return;
+      }
 
-    def overview_block(title, data):
-        rows = "".join([
-            card_row("事件总数", data.get('total', 0)),
-            card_row("启动", data.get('start', 0)),
-            card_row("上层/一体化查杀", data.get('kill', 0)),
-            card_row("底层/LMKD查杀", data.get('lmk', 0)),
-            card_row("触发", data.get('trig', 0)),
-            card_row("跳过", data.get('skip', 0)),
-            card_row("释放内存(KB)", f"{data.get('mem', 0):,}"),
-        ])
-        return f'<div class="card card-wide"><div class="card-title">{title}</div>{rows}</div>'
+      const lineColor = 'rgba(123,198,255,0.95)';
+      const fillColor = 'rgba(123,198,255,0.18)';
+      new Chart(ctx, {
+        type: 'line',
+        data: {
+          labels,
+          datasets: [{
+            label,
+            data: values,
+            borderColor: lineColor,
+            backgroundColor: fillColor,
+            pointBackgroundColor: 'rgba(184,225,255,0.95)',
+            pointRadius: 1.8,
+            pointHoverRadius: 3,
+            borderWidth: 1.8,
+            tension: 0.28,
+            fill: true
+          }]
+        },
+        options: {
+          responsive: true,
+          plugins: {
+            legend: { display: false },
+            datalabels: { display: false }
+          },
+          scales: {
+            x: { ticks: { color: '#cdd6e3', maxTicksLimit: 8 } },
+            y: {
+              ticks: {
+                color: '#cdd6e3',
+                callback: (value) => Number(value).toLocaleString('en-US')
+              },
+              beginAtZero: false
+            }
+          }
+        }
+      });
+    }
+
+    const DOUGHNUT_PALETTE = [
+      'rgba(123,198,255,0.92)',
+      'rgba(128,226,196,0.92)',
+      'rgba(255,187,120,0.92)',
+      'rgba(247,140,140,0.92)',
+      'rgba(189,156,255,0.92)',
+      'rgba(255,214,92,0.92)',
+    ];
+    function renderDoughnut(canvasId, dataObj, label) {
+      const ctx = document.getElementById(canvasId);
+      if (!ctx) return;
+      const entries = Object.entries(dataObj || {})
+        .filter(([, v]) => Number(v) > 0)
+        .sort((a, b) => Number(b[1]) - Number(a[1]));
+      if (!entries.length) {
+        const titleEl = ctx.parentElement.querySelector('.chart-title');
+        const titleHtml = titleEl ? titleEl.outerHTML : '';
+        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
+        return;
+      }
+      const labels = entries.map((e) => e[0]);
+      const values = entries.map((e) => Number(e[1]));
+      const colors = labels.map((_, i) => DOUGHNUT_PALETTE[i % DOUGHNUT_PALETTE.length]);
+      new Chart(ctx, {
+        type: 'doughnut',
+        data: {
+          labels,
+          datasets: [{
+            label,
+            data: values,
+            backgroundColor: colors,
+            borderColor: '#0f1722',
+            borderWidth: 2,
+            hoverOffset: 4,
+          }]
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          plugins: {
+            legend: {
+              position: 'bottom',
+              labels: { color: '#cdd6e3', boxWidth: 12, font: { size: 11 } }
+            },
+            datalabels: { display: false }
+          }
+        }
+      });
+    }
+
+    function renderList(listId, dataObj) {
+      const container = document.getElementById(listId);
+      if (!container) return;
+      const entries = Object.entries(dataObj || {}).sort((a,b)=>b[1]-a[1]);
+      if (!entries.length) {
+        container.innerHTML = '<div style="color:#9fb3c8;">暂无数据</div>';
+        return;
+      }
+      // 逐项建节点后一次性挂载；textContent 赋值天然转义，键名中的 < & 等不会被解析为 HTML
+      const frag = document.createDocumentFragment();
+      entries.forEach(([k, v]) => {
+        const row = document.createElement('div');
+        const keyEl = document.createElement('span');
+        keyEl.className = 'key';
+        keyEl.textContent = k;
+        const valEl = document.createElement('span');
+        valEl.className = 'val';
+        valEl.textContent = v;
+        row.append(keyEl, valEl);
+        frag.append(row);
+      });
+      container.replaceChildren(frag);
+    }
+
+    renderList('listKillType', charts.kill_type);
+    renderList('listMinScore', charts.min_score);
+    renderList('listAdj', charts.adj);
+    renderList('listLmkReason', charts.lmk_reason);
+    renderList('listLmkAdj', charts.lmk_adj);
+
+    renderList('listMainKillType', charts.main_kill_type);
+    renderList('listMainMinScore', charts.main_min_score);
+    renderList('listMainLmkReason', charts.main_lmk_reason);
+    renderList('listMainAdj', charts.main_adj);
+    renderList('listMainLmkAdj', charts.main_lmk_adj);
+
+    renderList('listHlKillType', charts.hl_kill_type);
+    renderList('listHlMinScore', charts.hl_min_score);
+    renderList('listHlLmkReason', charts.hl_lmk_reason);
+    renderList('listHlAdj', charts.hl_adj);
+    renderList('listHlLmkAdj', charts.hl_lmk_adj);
+
+    // 图表按需创建：画布首次进入视口（含所在标签页被激活后变为可见）时才 new Chart，
+    // 隐藏标签页里的图表不在页面加载时绘制；不支持 IntersectionObserver 时退回为立即全部绘制
+    const pendingCharts = {
+      chartKillType: () => renderBar('chartKillType', charts.kill_type, '查杀类型'),
+      chartMinScore: () => renderBar('chartMinScore', charts.min_score, '可查杀最低分值'),
+      chartAdj: () => renderBar('chartAdj', charts.adj, 'adj 分布'),
+      chartLmkReason: () => renderBar('chartLmkReason', charts.lmk_reason, 'LMK 原因'),
+      chartLmkAdj: () => renderBar('chartLmkAdj', charts.lmk_adj, 'LMK adj'),
+
+      chartMainKillType: () => renderBar('chartMainKillType', charts.main_kill_type, '主进程 kill 类型'),
+      chartMainMinScore: () => renderBar('chartMainMinScore', charts.main_min_score, '主进程 minScore'),
+      chartMainLmkReason: () => renderBar('chartMainLmkReason', charts.main_lmk_reason, '主进程 LMK 原因'),
+      chartMainAdj: () => renderBar('chartMainAdj', charts.main_adj, '主进程 adj'),
+      chartMainLmkAdj: () => renderBar('chartMainLmkAdj', charts.main_lmk_adj, '主进程 LMK adj'),
+
+      chartHlKillType: () => renderBar('chartHlKillType', charts.hl_kill_type, '高亮主进程 kill 类型'),
+      chartHlMinScore: () => renderBar('chartHlMinScore', charts.hl_min_score, '高亮主进程 minScore'),
+      chartHlLmkReason: () => renderBar('chartHlLmkReason', charts.hl_lmk_reason, '高亮主进程 LMK 原因'),
+      chartHlAdj: () => renderBar('chartHlAdj', charts.hl_adj, '高亮主进程 adj'),
+      chartHlLmkAdj: () => renderBar('chartHlLmkAdj', charts.hl_lmk_adj, '高亮主进程 LMK adj'),
+
+      chartMemDistMemfree: () => renderLine('chartMemDistMemfree', charts.hl_mem_dist && charts.hl_mem_dist.mem_free, 'memfree 分布'),
+      chartMemDistFile: () => renderLine('chartMemDistFile', charts.hl_mem_dist && charts.hl_mem_dist.file_pages, 'file 分布'),
+      chartMemDistAnon: () => renderLine('chartMemDistAnon', charts.hl_mem_dist && charts.hl_mem_dist.anon_pages, 'anon 分布'),
+      chartMemDistSwap: () => renderLine('chartMemDistSwap', charts.hl_mem_dist && charts.hl_mem_dist.swap_free, 'swapfree 分布'),
+    };
+    function runPendingChart(canvasId) {
+      const job = pendingCharts[canvasId];
+      if (!job) return;
+      delete pendingCharts[canvasId];
+      job();
+    }
+    if ('IntersectionObserver' in window) {
+      const chartObserver = new IntersectionObserver((entries) => {
+        entries.forEach((entry) => {
+          if (!entry.isIntersecting) return;
+          chartObserver.unobserve(entry.target);
+          runPendingChart(entry.target.id);
+        });
+      }, { rootMargin: '200px 0px' });
+      Object.keys(pendingCharts).forEach((canvasId) => {
+        const canvas = document.getElementById(canvasId);
+        if (canvas) chartObserver.observe(canvas);
+      });
+    } else {
+      Object.keys(pendingCharts).forEach(runPendingChart);
+    }
+
+    const meminfoChartRendered = {
+      topproc: false,
+      oom: false,
+      priority: false,
+    };
+    function renderMeminfoChart(group) {
+      if (group === 'topproc' && !meminfoChartRendered.topproc) {
+        renderBar('chartMeminfoTopProc', charts.meminfo_top_process, 'PSS(KB)');
+        meminfoChartRendered.topproc = true;
+      }
+      if (group === 'oom' && !meminfoChartRendered.oom) {
+        renderBar('chartMeminfoOom', charts.meminfo_oom, 'PSS(KB)');
+        meminfoChartRendered.oom = true;
+      }
+      if (group === 'priority' && !meminfoChartRendered.priority) {
+        renderDoughnut('chartMeminfoPriority', charts.meminfo_priority, '优先级');
+        meminfoChartRendered.priority = true;
+      }
+    }
+
+    // 章节标签页
+    const tabButtons = document.querySelectorAll('.tab-btn');
+    const tabPanels = document.querySelectorAll('.tab-panel');
+    function activateTab(tabId) {
+      tabButtons.forEach((btn) => {
+        const isActive = btn.dataset.tab === tabId;
+        btn.classList.toggle('active', isActive);
+      });
+      tabPanels.forEach((panel) => {
+        panel.classList.toggle('active', panel.id === tabId);
+      });
+      if (tabId === 'tab-memory') renderMemLowOnce();
+    }
+    tabButtons.forEach((btn) => {
+      btn.addEventListener('click', () => activateTab(btn.dataset.tab));
+    });
+
+    // Meminfo 子标签页
+    const memSubButtons = document.querySelectorAll('.meminfo-subtab-btn');
+    const memSubPanels = document.querySelectorAll('.meminfo-subpanel');
+    function activateMemSubTab(group, panel) {
+      memSubButtons.forEach((btn) => {
+        if (btn.dataset.memGroup !== group) return;
+        btn.classList.toggle('active', btn.dataset.memPanel === panel);
+      });
+      memSubPanels.forEach((item) => {
+        if (item.dataset.memGroup !== group) return;
+        item.classList.toggle('active', item.dataset.memPanel === panel);
+      });
+      if (panel === 'chart') renderMeminfoChart(group);
+    }
+    memSubButtons.forEach((btn) => {
+      btn.addEventListener('click', () => activateMemSubTab(btn.dataset.memGroup, btn.dataset.memPanel));
+    });
+    document.querySelectorAll('.meminfo-subpanel.active[data-mem-panel="chart"]').forEach((panel) => {
+      if (panel.dataset.memGroup) renderMeminfoChart(panel.dataset.memGroup);
+    });
+    renderMeminfoChart('priority');
+
+    // 内存低值明细过滤
+    const memLowMetric = document.getElementById('memLowMetric');
+    const memLowLimit = document.getElementById('memLowLimit');
+    const memLowList = document.getElementById('memLowDetailList');
+    const memLowEmpty = document.getElementById('memLowDetailEmpty');
+    let hlMemLowEvents = null;
+    function getHlMemLowEvents() {
+      if (hlMemLowEvents === null) {
+        const dataEl = document.getElementById('hlMemLowEventsData');
+        hlMemLowEvents = dataEl ? JSON.parse(dataEl.textContent || '[]') : [];
+      }
+      return hlMemLowEvents;
+    }
+
+    // 单次正则扫描按字符查表替换，代替五次链式 replace
+    const HTML_ESCAPE_MAP = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+    function escapeHtml(text) {
+      return String(text ?? '').replace(/[&<>"']/g, (ch) => HTML_ESCAPE_MAP[ch]);
+    }
+
+    function fmtMetric(value) {
+      if (value === null || value === undefined || value === '') return '-';
+      const num = Number(value);
+      return Number.isFinite(num) ? num.toLocaleString('en-US') : String(value);
+    }
+
+    function padRight(text, width) {
+      const src = String(text ?? '');
+      if (src.length > width) {
+        return width <= 3 ? src.slice(0, width) : src.slice(0, width - 3) + '...';
+      }
+      return src.padEnd(width, ' ');
+    }
+
+    function buildMemLowSummary(rec) {
+      // 各列之间固定两个空格，直接拼成一个模板串，不再经过中间数组
+      return `${padRight(`EVENT ${rec.event_id}`, 10)}  `
+        + `${padRight(`TYPE ${rec.type_label}`, 10)}  `
+        + `${padRight(`PKG ${rec.process}`, 34)}  `
+        + `${padRight(`MEMFREE ${fmtMetric(rec.mem_free)}`, 18)}  `
+        + `${padRight(`FILE ${fmtMetric(rec.file_pages)}`, 14)}  `
+        + `${padRight(`ANON ${fmtMetric(rec.anon_pages)}`, 14)}  `
+        + `${padRight(`SWAPFREE ${fmtMetric(rec.swap_free)}`, 18)}  `
+        + padRight(rec.time || '-', 18);
+    }
+
+    // 单条事件的明细片段与筛选条件无关：首次生成后按记录缓存，切换指标/条数时直接复用
+    const memLowItemCache = new WeakMap();
+    function memLowItemHtml(rec) {
+      let itemHtml = memLowItemCache.get(rec);
+      if (itemHtml === undefined) {
+        itemHtml = `
+          <details class="mem-low-event-item">
+            <summary><span class="hl-event-summary-line">${escapeHtml(buildMemLowSummary(rec))}</span></summary>
+            <pre>${escapeHtml(rec.detail || '')}</pre>
+          </details>
+        `;
+        memLowItemCache.set(rec, itemHtml);
+      }
+      return itemHtml;
+    }
+
+    // 按指标升序取前 k 条：维护长度不超过 k 的有序数组，二分插入到同值之后以保持原有先后次序
+    function lowestByMetric(records, metricKey, k) {
+      const top = [];
+      const keys = [];
+      if (!(k > 0)) return top;
+      for (let i = 0; i < records.length; i += 1) {
+        const rec = records[i];
+        if (!rec || rec[metricKey] === null || rec[metricKey] === undefined) continue;
+        const v = Number(rec[metricKey]);
+        if (!Number.isFinite(v)) continue;
+        if (top.length >= k && v >= keys[k - 1]) continue;
+        let lo = 0;
+        let hi = keys.length;
+        while (lo < hi) {
+          const mid = (lo + hi) >> 1;
+          if (keys[mid] <= v) lo = mid + 1;
+          else hi = mid;
+        }
+        keys.splice(lo, 0, v);
+        top.splice(lo, 0, rec);
+        if (top.length > k) {
+          keys.pop();
+          top.pop();
+        }
+      }
+      return top;
+    }
+
+    function applyMemLowFilter() {
+      if (!memLowMetric || !memLowLimit || !memLowList || !memLowEmpty) return;
+      const metricKey = memLowMetric.value || 'mem_free';
+      const limit = parseInt(memLowLimit.value || '10', 10);
+      const filtered = lowestByMetric(getHlMemLowEvents() || [], metricKey, limit);
+
+      if (!filtered.length) {
+        memLowList.innerHTML = '';
+        memLowEmpty.style.display = 'block';
+        return;
+      }
+
+      memLowEmpty.style.display = 'none';
+      let html = '';
+      for (let i = 0; i < filtered.length; i += 1) html += memLowItemHtml(filtered[i]);
+      memLowList.innerHTML = html;
+    }
+
+    [memLowMetric, memLowLimit].forEach((el) => {
+      if (el) el.addEventListener('change', applyMemLowFilter);
+    });
+    // 内存低值列表在首次切到“内存状态”标签页时再解析数据并渲染
+    let memLowRendered = false;
+    function renderMemLowOnce() {
+      if (memLowRendered) return;
+      memLowRendered = true;
+      applyMemLowFilter();
+    }
+    const memTabPanel = document.getElementById('tab-memory');
+    if (memTabPanel && memTabPanel.classList.contains('active')) renderMemLowOnce();
+
+    // 启动热力图单元格悬停提示：首次悬停时按 包名 | 槽位标签 | 状态 生成 title
+    document.querySelectorAll('.startup-heatmap-table').forEach((table) => {
+      table.addEventListener('mouseover', (ev) => {
+        const cell = ev.target.closest('td.startup-heatmap-cell');
+        if (!cell || cell.title) return;
+        const procCell = cell.parentElement.cells[0];
+        const headRow = table.tHead ? table.tHead.rows[0] : null;
+        const headCell = headRow ? headRow.cells[cell.cellIndex] : null;
+        const levelCls = Object.keys(heatmapLevelStatus).find((c) => cell.classList.contains(c));
+        cell.title = [
+          procCell ? procCell.textContent : '',
+          headCell ? (headCell.dataset.label || '') : '',
+          levelCls ? heatmapLevelStatus[levelCls] : '',
+        ].join(' | ');
+      });
+    });
+
+    // 高亮主进程明细索引过滤
+    const hlFilterKillType = document.getElementById('hlFilterKillType');
+    const hlFilterAdj = document.getElementById('hlFilterAdj');
+    const hlFilterProc = document.getElementById('hlFilterProc');
+    // 明细条目由服务端一次性输出，过滤字段在初始化时读取一次，避免每次过滤都查 DOM / dataset
+    const hlEventMeta = Array.from(document.getElementsByClassName('hl-event-item'), (el) => ({
+      el,
+      killtype: el.dataset.killtype,
+      adj: el.dataset.adj,
+      proc: el.dataset.proc,
+    }));
+    function applyHlDetailFilter() {
+      if (!hlFilterKillType || !hlFilterAdj || !hlFilterProc) return;
+      const killTypeVal = hlFilterKillType.value || '';
+      const adjVal = hlFilterAdj.value || '';
+      const procVal = hlFilterProc.value || '';
+      let visibleEventCount = 0;
+      for (let i = 0; i < hlEventMeta.length; i += 1) {
+        const meta = hlEventMeta[i];
+        const visible = (!killTypeVal || meta.killtype === killTypeVal)
+          && (!adjVal || meta.adj === adjVal)
+          && (!procVal || meta.proc === procVal);
+        const display = visible ? '' : 'none';
+        // 只在显隐状态变化时写 style，减少无谓的样式失效
+        if (meta.el.style.display !== display) meta.el.style.display = display;
+        if (visible) visibleEventCount += 1;
+      }
+
+      const emptyTip = document.getElementById('hlDetailEmpty');
+      if (emptyTip) emptyTip.style.display = visibleEventCount > 0 ? 'none' : 'block';
+    }
+    const hlFilters = [hlFilterKillType, hlFilterAdj, hlFilterProc].filter(Boolean);
+    function onHlFilterChange(changedEl) {
+      if (!changedEl) return;
+      const selectedVal = changedEl.value || '';
+      if (selectedVal) {
+        hlFilters.forEach((el) => {
+          if (el !== changedEl) el.value = '';
+        });
+      }
+      applyHlDetailFilter();
+    }
+    hlFilters.forEach((el) => {
+      el.addEventListener('change', () => onHlFilterChange(el));
+    });
+    applyHlDetailFilter();
+
+    // 折叠明细：在 body 上统一委托，不再为每个 acc-header 单独挂监听
+    document.body.addEventListener('click', function(e) {
+      var h = e.target.closest('.acc-header');
+      if (!h) return;
+      var target = document.getElementById(h.dataset.target);
+      if (!target) return;
+      var visible = target.style.display === 'block';
+      target.style.display = visible ? 'none' : 'block';
+    });"""
+
+
+# 驻留率表启动类型文案 -> 单元格样式类
+_START_KIND_CLASS = {
+    "冷启动": "hl-start-cold",
+    "热启动": "hl-start-hot",
+    "未知": "",
+}
+
+
+# 启动热力图单元格取值 -> (CSS 等级类, 状态文案)：2=本槽位启动，1=存活，其余视为未存活
+_HEATMAP_DEAD_LEVEL = ("lvl-dead", "未存活")
+_HEATMAP_LEVELS = {
+    2: ("lvl-launch", "本槽位启动"),
+    1: ("lvl-alive", "存活"),
+}
+_HEATMAP_MISSING_LEVEL = ("lvl-miss", "启动异常(未命中预期start日志)")
+
+# 单元格只带等级类，不内联 title；悬停提示（包名 | 槽位标签 | 状态）由页面脚本在首次悬停时
+# 生成：包名取行首、槽位标签取表头 data-label、状态按等级类查 heatmapLevelStatus
+_HEATMAP_CELL_BY_VAL = {
+    v: f"<td class='startup-heatmap-cell {level_cls}'><span></span></td>"
+    for v, (level_cls, _) in _HEATMAP_LEVELS.items()
+}
+_HEATMAP_DEAD_CELL = f"<td class='startup-heatmap-cell {_HEATMAP_DEAD_LEVEL[0]}'><span></span></td>"
+_HEATMAP_MISSING_CELL = f"<td class='startup-heatmap-cell {_HEATMAP_MISSING_LEVEL[0]}'><span></span></td>"
+_HEATMAP_LEVEL_STATUS_JSON = json.dumps(
+    dict((*_HEATMAP_LEVELS.values(), _HEATMAP_DEAD_LEVEL, _HEATMAP_MISSING_LEVEL)),
+    ensure_ascii=False,
+)
+
+# HTML 报告设备信息表的 (标签, device_info 键)，标签为固定文案，渲染时无需转义
+_DEVICE_INFO_FIELDS = (
+    ("Build fingerprint", "build_fingerprint"),
+    ("ro.product.device", "ro_product_device"),
+    ("ro.board.platform", "ro_board_platform"),
+    ("/proc/meminfo MemTotal", "mem_total"),
+    ("/proc/meminfo SwapTotal", "swap_total"),
+    ("Linux version", "linux_version"),
+)
+
+# meminfo 优先级分组及其对应的 oom 类别说明（固定文案），按表格行序排列
+_MEMINFO_PRIORITY_ALIAS_DESC = (
+    ("必要", "NATIVE / SYSTEM / PERSISTENT"),
+    ("高优先级", "FG(foreground), VIS(visible), PER(perceptible), HOME, PREV(previous), HW(heavy weight)"),
+    ("低优先级", "PER-LOW, CACHED, B-SVC(b services), BACKUP, EMPTY"),
+    ("其它", "未命中上述规则"),
+)
+
+
+@lru_cache(maxsize=64)
+def _render_device_info_rows(device_rows: Tuple[Tuple[str, str], ...]) -> str:
+    """设备信息表行 HTML；同一设备反复出报告时输入不变，直接复用缓存结果"""
+    return "".join(
+        f"<tr><th>{label}</th><td>{html.escape(value)}</td></tr>"
+        for label, value in device_rows
+    )
+
+
+@lru_cache(maxsize=64)
+def _render_priority_mapping_rows(mapped_names: Tuple[str, ...]) -> str:
+    """优先级映射表行 HTML；mapped_names 与 _MEMINFO_PRIORITY_ALIAS_DESC 按行对应"""
+    return "".join(
+        "<tr>"
+        f"<td>{html.escape(label)}</td>"
+        f"<td>{html.escape(alias_desc)}</td>"
+        f"<td>{html.escape(mapped)}</td>"
+        "</tr>"
+        for (label, alias_desc), mapped in zip(_MEMINFO_PRIORITY_ALIAS_DESC, mapped_names)
+    )
+
+
+def generate_report_html(
+    events,
+    summary,
+    output_file,
+    heatmap_apps: Optional[List[str]] = None,
+    device_info: Optional[dict] = None,
+    meminfo_bundle: Optional[dict] = None,
+    include_startup_section: bool = True,
+):
+    """生成仅包含 summary 的 HTML 报告（三板块：全部 / 主进程 / 高亮主进程）。
+
+    output_file 以 .gz 结尾时直接写出 gzip 压缩的 HTML（压缩级别 1，批量出报告时节省磁盘）。
+    """
+    s = _to_plain(summary)
+    # 常用的二级统计块只取一次，后续直接读取
+    hl_overall = s.get("highlight_overall") or {}
+    main_overall = s.get("main_overall") or {}
+    mem_stats = s.get("mem_stats") or {}
+    mem_avg = s.get("mem_avg") or {}
+    cont_stats = s.get("cont_startup_stats") or {}
+    # 只排序一次，供各构建函数共用
+    events_sorted = sorted(events, key=itemgetter('time'))
+    highlight_timeline = build_highlight_timeline(events_sorted, presorted=True)
+    highlight_residency = build_highlight_residency(events)
+    highlight_runs = compute_highlight_runs(events_sorted, presorted=True)
+    startup_heatmap = build_startup_survival_heatmap(events_sorted, app_list=heatmap_apps, presorted=True)
+    device_info_data = _to_plain(device_info or {})
+    meminfo_data = _to_plain(meminfo_bundle or {})
+
+    def _residency_avg(res_list):
+        # 单次遍历累加各列的和与计数，不再为每列构建中间列表
+        n_valid = 0
+        alive_sum = 0
+        all_alive_sum = 0
+        all_rate_sum = 0
+        all_rate_n = 0
+        rate_sum = [0] * 6
+        rate_n = [0] * 6
+        for rec in res_list or ():
+            if rec.get("is_anomaly"):
+                continue
+            n_valid += 1
+            alive_sum += rec.get("alive_cnt", 0)
+            all_alive_sum += rec.get("all_alive_cnt", 0)
+            # 全量前序均值
+            pct_full = rec.get("all_rate_value")
+            if pct_full is not None:
+                all_rate_sum += pct_full
+                all_rate_n += 1
+            per_window = rec["per_window"]
+            for n in _RESIDENCY_WINDOW_NS:
+                pct = per_window[n].get("rate_value")
+                if pct is not None:
+                    rate_sum[n] += pct
+                    rate_n[n] += 1
+        if not n_valid:
+            return {
+                "alive": 0,
+                "rates": {n: 0 for n in _RESIDENCY_WINDOW_NS},
+                "all_rate": 0,
+                "all_alive": 0,
+            }
+        avg_rates = {n: (rate_sum[n] / rate_n[n] if rate_n[n] else 0) for n in _RESIDENCY_WINDOW_NS}
+        avg_all = all_rate_sum / all_rate_n if all_rate_n else 0
+        return {
+            "alive": alive_sum / n_valid,
+            "rates": avg_rates,
+            "all_rate": avg_all,
+            "all_alive": all_alive_sum / n_valid,
+        }
+
+    residency_avg = _residency_avg(highlight_residency)
+    html_escape = html.escape
+
+    device_rows = [
+        (label, str(device_info_data.get(key, "") or "").strip() or "-")
+        for label, key in _DEVICE_INFO_FIELDS
+    ]
+    proc_mv_text = str(device_info_data.get("proc_mv", "") or "").strip()
+    if not proc_mv_text:
+        proc_mv_text = "未匹配到 /proc/mv 内容"
+    proc_mv_block_html = html_escape(proc_mv_text)
+    auto_match_info = _to_plain(device_info_data.get("auto_match_info", {}) or {})
+    if auto_match_info:
+        def _bool_cn(v) -> str:
+            return "是" if bool(v) else "否"
+
+        # 每个键只取一次；缺失（None）的值显示为 "-"
+        ami_get = auto_match_info.get
+
+        def _or_dash(v):
+            return "-" if v is None else v
+
+        status_text = str(ami_get("status", "") or "").strip() or "-"
+        device_rows.append(("自动匹配状态", status_text))
+        expected_count = _or_dash(ami_get("expected_count"))
+        auto_lines = [
+            f"自动匹配启用: {_bool_cn(ami_get('enabled'))}",
+            f"目标应用数: {_or_dash(ami_get('target_app_count'))}",
+            f"目标轮次: {_or_dash(ami_get('rounds'))}",
+            f"识别到候选窗口: {_bool_cn(ami_get('detected'))}",
+            f"采用候选窗口: {_bool_cn(ami_get('used'))}",
+            f"状态: {status_text}",
+        ]
+        window_start = ami_get("window_start")
+        window_end = ami_get("window_end")
+        if window_start or window_end:
+            auto_lines.append(f"候选时间段: {_or_dash(window_start)} ~ {_or_dash(window_end)}")
+        match_score = ami_get("match_score")
+        if match_score is not None:
+            auto_lines.append(
+                f"匹配度: {match_score}% "
+                f"(LCS {_or_dash(ami_get('matched_start_count'))}/{expected_count})"
+            )
+        mismatch_count = ami_get("mismatch_count")
+        if mismatch_count is not None:
+            auto_lines.append(f"误差/容差: {mismatch_count}/{_or_dash(ami_get('tolerance'))}")
+        observed_count = ami_get("observed_count")
+        if observed_count is not None:
+            auto_lines.append(f"数量校验: 预期 {expected_count}, 实际窗口 {observed_count}")
+        match_variant = ami_get("match_variant")
+        if match_variant:
+            auto_lines.append(f"匹配策略: {match_variant}")
+        duration_sec = ami_get("duration_sec")
+        if duration_sec is not None:
+            auto_lines.append(f"过程时长: {float(duration_sec):.1f}s")
+        tail_gap_sec = ami_get("tail_gap_sec")
+        if tail_gap_sec is not None:
+            auto_lines.append(f"距日志末尾: {float(tail_gap_sec):.1f}s")
+        confidence = ami_get("confidence")
+        if confidence:
+            auto_lines.append(f"置信度: {confidence}")
+        file_end_time = ami_get("file_end_time")
+        if file_end_time:
+            auto_lines.append(f"日志最晚时间: {file_end_time}")
+        bugreport_time_hint = ami_get("bugreport_time_hint")
+        if bugreport_time_hint:
+            auto_lines.append(f"bugreport文件时间: {bugreport_time_hint}")
+        bugreport_gap_sec = ami_get("bugreport_to_log_end_gap_sec")
+        if bugreport_gap_sec is not None:
+            auto_lines.append(f"bugreport与日志最晚时间差: {float(bugreport_gap_sec):.1f}s")
+        applied_start = ami_get("applied_start_time")
+        applied_end = ami_get("applied_end_time")
+        if applied_start or applied_end:
+            auto_lines.append(f"最终应用过滤时间段: {_or_dash(applied_start)} ~ {_or_dash(applied_end)}")
+        detection_error = ami_get("detection_error")
+        if detection_error:
+            auto_lines.append(f"自动匹配异常: {detection_error}")
+    else:
+        auto_lines = ["未提供自动匹配信息"]
+    # auto_lines 均为 str，直接过滤空白行后拼接
+    auto_match_block_html = html_escape("\n".join(line for line in auto_lines if line.strip()))
+    device_info_rows_html = _render_device_info_rows(tuple(device_rows))
+    # 预构建高亮驻留表 HTML
+    if highlight_runs:
+        # 行 HTML 直接写入同一个 StringIO 缓冲，最后一次性取出
+        buf = io.StringIO()
+        w = buf.write
+        for r in highlight_runs:
+            w(
+                f"<tr><td>{html_escape(r['proc'])}</td>"
+                f"<td>{r['second_cold']}</td>"
+                f"<td>{r['start1']}</td>"
+                f"<td>{r['kill1']}</td>"
+                f"<td>{r['dur1']}</td>"
+                f"<td>{r['start2']}</td>"
+                f"<td>{r['kill2']}</td>"
+                f"<td>{r['dur2']}</td>"
+                f"<td>{r['avg']}</td></tr>"
+            )
+        hl_runs_table_html = buf.getvalue()
+    else:
+        hl_runs_table_html = '<tr><td colspan="9" style="text-align:center;color:#9fb3c8;">无数据</td></tr>'
+
+
+    def card(label, value):
+        return f'<div class="card"><div class="label">{label}</div><div class="value">{value}</div></div>'
+
+    def card_row(label, value):
+        return f'<div class="card-row"><span class="row-label">{label}</span><span class="row-value">{value}</span></div>'
+
+    def overview_block(title, data):
+        rows = "".join([
+            card_row("事件总数", data.get('total', 0)),
+            card_row("启动", data.get('start', 0)),
+            card_row("上层/一体化查杀", data.get('kill', 0)),
+            card_row("底层/LMKD查杀", data.get('lmk', 0)),
+            card_row("触发", data.get('trig', 0)),
+            card_row("跳过", data.get('skip', 0)),
+            card_row("释放内存(KB)", f"{data.get('mem', 0):,}"),
+        ])
+        return f'<div class="card card-wide"><div class="card-title">{title}</div>{rows}</div>'
 
     overall_cards = overview_block("全部", {
         'total': s['total_events'],
@@ -3262,8 +4332,10 @@ def generate_report_html(
     })
 
     def fmt_num(value):
+        if type(value) is int:
+            return _format_thousands(value)
         try:
-            return f"{int(round(float(value))):,}"
+            return _format_thousands(int(round(float(value))))
         except (TypeError, ValueError):
             return "-"
 
@@ -3283,11 +4355,12 @@ def generate_report_html(
         ("总 PSS", fmt_kb(meminfo_total_proc.get("total_pss_kb"))),
         ("Top20 占比", f"{meminfo_top20_ratio * 100:.1f}%"),
     ]
+    # 标签为固定文案、取值为 fmt_num/fmt_kb/百分比格式化结果，均无需转义
     meminfo_summary_cards_html = "".join(
         (
             '<div class="summary-item">'
-            f'<div class="summary-label">{html_escape(label)}</div>'
-            f'<div class="summary-value">{html_escape(value)}</div>'
+            f'<div class="summary-label">{label}</div>'
+            f'<div class="summary-value">{value}</div>'
             '</div>'
         )
         for label, value in meminfo_summary_cards
@@ -3295,17 +4368,19 @@ def generate_report_html(
 
     meminfo_top_processes = (meminfo_total_proc.get("processes", []) or [])[:20]
     if meminfo_top_processes:
-        meminfo_top_process_rows_html = "".join(
-            (
+        buf = io.StringIO()
+        w = buf.write
+        for idx, proc in enumerate(meminfo_top_processes, start=1):
+            swap_kb = proc.get('swap_kb')
+            w(
                 "<tr>"
                 f"<td>{idx}</td>"
                 f"<td>{html_escape(str(proc.get('name', '')))}</td>"
                 f"<td>{fmt_num(proc.get('pss_kb', 0))}</td>"
-                f"<td>{fmt_num(proc.get('swap_kb', 0)) if proc.get('swap_kb') is not None else '-'}</td>"
+                f"<td>{fmt_num(swap_kb) if swap_kb is not None else '-'}</td>"
                 "</tr>"
             )
-            for idx, proc in enumerate(meminfo_top_processes, start=1)
-        )
+        meminfo_top_process_rows_html = buf.getvalue()
     else:
         meminfo_top_process_rows_html = "<tr><td colspan='4' class='summary-empty'>无数据</td></tr>"
 
@@ -3328,46 +4403,34 @@ def generate_report_html(
         meminfo_priority_rows_html = "<tr><td colspan='3' class='summary-empty'>无数据</td></tr>"
 
     if meminfo_oom_rows:
-        meminfo_oom_rows_html = "".join(
-            (
+        buf = io.StringIO()
+        w = buf.write
+        for row in meminfo_oom_rows:
+            swap_kb = row.get('swap_kb')
+            w(
                 "<tr>"
                 f"<td>{html_escape(str(row.get('priority_label', '')))}</td>"
                 f"<td>{html_escape(str(row.get('name', '')))}</td>"
                 f"<td>{fmt_num(row.get('process_count', 0))}</td>"
                 f"<td>{fmt_num(row.get('total_pss_kb', 0))}</td>"
-                f"<td>{fmt_num(row.get('swap_kb', 0)) if row.get('swap_kb') is not None else '-'}</td>"
+                f"<td>{fmt_num(swap_kb) if swap_kb is not None else '-'}</td>"
                 "</tr>"
             )
-            for row in meminfo_oom_rows
-        )
+        meminfo_oom_rows_html = buf.getvalue()
     else:
         meminfo_oom_rows_html = "<tr><td colspan='5' class='summary-empty'>无数据</td></tr>"
 
-    priority_alias_desc = {
-        "必要": "NATIVE / SYSTEM / PERSISTENT",
-        "高优先级": "FG(foreground), VIS(visible), PER(perceptible), HOME, PREV(previous), HW(heavy weight)",
-        "低优先级": "PER-LOW, CACHED, B-SVC(b services), BACKUP, EMPTY",
-        "其它": "未命中上述规则",
-    }
     categories_by_group = defaultdict(list)
     for row in meminfo_oom_rows:
         group = str(row.get("priority_label", "其它"))
         name = str(row.get("name", "")).strip()
         if name and name not in categories_by_group[group]:
             categories_by_group[group].append(name)
-    priority_mapping_rows = []
-    for label in ("必要", "高优先级", "低优先级", "其它"):
-        mapped = "、".join(categories_by_group.get(label, [])) if categories_by_group.get(label) else "-"
-        priority_mapping_rows.append((label, priority_alias_desc.get(label, "-"), mapped))
-    priority_mapping_rows_html = "".join(
-        (
-            "<tr>"
-            f"<td>{html_escape(label)}</td>"
-            f"<td>{html_escape(alias_desc)}</td>"
-            f"<td>{html_escape(mapped)}</td>"
-            "</tr>"
+    priority_mapping_rows_html = _render_priority_mapping_rows(
+        tuple(
+            "、".join(categories_by_group[label]) if categories_by_group.get(label) else "-"
+            for label, _ in _MEMINFO_PRIORITY_ALIAS_DESC
         )
-        for label, alias_desc, mapped in priority_mapping_rows
     )
 
     meminfo_source_desc = str(meminfo_data.get("source_desc", "") or "").strip()
@@ -3379,21 +4442,50 @@ def generate_report_html(
     )
 
     kill_total = s.get("kill_count", 0) + s.get("lmk_count", 0)
-    main_kill_total = s.get("main_overall", {}).get("kill", 0) + s.get("main_overall", {}).get("lmk", 0)
-    hl_main_kill_total = s.get("highlight_overall", {}).get("main_kill", 0) + s.get("highlight_overall", {}).get("main_lmk", 0)
-
+    main_kill_total = main_overall.get("kill", 0) + main_overall.get("lmk", 0)
+    hl_main_kill_total = hl_overall.get("main_kill", 0) + hl_overall.get("main_lmk", 0)
+
+    second_round_hot_count = int(cont_stats.get("second_round_hot", 0) or 0)
+    # 单次遍历事件：主进程启动计数、LMK 原因统计、高亮主进程查杀事件索引一并收集，
+    # 后续各统计/构建函数直接复用，不再各自全量扫描 events
+    _prime_event_keys(events)
+    highlight_set = frozenset(HIGHLIGHT_PROCESSES)
     main_start_count = 0
     hl_main_start_count = 0
-    second_round_hot_count = int((s.get("cont_startup_stats") or {}).get("second_round_hot", 0) or 0)
-    for e in events:
-        if e.get("type") != "start" or e.get("is_subprocess"):
+    main_lmk_reasons = Counter()
+    hl_lmk_reasons = Counter()
+    # 高亮主进程的 kill/lmk 事件，预先取好 (idx, event, type, 主包名, 时间文本, details)，
+    # 低内存列表、详情缓存与明细面板共用同一份筛选结果
+    hl_main_kill_events = []
+    for idx, e in enumerate(events):
+        if e.get("is_subprocess"):
             continue
-        main_start_count += 1
-        if e.get("process_name", "").split(":")[0] in HIGHLIGHT_PROCESSES:
-            hl_main_start_count += 1
+        etype = e.get("type")
+        is_hl = e['_base'] in highlight_set
+        if etype == "start":
+            main_start_count += 1
+            if is_hl:
+                hl_main_start_count += 1
+        elif etype == "kill" or etype == "lmk":
+            if etype == "lmk":
+                reason = (e.get("details") or _EMPTY_DETAILS).get("reason") or "未知"
+                main_lmk_reasons[reason] += 1
+                if is_hl:
+                    hl_lmk_reasons[reason] += 1
+            if is_hl:
+                hl_main_kill_events.append((
+                    idx,
+                    e,
+                    etype,
+                    e['_base'],
+                    _format_ts_ms(e["time"]) if e.get("time") else "-",
+                    e.get("details") or _EMPTY_DETAILS,
+                ))
+    main_lmk_reason_stats = dict(main_lmk_reasons)
+    hl_lmk_reason_stats = dict(hl_lmk_reasons)
 
     def _memfree_row(label, key):
-        st = s.get("mem_stats", {}).get(key, {}).get("mem_free", {})
+        st = mem_stats.get(key, {}).get("mem_free", {})
         if not st or st.get("count", 0) == 0:
             return (
                 f"<tr><td>{label}</td>"
@@ -3414,24 +4506,6 @@ def generate_report_html(
         _memfree_row("高亮主进程(主)", "highlight_main"),
     ])
 
-    def _lmk_reason_stats(scope_key):
-        stats = defaultdict(int)
-        for e in events:
-            if e.get("type") != "lmk":
-                continue
-            if scope_key in ("main", "highlight_main") and e.get("is_subprocess"):
-                continue
-            if scope_key == "highlight_main":
-                base = e.get("process_name", "").split(":")[0]
-                if base not in HIGHLIGHT_PROCESSES:
-                    continue
-            reason = (e.get("details") or {}).get("reason") or "未知"
-            stats[reason] += 1
-        return dict(stats)
-
-    main_lmk_reason_stats = _lmk_reason_stats("main")
-    hl_lmk_reason_stats = _lmk_reason_stats("highlight_main")
-
     def _min_score_chart_label(raw_label):
         txt = str(raw_label or "").strip()
         up = txt.upper()
@@ -3442,15 +4516,13 @@ def generate_report_html(
         if "RECENT" in up:
             return "RECENT"
 
-        token = ""
-        m = re.search(r"\(([^()]*)\)", txt)
+        m = MIN_SCORE_PAREN_PATTERN.search(txt)
         if m and m.group(1).strip():
-            token = m.group(1).strip()
+            token = m.group(1).strip().upper()
         elif txt:
-            token = txt
+            token = up
         else:
             token = "OTHER"
-        token = token.upper()
         if len(token) > 24:
             token = token[:24].rstrip("_- ")
         return f"MIN({token})"
@@ -3472,10 +4544,10 @@ def generate_report_html(
 
     min_score_chart_stats = _compact_min_score_stats(s.get("min_score_stats", {}))
     main_min_score_chart_stats = _compact_min_score_stats(
-        s.get("main_overall", {}).get("min_score_stats", {})
+        main_overall.get("min_score_stats", {})
     )
     hl_min_score_chart_stats = _compact_min_score_stats(
-        s.get("highlight_overall", {}).get("main_min_score_stats", {})
+        hl_overall.get("main_min_score_stats", {})
     )
 
     def kill_scope_card(title, total_cnt, kill_cnt, lmk_cnt):
@@ -3492,22 +4564,20 @@ def generate_report_html(
     kill_scope_main_html = kill_scope_card(
         "主进程",
         main_kill_total,
-        s.get("main_overall", {}).get("kill", 0),
-        s.get("main_overall", {}).get("lmk", 0),
+        main_overall.get("kill", 0),
+        main_overall.get("lmk", 0),
     )
     kill_scope_hl_html = kill_scope_card(
         "高亮主进程",
         hl_main_kill_total,
-        s.get("highlight_overall", {}).get("main_kill", 0),
-        s.get("highlight_overall", {}).get("main_lmk", 0),
+        hl_overall.get("main_kill", 0),
+        hl_overall.get("main_lmk", 0),
     )
 
-    hl_killtype_map = s.get("highlight_overall", {}).get("main_kill_type_stats", {}) or {}
-    hl_adj_map = defaultdict(int)
-    for k, v in (s.get("highlight_overall", {}).get("main_adj_stats", {}) or {}).items():
-        hl_adj_map[k] += v
-    for k, v in (s.get("highlight_overall", {}).get("main_lmk_adj_stats", {}) or {}).items():
-        hl_adj_map[k] += v
+    hl_killtype_map = hl_overall.get("main_kill_type_stats", {}) or {}
+    # kill 与 lmk 的 adj 分布合并计数
+    hl_adj_map = Counter(hl_overall.get("main_adj_stats") or {})
+    hl_adj_map.update(hl_overall.get("main_lmk_adj_stats") or {})
 
     hl_proc_map = {}
     for proc, d in (s.get("highlight_proc_detail", {}) or {}).items():
@@ -3517,9 +4587,9 @@ def generate_report_html(
 
     def _build_option_html(stats_map):
         options = ['<option value="">全部</option>']
-        for k, v in sorted((stats_map or {}).items(), key=lambda kv: kv[1], reverse=True):
-            key_txt = str(k)
-            options.append(f'<option value="{html_escape(key_txt)}">{html_escape(key_txt)} ({fmt_num(v)})</option>')
+        for k, v in sorted((stats_map or {}).items(), key=itemgetter(1), reverse=True):
+            key_html = html_escape(str(k))
+            options.append(f'<option value="{key_html}">{key_html} ({fmt_num(v)})</option>')
         return "".join(options)
 
     def _build_adj_option_html(stats_map):
@@ -3532,9 +4602,10 @@ def generate_report_html(
             except ValueError:
                 return (1, 0, key_txt)
 
+        # key 函数每个元素只求值一次（decorate-sort），int 解析不会随比较次数重复
         for k, v in sorted((stats_map or {}).items(), key=_adj_sort_key):
-            key_txt = str(k)
-            options.append(f'<option value="{html_escape(key_txt)}">{html_escape(key_txt)} ({fmt_num(v)})</option>')
+            key_html = html_escape(str(k))
+            options.append(f'<option value="{key_html}">{key_html} ({fmt_num(v)})</option>')
         return "".join(options)
 
     hl_filter_killtype_options_html = _build_option_html(hl_killtype_map)
@@ -3543,11 +4614,11 @@ def generate_report_html(
 
     def _pad_col(txt, width):
         s_txt = str(txt or "-")
-        if len(s_txt) > width:
-            if width <= 3:
-                return s_txt[:width]
-            return s_txt[:width - 3] + "..."
-        return s_txt.ljust(width)
+        if len(s_txt) <= width:
+            return f"{s_txt:<{width}}"
+        if width <= 3:
+            return s_txt[:width]
+        return s_txt[:width - 3] + "..."
 
     def mem_card_row(label, sample_count, value_html):
         return (
@@ -3562,8 +4633,8 @@ def generate_report_html(
 
     def mem_avg_card():
         def table_for(key):
-            stats_map = s.get("mem_stats", {}).get(key, {})
-            avg_map = s.get("mem_avg", {}).get(key, {})
+            stats_map = mem_stats.get(key, {})
+            avg_map = mem_avg.get(key, {})
             sample_count = avg_map.get("count", 0)
             if not stats_map or not avg_map or sample_count == 0:
                 return sample_count, "<div class='mem-empty'>无数据</div>"
@@ -3618,128 +4689,94 @@ def generate_report_html(
         )
     mem_avg_card_html = mem_avg_card()
 
-    def _build_dist_curve(values, max_points=80):
-        vals = []
-        for v in values or []:
-            iv = _safe_int(v)
-            if iv is not None:
-                vals.append(iv)
-        vals.sort()
-        n = len(vals)
-        if n == 0:
-            return {"labels": [], "values": [], "count": 0}
-        if n == 1:
-            return {"labels": ["100%"], "values": [vals[0]], "count": 1}
-
-        points = min(max_points, n)
-        labels = []
-        sampled = []
-        for i in range(points):
-            idx = round(i * (n - 1) / (points - 1))
-            pct = int(round((idx + 1) * 100 / n))
-            labels.append(f"{pct}%")
-            sampled.append(vals[idx])
-        return {"labels": labels, "values": sampled, "count": n}
-
     hl_mem_samples = (s.get("mem_samples", {}) or {}).get("highlight_main", {}) or {}
-    hl_mem_dist = {
-        "mem_free": _build_dist_curve(hl_mem_samples.get("mem_free", [])),
-        "file_pages": _build_dist_curve(hl_mem_samples.get("file_pages", [])),
-        "anon_pages": _build_dist_curve(hl_mem_samples.get("anon_pages", [])),
-        "swap_free": _build_dist_curve(hl_mem_samples.get("swap_free", [])),
-    }
+    hl_mem_dist = {metric: _build_dist_curve(hl_mem_samples.get(metric, [])) for metric in _MEM_METRIC_KEYS}
+
+    # 高亮主进程 kill/lmk 事件的详情文本只格式化一次，低内存列表与明细面板共用
+    hl_detail_cache = {idx: format_event_detail(e, idx) for idx, e, *_ in hl_main_kill_events}
 
     def _collect_hl_mem_low_events():
         rows = []
-        for idx, e in enumerate(events):
-            if e.get("type") not in ("kill", "lmk"):
-                continue
-            if e.get("is_subprocess"):
-                continue
-            base = e.get("process_name", "").split(":")[0]
-            if base not in HIGHLIGHT_PROCESSES:
-                continue
+        for idx, e, etype, base, time_txt, _details in hl_main_kill_events:
             metrics = _extract_mem_metrics(e)
             if not metrics:
                 continue
-            time_txt = e.get("time").strftime("%m-%d %H:%M:%S.%f")[:-3] if e.get("time") else "-"
             rows.append({
                 "event_id": idx + 1,
-                "type": e.get("type", ""),
-                "type_label": "KILL" if e.get("type") == "kill" else "LMKD",
+                "type": etype,
+                "type_label": "KILL" if etype == "kill" else "LMKD",
                 "process": base,
                 "time": time_txt,
                 "mem_free": metrics.get("mem_free"),
                 "file_pages": metrics.get("file_pages"),
                 "anon_pages": metrics.get("anon_pages"),
                 "swap_free": metrics.get("swap_free"),
-                "detail": format_event_detail(e, idx),
+                "detail": hl_detail_cache[idx],
             })
         return rows
 
     hl_mem_low_events = _collect_hl_mem_low_events()
 
-    # 高亮主进程明细 HTML 预构建，避免 f-string 中复杂表达式报错
-    def build_hl_detail():
-        items = []
-        for idx, e in enumerate(events):
-            if e.get("type") not in ("kill", "lmk"):
-                continue
-            if e.get("is_subprocess"):
-                continue
-            base = e.get("process_name", "").split(":")[0]
-            if base not in HIGHLIGHT_PROCESSES:
-                continue
-
-            etype = e.get("type")
+    # 高亮主进程明细 HTML：逐条产出片段，写报告时直接流式写入文件（事件多时这是最大的一块）
+    def iter_hl_detail():
+        if not hl_main_kill_events:
+            yield '<div class="kill-index-empty">暂无匹配事件</div>'
+            return
+        for idx, e, etype, base, time_txt, details in hl_main_kill_events:
             if etype == "kill":
-                adj_val = e.get("details", {}).get("proc_info", {}).get("adj") or "未知"
-                pid_val = e.get("details", {}).get("proc_info", {}).get("pid") or "未知"
-                killtype_val = (
-                    e.get("details", {}).get("kill_info", {}).get("killTypeDesc")
-                    or e.get("details", {}).get("kill_info", {}).get("killType")
-                    or "未知"
-                )
+                proc_info = details.get("proc_info", {})
+                kill_info = details.get("kill_info", {})
+                adj_val = proc_info.get("adj") or "未知"
+                pid_val = proc_info.get("pid") or "未知"
+                killtype_val = kill_info.get("killTypeDesc") or kill_info.get("killType") or "未知"
             else:
-                adj_val = e.get("details", {}).get("adj") or "未知"
-                pid_val = e.get("details", {}).get("pid") or "未知"
+                adj_val = details.get("adj") or "未知"
+                pid_val = details.get("pid") or "未知"
                 killtype_val = "LMK"
 
             adj_txt = str(adj_val)
-            time_txt = e.get("time").strftime("%m-%d %H:%M:%S.%f")[:-3] if e.get("time") else "-"
-            detail_txt = format_event_detail(e, idx)
+            detail_txt = hl_detail_cache[idx]
             etype_txt = "KILL" if etype == "kill" else "LMKD"
+            # TYPE 列（"TYPE KILL"/"TYPE LMKD"）与时间列（_format_ts_ms 固定 18 位）不会超宽，
+            # 直接用格式宽度填充；其余列可能超长，仍由 _pad_col 截断并补省略号
             summary_txt = (
                 f"{_pad_col(f'EVENT {idx+1}', 10)}  "
-                f"{_pad_col(f'TYPE {etype_txt}', 10)}  "
+                f"TYPE {etype_txt:<5}  "
                 f"{_pad_col(f'PKG {base}', 36)}  "
                 f"{_pad_col(f'PID {pid_val}', 12)}  "
                 f"{_pad_col(f'ADJ {adj_txt}', 12)}  "
                 f"{_pad_col(f'KILLTYPE {killtype_val}', 22)}  "
-                f"{_pad_col(time_txt, 18)}"
+                f"{time_txt:<18}"
             )
 
-            items.append(
+            # etype 只可能是 kill/lmk，无需转义
+            yield (
                 f'<details class="hl-event-item" '
                 f'data-proc="{html_escape(base)}" '
                 f'data-adj="{html_escape(adj_txt)}" '
                 f'data-killtype="{html_escape(str(killtype_val))}" '
-                f'data-etype="{html_escape(str(etype))}">'
+                f'data-etype="{etype}">'
                 f'<summary><span class="hl-event-summary-line">{html_escape(summary_txt)}</span></summary>'
                 f'<pre>{html_escape(detail_txt)}</pre>'
                 f'</details>'
             )
 
-        if not items:
-            return '<div class="kill-index-empty">暂无匹配事件</div>'
-        return "".join(items)
-
-    hl_detail_html = build_hl_detail()
     # 高亮时间线 HTML
     def build_hl_timeline():
         if not highlight_timeline:
             return '<div style="color:#9fb3c8;">暂无数据</div>'
-        rows = []
+        legend = (
+            '<div class="tl-legend">'
+            '<span class="pill pill-start-cold">冷启动</span>'
+            '<span class="pill pill-start-hot">热启动</span>'
+            '<span class="pill pill-start-anomaly">可能为异常启动</span>'
+            '<span class="pill pill-kill">上层/一体化</span>'
+            '<span class="pill pill-lmk">底层/LMKD</span>'
+            '</div>'
+        )
+        buf = io.StringIO()
+        w = buf.write
+        w(legend)
         for item in highlight_timeline:
             left = ""
             right = ""
@@ -3762,71 +4799,103 @@ def generate_report_html(
                 right = f'{html_escape(item["process"])}&nbsp;<span class="pill pill-kill">上层/一体化</span>'
             else:
                 right = f'{html_escape(item["process"])}&nbsp;<span class="pill pill-lmk">底层/LMKD</span>'
-            rows.append(
+            # 时间由 _format_ts_ms 生成（仅数字与分隔符），无需转义
+            w(
                 f'<div class="{row_class}">'
-                f'<div class="tl-time">{html_escape(item["time"])}</div>'
+                f'<div class="tl-time">{item["time"]}</div>'
                 f'<div class="tl-content"><span class="tl-left">{left}</span><span class="tl-right">{right}</span></div>'
                 f'</div>'
             )
-        legend = (
-            '<div class="tl-legend">'
-            '<span class="pill pill-start-cold">冷启动</span>'
-            '<span class="pill pill-start-hot">热启动</span>'
-            '<span class="pill pill-start-anomaly">可能为异常启动</span>'
-            '<span class="pill pill-kill">上层/一体化</span>'
-            '<span class="pill pill-lmk">底层/LMKD</span>'
-            '</div>'
-        )
-        return legend + "".join(rows)
+        return buf.getvalue()
 
     hl_timeline_html = build_hl_timeline()
     # 高亮驻留率表 HTML
     def build_hl_residency():
+        # 循环内高频调用，绑定为局部变量（LOAD_FAST）
+        _esc = html_escape
+        _fmt = fmt_num
         if not highlight_residency:
             return '<div style="color:#9fb3c8;">暂无数据</div>'
-        rows = []
+        # 表体各单元格按文档顺序直接追加到同一个列表，最后只 join 一次
+        body_parts = []
+        add = body_parts.append
         anomaly_count = 0
+        # 存活列表 title 提示（拼接 + 转义）按名单内容缓存：前 N 次窗口的名单互为后缀，
+        # 与“启动前存活(前5)”名单大量重复，相同名单只拼接转义一次
+        tip_cache = {}
+
+        def _alive_tip(names):
+            key = tuple(names)
+            tip = tip_cache.get(key)
+            if tip is None:
+                tip = tip_cache[key] = _esc(", ".join(names)) if names else "无"
+            return tip
+
+        # 疑似异常启动行的常量文案取为局部变量；“启动类型（可能为异常启动）”按启动类型缓存转义结果
+        anomaly_label = POSSIBLE_ANOMALY_START_LABEL
+        anomaly_default_note = POSSIBLE_ANOMALY_START_NOTE
+        anomaly_kind_cache = {}
+        # 进程名在多轮记录中反复出现，转义结果按名称缓存
+        proc_html_cache = {}
+
+        # 页脚均值（排除疑似异常启动）在渲染表体的同一轮遍历中累加
+        n_valid = 0
+        rate_sums = [0] * 6
+        rate_counts = [0] * 6
+        alive_sum = 0
+        all_alive_sum = 0
         for rec in highlight_residency:
             round_txt = rec.get("round") if rec.get("round") is not None else "-"
             start_kind_txt = rec.get("start_kind_cn", "未知")
-            start_kind_class = ""
+            if not isinstance(start_kind_txt, str):
+                start_kind_txt = str(start_kind_txt)
             is_anomaly = bool(rec.get("is_anomaly"))
-            if "冷" in str(start_kind_txt):
-                start_kind_class = "hl-start-cold"
-            elif "热" in str(start_kind_txt):
-                start_kind_class = "hl-start-hot"
+            # 常见的规范文案直接查表，其它文案再回退到子串判断
+            start_kind_class = _START_KIND_CLASS.get(start_kind_txt)
+            if start_kind_class is None:
+                if "冷" in start_kind_txt:
+                    start_kind_class = "hl-start-cold"
+                elif "热" in start_kind_txt:
+                    start_kind_class = "hl-start-hot"
+                else:
+                    start_kind_class = ""
             if is_anomaly:
                 start_kind_class = "hl-start-anomaly"
                 anomaly_count += 1
 
             process_txt = str(rec.get("process", ""))
-            process_class = ""
-            if process_txt.strip() in {"com.tencent.mm", "com.tencent.mobileqq"}:
-                process_class = "hl-proc-em"
+            process_html = proc_html_cache.get(process_txt)
+            if process_html is None:
+                process_html = proc_html_cache[process_txt] = _esc(process_txt)
+            # 类名组合只有四种，直接取字面量（常量已驻留），不再逐行拼接
+            process_em = process_txt.strip() in {"com.tencent.mm", "com.tencent.mobileqq"}
             if is_anomaly:
-                process_class = (process_class + " " if process_class else "") + "hl-anomaly-cell"
-                note_txt = str(rec.get("anomaly_note", "") or POSSIBLE_ANOMALY_START_NOTE)
-                start_kind_display = f"{start_kind_txt}（{POSSIBLE_ANOMALY_START_LABEL}）"
-                row_cells = [
-                    f"<td>{round_txt}</td>",
-                    f"<td class='{start_kind_class}'>{html_escape(start_kind_display)}</td>",
-                    f"<td>{rec['seq']}</td>",
-                    (
-                        f"<td class='{process_class}'>{html_escape(process_txt)}"
-                        f"<div class='hl-anomaly-note'>{html_escape(note_txt)}</div></td>"
-                    ),
-                    f"<td class='hl-anomaly-cell' title='{html_escape(note_txt)}'>-</td>",
-                    f"<td class='hl-anomaly-cell' title='{html_escape(note_txt)}'>-</td>",
-                ]
-                for _ in range(1, 6):
-                    row_cells.append(f"<td class='hl-anomaly-cell' title='{html_escape(note_txt)}'>-</td>")
-                rows.append("<tr class='hl-anomaly-row'>" + "".join(row_cells) + "</tr>")
+                process_class = "hl-proc-em hl-anomaly-cell" if process_em else "hl-anomaly-cell"
+                note_txt = str(rec.get("anomaly_note", "") or anomaly_default_note)
+                start_kind_html = anomaly_kind_cache.get(start_kind_txt)
+                if start_kind_html is None:
+                    start_kind_html = anomaly_kind_cache[start_kind_txt] = _esc(f"{start_kind_txt}（{anomaly_label}）")
+                note_html = _esc(note_txt)
+                add("<tr class='hl-anomaly-row'>")
+                add(f"<td>{round_txt}</td>")
+                add(f"<td class='{start_kind_class}'>{start_kind_html}</td>")
+                add(f"<td>{rec['seq']}</td>")
+                add(
+                    f"<td class='{process_class}'>{process_html}"
+                    f"<div class='hl-anomaly-note'>{note_html}</div></td>"
+                )
+                # 启动前存活、全部、前1~前5 共 7 列均置灰
+                add(f"<td class='hl-anomaly-cell' title='{note_html}'>-</td>" * 7)
+                add("</tr>")
                 continue
 
-            alive_list = rec.get("alive_list", [])
-            alive_txt = "无" if not alive_list else ", ".join(alive_list)
+            process_class = "hl-proc-em" if process_em else ""
+            n_valid += 1
+            alive_sum += rec["alive_cnt"]
+            all_alive_sum += rec.get("all_alive_cnt", 0)
+            alive_tip = _alive_tip(rec.get("alive_list", []))
             all_alive_list = rec.get("all_alive_list", [])
-            all_alive_txt = "无" if not all_alive_list else ", ".join(all_alive_list)
+            all_alive_tip = _esc(", ".join(all_alive_list)) if all_alive_list else "无"
             start_rate_val = rec.get("window_rate_value")
             start_rate_class = ""
             if start_rate_val is not None:
@@ -3835,56 +4904,45 @@ def generate_report_html(
             all_rate_class = ""
             if all_rate_val is not None:
                 all_rate_class = "rate-ok" if all_rate_val >= 100.0 else "rate-bad"
-            row_cells = [
-                f"<td>{round_txt}</td>",
-                f"<td class='{start_kind_class}'>{html_escape(str(start_kind_txt))}</td>" if start_kind_class else f"<td>{html_escape(str(start_kind_txt))}</td>",
-                f"<td>{rec['seq']}</td>",
-                f"<td class='{process_class}'>{html_escape(process_txt)}</td>" if process_class else f"<td>{html_escape(process_txt)}</td>",
-                f"<td class='{start_rate_class}' title='{html_escape(alive_txt)}'>{rec['alive_cnt']}/{rec['window_total']}</td>",
-                f"<td class='{all_rate_class}' title='{html_escape(all_alive_txt)}'>{rec['all_rate']}</td>",
-            ]
-            for n in range(1, 6):
-                cell = rec['per_window'][n]
+            add("<tr>")
+            add(f"<td>{round_txt}</td>")
+            # 无样式时输出 class=''，与不带 class 属性的渲染效果一致，省去逐行分支
+            # 规范启动类型文案（_START_KIND_CLASS 的键）不含需转义字符，直接输出
+            start_kind_html = start_kind_txt if start_kind_txt in _START_KIND_CLASS else _esc(start_kind_txt)
+            add(f"<td class='{start_kind_class}'>{start_kind_html}</td>")
+            add(f"<td>{rec['seq']}</td>")
+            add(f"<td class='{process_class}'>{process_html}</td>")
+            add(f"<td class='{start_rate_class}' title='{alive_tip}'>{rec['alive_cnt']}/{rec['window_total']}</td>")
+            add(f"<td class='{all_rate_class}' title='{all_alive_tip}'>{rec['all_rate']}</td>")
+            per_window = rec['per_window']
+            for n in _RESIDENCY_WINDOW_NS:
+                cell = per_window[n]
+                rate_val = cell.get("rate_value")
+                if rate_val is not None:
+                    rate_sums[n] += rate_val
+                    rate_counts[n] += 1
                 if cell["rate"] == "-":
-                    row_cells.append("<td>-</td>")
+                    add("<td>-</td>")
                 else:
-                    alive = cell["alive"]
-                    alive_tip = "无" if not alive else ", ".join(alive)
-                    rate_val = cell.get("rate_value")
                     color_class = "rate-ok" if (rate_val is not None and rate_val >= 100.0) else "rate-bad"
-                    row_cells.append(
-                        f"<td class='{color_class}' title='{html_escape(alive_tip)}'>{cell['rate']}</td>"
-                    )
-            rows.append("<tr>" + "".join(row_cells) + "</tr>")
+                    add(f"<td class='{color_class}' title='{_alive_tip(cell['alive'])}'>{cell['rate']}</td>")
+            add("</tr>")
 
         # 计算平均驻留率与平均存活数（排除疑似异常启动）
         avg_cells = []
         avg_alive_value = "均存活数 0.00"
         avg_all_alive_value = "全量均存活 0.00"
         avg_all_rate_class = ""
-        valid_records = [rec for rec in highlight_residency if not rec.get("is_anomaly")]
-        if valid_records:
-            cols = {n: [] for n in range(1, 6)}
-            alive_counts = []
-            all_alive_counts = []
-            for rec in valid_records:
-                alive_counts.append(rec["alive_cnt"])
-                all_alive_counts.append(rec.get("all_alive_cnt", 0))
-                for n in range(1, 6):
-                    pct = rec['per_window'][n].get("rate_value")
-                    if pct is not None:
-                        cols[n].append(pct)
-            for n in range(1, 6):
-                if cols[n]:
-                    avg_pct = sum(cols[n]) / len(cols[n])
+        if n_valid:
+            for n in _RESIDENCY_WINDOW_NS:
+                if rate_counts[n]:
+                    avg_pct = rate_sums[n] / rate_counts[n]
                     color_class = "rate-ok" if avg_pct >= 100.0 else "rate-bad"
                     avg_cells.append((f"均值 {avg_pct:.1f}%", color_class))
                 else:
                     avg_cells.append(("-", ""))
-            avg_alive = sum(alive_counts) / len(alive_counts) if alive_counts else 0
-            avg_alive_value = f"均存活数 {avg_alive:.2f}"
-            avg_all_alive = sum(all_alive_counts) / len(all_alive_counts) if all_alive_counts else 0
-            avg_all_alive_value = f"全量均存活 {avg_all_alive:.2f}"
+            avg_alive_value = f"均存活数 {alive_sum / n_valid:.2f}"
+            avg_all_alive_value = f"全量均存活 {all_alive_sum / n_valid:.2f}"
         else:
             avg_cells = [("-", "")] * 5
             avg_alive_value = "-"
@@ -3909,16 +4967,16 @@ def generate_report_html(
         if anomaly_count > 0:
             anomaly_meta = (
                 f"&nbsp;&nbsp;|&nbsp;&nbsp;{POSSIBLE_ANOMALY_START_LABEL}: "
-                f"<strong>{fmt_num(anomaly_count)}</strong>（已置灰且不纳入均值/热力图）"
+                f"<strong>{_fmt(anomaly_count)}</strong>（已置灰且不纳入均值/热力图）"
             )
         table = (
-            f'<div class="hl-residency-meta">第二轮热启动数量: <strong>{fmt_num(second_round_hot_count)}</strong>{anomaly_meta}</div>'
+            f'<div class="hl-residency-meta">第二轮热启动数量: <strong>{_fmt(second_round_hot_count)}</strong>{anomaly_meta}</div>'
             '<div style="overflow-x:auto;">'
             '<table class="hl-run-table">'
             '<thead><tr><th>轮次</th><th>启动类型</th><th>序号</th><th>应用</th><th>启动前存活(前5)</th><th>全部</th>'
             '<th>前1</th><th>前2</th><th>前3</th><th>前4</th><th>前5</th></tr></thead>'
             '<tbody>'
-            + "".join(rows) +
+            + "".join(body_parts) +
             '</tbody>'
             '<tfoot><tr>' + "".join(foot_cells) + '</tr></tfoot>'
             '</table></div>'
@@ -3926,6 +4984,9 @@ def generate_report_html(
         return table
 
     def build_startup_heatmap_html():
+        # 循环内高频调用，绑定为局部变量（LOAD_FAST）
+        _esc = html_escape
+        _fmt = fmt_num
         apps = startup_heatmap.get("apps", []) or []
         slots = startup_heatmap.get("slots", []) or []
         matrix = startup_heatmap.get("matrix", []) or []
@@ -3941,54 +5002,52 @@ def generate_report_html(
         total_apps = len(apps)
         total_slots = len(slots)
 
-        head_cells = ['<th class="startup-heatmap-head startup-heatmap-proc-head">包名</th>']
-        for slot in slots:
-            missing_start = bool(slot.get("is_missing_expected_start"))
+        def _slot_head(slot):
+            slot_get = slot.get
             tip = (
-                f"{slot.get('label', '')} | {slot.get('time', '-')}"
-                f" | {slot.get('start_kind_cn', '未知')} | 启动 {slot.get('process', '')}"
+                f"{slot_get('label', '')} | {slot_get('time', '-')}"
+                f" | {slot_get('start_kind_cn', '未知')} | 启动 {slot_get('process', '')}"
             )
-            if missing_start:
+            if slot_get("is_missing_expected_start"):
                 tip += " | 启动异常: 未命中预期start日志"
-            label = slot.get("display_label", "")
-            label_cls = "startup-slot-label"
-            if slot.get("round_pos") == 1:
-                label_cls += " round-start"
-            label_html = f"<span class='{label_cls}'>{html_escape(label)}</span>" if label else ""
-            head_cells.append(
+            label = slot_get("display_label", "")
+            label_cls = "startup-slot-label round-start" if slot_get("round_pos") == 1 else "startup-slot-label"
+            label_html = f"<span class='{label_cls}'>{_esc(label)}</span>" if label else ""
+            return (
                 f"<th class='startup-heatmap-head startup-heatmap-slot-head' "
-                f"title='{html_escape(tip)}'>{label_html}</th>"
+                f"title='{_esc(tip)}' data-label='{_esc(slot_get('label', ''))}'>{label_html}</th>"
             )
-        head_cells.append('<th class="startup-heatmap-head startup-heatmap-stat-head">存活率</th>')
+
+        head_cells = [
+            '<th class="startup-heatmap-head startup-heatmap-proc-head">包名</th>',
+            *[_slot_head(slot) for slot in slots],
+            '<th class="startup-heatmap-head startup-heatmap-stat-head">存活率</th>',
+        ]
 
         body_rows = []
         row_index_by_pkg = {pkg: idx for idx, pkg in enumerate(apps)}
+        # 每列"预期启动但未命中 start 日志"的行号（无则为 -1），按列只计算一次
+        missing_rows = [
+            row_index_by_pkg.get(slot.get("expected_process", ""), -1)
+            if slot.get("is_missing_expected_start") else -1
+            for slot in slots
+        ]
+        n_slots = len(slots)
+        cell_get = _HEATMAP_CELL_BY_VAL.get
+        dead_cell = _HEATMAP_DEAD_CELL
+        miss_cell = _HEATMAP_MISSING_CELL
         for row_idx, pkg in enumerate(apps):
             stats = row_stats[row_idx] if row_idx < len(row_stats) else {}
-            row_cells = [f"<th class='startup-heatmap-proc'>{html_escape(pkg)}</th>"]
-            for col_idx, slot in enumerate(slots):
-                val = 0
-                if row_idx < len(matrix) and col_idx < len(matrix[row_idx]):
-                    val = matrix[row_idx][col_idx]
-                expected_pkg = slot.get("expected_process", "")
-                expected_row = row_index_by_pkg.get(expected_pkg, -1)
-                is_missing_expected_start = bool(slot.get("is_missing_expected_start")) and (row_idx == expected_row)
-                if is_missing_expected_start:
-                    level_cls = "lvl-miss"
-                    status = "启动异常(未命中预期start日志)"
-                elif val == 2:
-                    level_cls = "lvl-launch"
-                    status = "本槽位启动"
-                elif val == 1:
-                    level_cls = "lvl-alive"
-                    status = "存活"
-                else:
-                    level_cls = "lvl-dead"
-                    status = "未存活"
-                tip = f"{pkg} | {slot.get('label', '')} | {status}"
-                row_cells.append(
-                    f"<td class='startup-heatmap-cell {level_cls}' title='{html_escape(tip)}'><span></span></td>"
-                )
+            pkg_html = _esc(pkg)
+            matrix_row = matrix[row_idx] if row_idx < len(matrix) else ()
+            # 矩阵行不足槽位数时按 0（未存活）补齐
+            vals = list(matrix_row[:n_slots])
+            vals.extend([0] * (n_slots - len(vals)))
+            row_cells = [f"<th class='startup-heatmap-proc'>{pkg_html}</th>"]
+            row_cells.extend(
+                miss_cell if miss_row == row_idx else cell_get(val, dead_cell)
+                for val, miss_row in zip(vals, missing_rows)
+            )
             alive_slots = int(stats.get("alive_slots", 0) or 0)
             total_slot_cnt = int(stats.get("total_slots", total_slots) or total_slots)
             alive_rate = float(stats.get("alive_rate", 0.0) or 0.0)
@@ -3999,16 +5058,16 @@ def generate_report_html(
 
         col_alive_cells = ['<th class="startup-heatmap-footlabel">槽位存活</th>']
         col_dead_cells = ['<th class="startup-heatmap-footlabel">槽位失败</th>']
+        add_alive = col_alive_cells.append
+        add_dead = col_dead_cells.append
         for col in col_stats:
-            alive_cnt = int(col.get("alive_count", 0) or 0)
-            dead_cnt = int(col.get("dead_count", 0) or 0)
-            tip = f"{col.get('label', '')} | 存活 {alive_cnt}/{total_apps} | 失败 {dead_cnt}/{total_apps}"
-            col_alive_cells.append(
-                f"<td class='startup-heatmap-colstat' title='{html_escape(tip)}'>{alive_cnt}</td>"
-            )
-            col_dead_cells.append(
-                f"<td class='startup-heatmap-colstat dead' title='{html_escape(tip)}'>{dead_cnt}</td>"
-            )
+            col_get = col.get
+            alive_cnt = int(col_get("alive_count", 0) or 0)
+            dead_cnt = int(col_get("dead_count", 0) or 0)
+            # 存活/失败两行共用同一 tip，只转义一次
+            tip_html = _esc(f"{col_get('label', '')} | 存活 {alive_cnt}/{total_apps} | 失败 {dead_cnt}/{total_apps}")
+            add_alive(f"<td class='startup-heatmap-colstat' title='{tip_html}'>{alive_cnt}</td>")
+            add_dead(f"<td class='startup-heatmap-colstat dead' title='{tip_html}'>{dead_cnt}</td>")
         col_alive_cells.append("<td></td>")
         col_dead_cells.append("<td></td>")
 
@@ -4016,8 +5075,8 @@ def generate_report_html(
             '<div class="startup-heatmap-meta">'
             f"<span>应用数: <strong>{total_apps}</strong></span>"
             f"<span>启动槽位: <strong>{total_slots}</strong></span>"
-            f"<span>{html_escape(expected_text)}</span>"
-            f"<span>{POSSIBLE_ANOMALY_START_LABEL}: <strong>{fmt_num(anomaly_start_count)}</strong>（已排除，不计入热力图）</span>"
+            f"<span>{_esc(expected_text)}</span>"
+            f"<span>{POSSIBLE_ANOMALY_START_LABEL}: <strong>{_fmt(anomaly_start_count)}</strong>（已排除，不计入热力图）</span>"
             "</div>"
             '<div class="startup-heatmap-legend">'
             '<span><i class="startup-heatmap-cell lvl-dead"><span></span></i> 未存活</span>'
@@ -4037,10 +5096,10 @@ def generate_report_html(
             "</div>"
         )
 
-    hl_residency_html = build_hl_residency()
-    startup_heatmap_html = build_startup_heatmap_html()
-
     if include_startup_section:
+        # 驻留表与热力图只在启动分区中使用，分区关闭时不构建
+        hl_residency_html = build_hl_residency()
+        startup_heatmap_html = build_startup_heatmap_html()
         startup_summary_card_html = (
             '<section class="summary-card">'
             '<div class="summary-title">启动</div>'
@@ -4103,7 +5162,8 @@ def generate_report_html(
         startup_tab_button_html = ""
         startup_tab_panel_html = ""
 
-    html_content = f"""<!DOCTYPE html>
+    # 报告以高亮明细为界拆成头尾两段模板，明细片段在两段之间流式写入
+    html_head = f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
   <meta charset="utf-8" />
@@ -4111,239 +5171,10 @@ def generate_report_html(
   <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
   <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2"></script>
   <style>
-    body {{ font-family: 'Segoe UI', system-ui, -apple-system, sans-serif; background:#0b1118; color:#e6edf3; margin:0; padding:24px; }}
-    .page {{ max-width:min(1760px,96vw); margin:0 auto; }}
-    h1, h2 {{ margin: 0 0 10px; }}
-    h3 {{ margin: 14px 0 8px; }}
-    .section {{ margin-bottom: 28px; }}
-    .cards.single {{ display:block; }}
-    .card {{ background:#141c26; padding:12px 14px; border-radius:10px; border:1px solid #1f2a36; box-shadow:0 8px 24px rgba(0,0,0,0.35); }}
-    .card-wide {{ width:100%; box-sizing:border-box; }}
-    .card-title {{ font-weight:700; color:#f5f7fb; margin-bottom:10px; letter-spacing:0.3px; font-size:20px; }}
-    .card-row {{ display:flex; align-items:center; justify-content:space-between; gap:12px; padding:6px 0; border-bottom:1px solid #172334; }}
-    .card-row:last-child {{ border-bottom:none; }}
-    .row-label {{ color:#9fb3c8; font-size:13px; }}
-    .row-value {{ color:#f5f7fb; font-weight:600; font-variant-numeric:tabular-nums; }}
-    .mem-block-grid {{ display:grid; grid-template-columns:repeat(4, minmax(0, 1fr)); gap:12px; }}
-    .mem-block {{ display:block; padding:12px; border:1px solid #223142; border-radius:10px; background:#0f1825; }}
-    .mem-block-head {{ display:flex; align-items:baseline; justify-content:space-between; gap:10px; margin-bottom:8px; }}
-    .mem-block-title {{ margin:0; color:#dce9fa; font-size:16px; font-weight:700; letter-spacing:0.2px; }}
-    .mem-block-sub {{ color:#8da6bf; font-size:12px; font-weight:700; letter-spacing:0.2px; }}
-    .mem-block-body {{ min-width:0; }}
-    .mem-metric-wrap {{ display:flex; flex-direction:column; gap:8px; }}
-    .mem-empty {{ padding:10px 12px; border:1px dashed #29415c; border-radius:8px; color:#9fb3c8; background:#0f1722; }}
-    .chart-grid {{ display:grid; grid-template-columns: repeat(auto-fit,minmax(280px,1fr)); gap:16px; }}
-    .chart-card {{ background:#101821; border:1px solid #1f2a36; border-radius:12px; padding:10px; box-shadow:0 6px 18px rgba(0,0,0,0.35); position:relative; }}
-    .chart-title {{ position:absolute; left:12px; top:10px; color:#9fb3c8; font-size:12px; letter-spacing:0.2px; }}
-    .chart-card canvas {{ margin-top:18px; }}
-    .timeline {{ border:1px solid #1f2a36; border-radius:12px; background:#101821; padding:10px; max-width:72%; margin:0 auto; }}
-    .timeline-row {{ display:grid; grid-template-columns:120px 1fr; gap:8px; padding:6px 8px; border-bottom:1px solid #1b2634; align-items:center; }}
-    .timeline-row:last-child {{ border-bottom:none; }}
-    .timeline-row.anomaly-row {{ background:rgba(120, 130, 144, 0.18); }}
-    .tl-time {{ color:#cdd6e3; font-size:12px; letter-spacing:0.2px; }}
-    .tl-content {{ display:flex; justify-content:space-between; width:100%; }}
-    .tl-left {{ color:#f5f7fb; font-size:14px; text-align:left; min-height:1.2em; }}
-    .tl-right {{ color:#f5f7fb; font-size:14px; text-align:right; min-height:1.2em; }}
-    .tl-anomaly-note {{ color:#a8b3c1; font-size:12px; }}
-    .tl-legend {{ display:flex; gap:8px; padding:4px 8px 8px 8px; }}
-    .pill {{ padding:2px 8px; border-radius:999px; font-size:12px; font-weight:700; border:1px solid transparent; }}
-    .pill-start {{ background:#123b26; color:#6cf0a7; border-color:#1f8a52; }}
-    .pill-start-cold {{ background:#3b1a1a; color:#ffb1b1; border-color:#a54444; }}
-    .pill-start-hot {{ background:#123b26; color:#6cf0a7; border-color:#1f8a52; }}
-    .pill-start-anomaly {{ background:#2f3440; color:#d2d9e3; border-color:#768395; }}
-    .pill-kill {{ background:#3b1a1a; color:#ffb1b1; border-color:#a54444; }}
-    .pill-lmk {{ background:#2b2140; color:#d6b6ff; border-color:#6f4bb7; }}
-    .hl-res-table-wrapper {{ max-width:min(1600px,95vw); margin:12px auto 0 auto; overflow-x:auto; }}
-    .hl-res-table {{ width:100%; border-collapse: collapse; background:#101821; border:1px solid #1f2a36; }}
-    .hl-res-table th, .hl-res-table td {{ padding:8px 10px; border-bottom:1px solid #1f2a36; text-align:left; color:#e6edf3; }}
-    .hl-res-table th {{ color:#9fb3c8; font-size:12px; letter-spacing:0.3px; }}
-    .hl-res-table tbody tr:hover {{ background:#142032; }}
-    .rate-ok {{ color:#6cf0a7 !important; font-weight:600; }}
-    .rate-bad {{ color:#ff8b8b !important; font-weight:700; }}
-    details summary {{ cursor:pointer; color:#8fb4ff; }}
-    canvas {{ width:100%; height:240px; }}
-    .accordion {{ border:1px solid #1f2a36; border-radius:12px; background:#0f1722; }}
-    .acc-item {{ border-bottom:1px solid #1f2a36; }}
-    .acc-item:last-child {{ border-bottom:none; }}
-    .acc-header {{ padding:10px 12px; cursor:pointer; display:flex; justify-content:space-between; align-items:center; }}
-    .acc-header:hover {{ background:#131c28; }}
-    .acc-title {{ font-weight:600; color:#f5f7fb; }}
-    .acc-meta {{ color:#9fb3c8; font-size:12px; }}
-    .acc-body {{ display:none; padding:0 12px 12px 12px; font-size:13px; line-height:1.6; color:#d8e2f2; }}
-    .hl-event-list {{ padding:8px 10px; }}
-    .hl-event-item {{ border-bottom:1px solid #1f2a36; padding:6px 0; }}
-    .hl-event-item:last-child {{ border-bottom:none; }}
-    .hl-event-item summary {{ cursor:pointer; color:#cfe1ff; font-size:12px; font-weight:600; overflow-x:auto; }}
-    .hl-event-summary-line {{ display:block; white-space:pre; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:12px; line-height:1.45; letter-spacing:0.1px; }}
-    .hl-event-item pre {{ margin:8px 0 4px 0; padding:8px; background:#0b141f; border:1px solid #1f2a36; border-radius:8px; color:#d8e2f2; white-space:pre-wrap; }}
-    .mem-low-event-item {{ border-bottom:1px solid #1f2a36; padding:6px 0; }}
-    .mem-low-event-item:last-child {{ border-bottom:none; }}
-    .mem-low-event-item summary {{ cursor:pointer; color:#cfe1ff; font-size:12px; font-weight:600; overflow-x:auto; }}
-    .mem-low-event-item pre {{ margin:8px 0 4px 0; padding:8px; background:#0b141f; border:1px solid #1f2a36; border-radius:8px; color:#d8e2f2; white-space:pre-wrap; }}
-    .kv {{ margin:2px 0; }}
-    .kv strong {{ color:#8fb4ff; }}
-    .pill {{ display:inline-block; padding:2px 8px; margin:2px 4px 2px 0; border-radius:999px; background:#16263a; color:#cfe1ff; font-size:12px; }}
-    .summary-board {{ display:grid; grid-template-columns:repeat(3, minmax(0, 1fr)); gap:12px; margin-bottom:16px; }}
-    .summary-card {{ background:#101821; border:1px solid #1f2a36; border-radius:12px; padding:12px; }}
-    .summary-title {{ color:#dce9fa; font-size:15px; font-weight:700; margin-bottom:10px; }}
-    .summary-stack {{ display:flex; flex-direction:column; gap:8px; }}
-    .summary-row {{ display:grid; gap:8px; }}
-    .summary-row.cols-2 {{ grid-template-columns:repeat(2, minmax(0, 1fr)); }}
-    .summary-row.cols-3 {{ grid-template-columns:repeat(3, minmax(0, 1fr)); }}
-    .summary-row.cols-6 {{ grid-template-columns:repeat(6, minmax(0, 1fr)); }}
-    .summary-row.cols-7 {{ grid-template-columns:repeat(7, minmax(0, 1fr)); }}
-    .summary-item {{ background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px 9px; min-height:58px; }}
-    .summary-item.compact {{ padding:7px 8px; min-height:52px; }}
-    .summary-item.compact .summary-label {{ font-size:11px; }}
-    .summary-item.compact .summary-value {{ font-size:17px; }}
-    .summary-label {{ color:#8da6bf; font-size:12px; }}
-    .summary-value {{ color:#f5f7fb; font-size:22px; font-weight:700; line-height:1.2; margin-top:2px; font-variant-numeric:tabular-nums; }}
-    .summary-value.danger {{ color:#ff8b8b; }}
-    .summary-value.lmk {{ color:#d6b6ff; }}
-    .summary-mem-note {{ color:#8da6bf; font-size:11px; margin-bottom:8px; }}
-    .summary-mem-table {{ width:100%; border-collapse:collapse; table-layout:fixed; }}
-    .summary-mem-table th, .summary-mem-table td {{ padding:7px 8px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; font-variant-numeric:tabular-nums; }}
-    .summary-mem-table th:first-child, .summary-mem-table td:first-child {{ text-align:left; }}
-    .summary-mem-table th {{ color:#9fb3c8; font-weight:700; background:#111a27; }}
-    .summary-empty {{ color:#8ea4bc; }}
-    .detail-tabs {{ display:flex; flex-wrap:wrap; gap:8px; margin:0 0 14px 0; }}
-    .tab-btn {{ appearance:none; border:1px solid #2a3b50; background:#0f1722; color:#b9cee5; border-radius:999px; padding:6px 12px; font-size:12px; font-weight:700; cursor:pointer; }}
-    .tab-btn:hover {{ border-color:#4f77a3; color:#dcebff; }}
-    .tab-btn.active {{ border-color:#4f77a3; color:#dcebff; background:#16263a; }}
-    .tab-panel {{ display:none; }}
-    .tab-panel.active {{ display:block; }}
-    .subsection {{ margin-top:12px; }}
-    .subsection:first-of-type {{ margin-top:0; }}
-    .kill-scope-single {{ margin:0 0 10px 0; }}
-    .kill-scope-card {{ background:#0f1722; border:1px solid #1f2a36; border-radius:10px; padding:10px; }}
-    .kill-scope-title {{ color:#dce9fa; font-size:13px; font-weight:700; margin-bottom:8px; }}
-    .kill-scope-row {{ display:flex; justify-content:space-between; align-items:center; gap:8px; color:#9fb3c8; font-size:12px; padding:3px 0; }}
-    .kill-scope-row strong {{ color:#f5f7fb; font-size:16px; font-weight:700; font-variant-numeric:tabular-nums; }}
-    .kill-row-5 {{ display:grid; grid-template-columns:repeat(5, minmax(0,1fr)); gap:14px; }}
-    .kill-row-5 canvas {{ height:185px; }}
-    .kill-index-empty {{ color:#8ea4bc; font-size:12px; }}
-    .kill-index-filters {{ display:grid; grid-template-columns:repeat(3, minmax(0,1fr)); gap:10px; margin-bottom:10px; }}
-    .kill-filter-item {{ background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px; }}
-    .kill-filter-item label {{ display:block; color:#8da6bf; font-size:12px; margin-bottom:6px; }}
-    .kill-filter-item select {{ width:100%; background:#0b141f; color:#dce9fa; border:1px solid #2a3b50; border-radius:6px; padding:6px 8px; font-size:12px; }}
-    .mem-table-wrap {{ width:100%; overflow-x:auto; }}
-    .mem-table {{ width:100%; border-collapse: collapse; table-layout:fixed; }}
-    .mem-table th, .mem-table td {{ padding:7px 10px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; white-space:nowrap; font-variant-numeric:tabular-nums; }}
-    .mem-table th:first-child, .mem-table td:first-child {{ text-align:left; }}
-    .mem-table th {{ color:#9fb3c8; font-weight:700; background:#111a27; }}
-    .mem-table tbody tr:hover {{ background:#142032; }}
-    .mem-metric {{ color:#d6e7ff; font-weight:700; white-space:nowrap; }}
-    .mem-empty-cell {{ color:#8ea4bc; text-align:center !important; font-style:italic; }}
-    .hl-run-table {{ width:100%; border-collapse:collapse; background:#101821; border:1px solid #1f2a36; }}
-    .hl-run-table th, .hl-run-table td {{ padding:6px 8px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:left; }}
-    .hl-run-table th {{ color:#9fb3c8; font-weight:600; }}
-    .hl-run-table tbody tr:nth-child(odd) {{ background:#111b27; }}
-    .mem-dist-grid {{ display:grid; grid-template-columns:repeat(4, minmax(0,1fr)); gap:12px; margin-top:8px; }}
-    .mem-dist-grid .chart-card canvas {{ height:200px; }}
-    .mem-low-filters {{ display:grid; grid-template-columns:repeat(2, minmax(0,1fr)); gap:10px; margin:8px 0 10px 0; }}
-    .mem-low-item {{ background:#0f1722; border:1px solid #1f2a36; border-radius:8px; padding:8px; }}
-    .mem-low-item label {{ display:block; color:#8da6bf; font-size:12px; margin-bottom:6px; }}
-    .mem-low-item select {{ width:100%; background:#0b141f; color:#dce9fa; border:1px solid #2a3b50; border-radius:6px; padding:6px 8px; font-size:12px; }}
-    .mem-low-note {{ color:#8ea4bc; font-size:12px; margin-bottom:8px; }}
-    .meminfo-source {{ color:#8da6bf; font-size:12px; margin:2px 0 10px 0; word-break:break-all; }}
-    .meminfo-summary-grid {{ display:grid; grid-template-columns:repeat(4, minmax(0,1fr)); gap:10px; margin-bottom:10px; }}
-    .meminfo-chart-grid {{ display:grid; grid-template-columns:repeat(2, minmax(0,1fr)); gap:12px; margin-bottom:12px; }}
-    .meminfo-table-grid {{ display:grid; grid-template-columns:1.1fr 1fr; gap:12px; }}
-    .meminfo-table-wrap {{ width:100%; overflow-x:auto; border:1px solid #1f2a36; border-radius:10px; background:#101821; }}
-    .meminfo-table {{ width:100%; border-collapse:collapse; table-layout:fixed; }}
-    .meminfo-table th, .meminfo-table td {{ padding:8px 10px; border-bottom:1px solid #1f2a36; color:#e6edf3; font-size:12px; text-align:right; font-variant-numeric:tabular-nums; }}
-    .meminfo-table th:first-child, .meminfo-table td:first-child {{ text-align:left; }}
-    .meminfo-table th:nth-child(2), .meminfo-table td:nth-child(2) {{ text-align:left; }}
-    .meminfo-table th {{ color:#9fb3c8; font-weight:700; background:#111a27; }}
-    .meminfo-table tbody tr:hover {{ background:#142032; }}
-    .meminfo-subtabs {{ display:flex; gap:8px; margin:8px 0 10px 0; }}
-    .meminfo-subtab-btn {{ appearance:none; border:1px solid #2a3b50; background:#0f1722; color:#b9cee5; border-radius:999px; padding:5px 11px; font-size:12px; font-weight:700; cursor:pointer; }}
-    .meminfo-subtab-btn:hover {{ border-color:#4f77a3; color:#dcebff; }}
-    .meminfo-subtab-btn.active {{ border-color:#4f77a3; color:#dcebff; background:#16263a; }}
-    .meminfo-subpanel {{ display:none; }}
-    .meminfo-subpanel.active {{ display:block; }}
-    .meminfo-priority-row {{ display:grid; grid-template-columns:1fr 340px 1fr; gap:12px; align-items:start; }}
-    .meminfo-priority-chart {{ height:340px; }}
-    .meminfo-priority-canvas-wrap {{ width:min(280px, 100%); height:280px; margin:0 auto; }}
-    .meminfo-priority-canvas-wrap canvas {{ width:100% !important; height:100% !important; margin-top:8px; }}
-    .device-table-wrap {{ width:100%; overflow-x:auto; }}
-    .device-info-table {{ width:100%; border-collapse:collapse; table-layout:fixed; background:#101821; border:1px solid #1f2a36; }}
-    .device-info-table th, .device-info-table td {{ padding:9px 10px; border-bottom:1px solid #1f2a36; text-align:left; color:#e6edf3; font-size:12px; vertical-align:top; }}
-    .device-info-table th {{ width:260px; color:#9fb3c8; font-weight:700; }}
-    .device-info-pre {{ margin:0; padding:10px; color:#dce9fa; background:#0f1722; border:1px solid #1f2a36; border-radius:8px; overflow-x:auto; white-space:pre-wrap; word-break:break-word; font-size:12px; line-height:1.55; }}
-    .hl-residency-meta {{ color:#9fb3c8; font-size:12px; margin:6px 0 8px 0; }}
-    .hl-residency-meta strong {{ color:#f5f7fb; font-variant-numeric:tabular-nums; }}
-    .hl-start-cold {{ color:#6cf0a7 !important; font-weight:700; }}
-    .hl-start-hot {{ color:#ff8b8b !important; font-weight:700; }}
-    .hl-start-anomaly {{ color:#d1dae5 !important; font-weight:700; }}
-    .hl-proc-em {{ color:#8fc8ff !important; font-weight:700; }}
-    .hl-anomaly-row {{ background:#2b3240 !important; opacity:0.72; }}
-    .hl-anomaly-cell {{ color:#a7b4c3 !important; }}
-    .hl-anomaly-note {{ color:#99a9bc; font-size:11px; margin-top:2px; }}
-    .start-subtitle {{ margin-top:16px; }}
-    .startup-heatmap-meta {{ display:flex; flex-wrap:wrap; gap:14px; color:#9fb3c8; font-size:12px; margin:2px 0 8px 0; }}
-    .startup-heatmap-meta strong {{ color:#f5f7fb; font-variant-numeric:tabular-nums; }}
-    .startup-heatmap-legend {{ display:flex; flex-wrap:wrap; gap:12px; color:#9fb3c8; font-size:12px; margin:4px 0 10px 0; }}
-    .startup-heatmap-legend span {{ display:inline-flex; align-items:center; gap:6px; }}
-    .startup-heatmap-legend i.startup-heatmap-cell {{ display:inline-block; }}
-    .startup-heatmap-legend .startup-heatmap-cell {{ width:14px; min-width:14px; height:14px; line-height:0; border-radius:3px; box-sizing:border-box; border:1px solid #2a3443; }}
-    .startup-heatmap-wrap {{ --heat-cell-size: 14px; overflow-x:auto; border:1px solid #1f2a36; border-radius:10px; background:#0f1722; padding:8px; }}
-    .startup-heatmap-table {{ border-collapse:separate; border-spacing:4px; min-width:max-content; table-layout:fixed; }}
-    .startup-heatmap-table th, .startup-heatmap-table td {{ vertical-align:middle; }}
-    .startup-heatmap-head {{ color:#8da6bf; font-size:12px; font-weight:600; text-align:center; white-space:nowrap; }}
-    .startup-heatmap-proc-head, .startup-heatmap-proc {{ position:sticky; left:0; z-index:2; background:#0f1722; }}
-    .startup-heatmap-proc {{ color:#dce9fa; font-size:12px; font-weight:600; text-align:left; padding:0 8px 0 2px; min-width:190px; max-width:320px; white-space:nowrap; }}
-    .startup-heatmap-slot-head {{ position:relative; min-width:var(--heat-cell-size); width:var(--heat-cell-size); max-width:var(--heat-cell-size); height:30px; padding:0; font-variant-numeric:tabular-nums; overflow:visible; }}
-    .startup-slot-label {{ position:absolute; left:50%; top:4px; transform:translateX(-50%) rotate(-28deg); transform-origin:center top; white-space:nowrap; font-size:12px; color:#8da6bf; pointer-events:none; }}
-    .startup-slot-label.round-start {{ color:#b9d9ff; font-weight:700; }}
-    .startup-heatmap-stat-head, .startup-heatmap-stat {{ white-space:nowrap; font-variant-numeric:tabular-nums; color:#cdd6e3; font-size:12px; text-align:left; padding-left:8px; min-width:130px; }}
-    td.startup-heatmap-cell {{
-      width:var(--heat-cell-size) !important;
-      min-width:var(--heat-cell-size) !important;
-      max-width:var(--heat-cell-size) !important;
-      height:var(--heat-cell-size) !important;
-      min-height:var(--heat-cell-size) !important;
-      max-height:var(--heat-cell-size) !important;
-      aspect-ratio:1 / 1;
-      padding:0 !important;
-      line-height:0;
-      border-radius:3px;
-      box-sizing:border-box;
-      border:1px solid #2a3443;
-      overflow:hidden;
-    }}
-    .startup-heatmap-cell span {{ display:block; width:100%; height:100%; margin:0; padding:0; }}
-    .startup-heatmap-cell.lvl-dead {{ background:#1a2431; border-color:#2a3443; }}
-    .startup-heatmap-cell.lvl-alive {{ background:#1f6f3d; border-color:#2ea043; }}
-    .startup-heatmap-cell.lvl-launch {{ background:#2ea043; border-color:#56d364; box-shadow:0 0 0 1px rgba(86,211,100,0.28); }}
-    .startup-heatmap-cell.lvl-miss {{ background:#5b2a2a; border-color:#d07b7b; box-shadow:0 0 0 1px rgba(208,123,123,0.22); }}
-    .startup-heatmap-colstat {{ color:#9fb3c8; font-size:11px; text-align:center; font-variant-numeric:tabular-nums; }}
-    .startup-heatmap-colstat.dead {{ color:#ffb4b4; }}
-    .startup-heatmap-footlabel {{ position:sticky; left:0; z-index:2; background:#0f1722; color:#8da6bf; font-size:11px; font-weight:600; text-align:left; padding:0 6px 0 2px; }}
-    .startup-heatmap-empty {{ color:#9fb3c8; border:1px dashed #29415c; border-radius:8px; padding:10px 12px; background:#0f1722; }}
-    @media (max-width: 980px) {{
-      body {{ padding:14px; }}
-      .page {{ max-width:100%; }}
-      .summary-board {{ grid-template-columns:1fr; }}
-      .summary-row.cols-6 {{ grid-template-columns:repeat(3, minmax(0, 1fr)); }}
-      .summary-row.cols-7 {{ grid-template-columns:repeat(4, minmax(0, 1fr)); }}
-      .detail-tabs {{ gap:6px; }}
-      .kill-row-5, .kill-index-filters {{ grid-template-columns:1fr; gap:10px; }}
-      .timeline {{ max-width:100%; }}
-      .mem-block-grid {{ grid-template-columns:1fr; }}
-      .mem-dist-grid {{ grid-template-columns:1fr; }}
-      .mem-low-filters {{ grid-template-columns:1fr; }}
-      .meminfo-summary-grid {{ grid-template-columns:repeat(2, minmax(0,1fr)); }}
-      .meminfo-chart-grid {{ grid-template-columns:1fr; }}
-      .meminfo-table-grid {{ grid-template-columns:1fr; }}
-      .meminfo-priority-row {{ grid-template-columns:1fr; }}
-      .meminfo-priority-canvas-wrap {{ height:240px; }}
-      .mem-block-head {{ flex-wrap:wrap; gap:6px; margin-bottom:6px; }}
-      .mem-block-title {{ font-size:15px; }}
-      .chart-grid {{ grid-template-columns:1fr; }}
-      .hl-event-summary-line {{ white-space:normal; }}
-      .startup-heatmap-proc {{ min-width:140px; max-width:220px; }}
-    }}
+{_SUMMARY_REPORT_CSS}
+  </style>
+  <style media="{_SUMMARY_REPORT_MOBILE_CSS_MEDIA}">
+{_SUMMARY_REPORT_MOBILE_CSS}
   </style>
 </head>
 <body>
@@ -4441,7 +5272,8 @@ def generate_report_html(
         </div>
         <h3>高亮主进程明细（可展开）</h3>
         <div id="hlDetailEmpty" class="kill-index-empty" style="display:none;">无匹配详情</div>
-        <div class="accordion hl-event-list" id="hlDetailList">{hl_detail_html}</div>
+        <div class="accordion hl-event-list" id="hlDetailList">"""
+    html_tail = f"""</div>
       </div>
     </div>
   </div>
@@ -4451,549 +5283,191 @@ def generate_report_html(
   <div class="tab-panel" id="tab-memory">
     <div class="section">
       <div class="cards single">
-        {mem_avg_card_html}
-      </div>
-      <h3>高亮主进程(主)内存分布（查杀时）</h3>
-      <div class="mem-dist-grid">
-        <div class="chart-card"><div class="chart-title">memfree 分布（KB）</div><canvas id="chartMemDistMemfree"></canvas></div>
-        <div class="chart-card"><div class="chart-title">file 分布（KB）</div><canvas id="chartMemDistFile"></canvas></div>
-        <div class="chart-card"><div class="chart-title">anon 分布（KB）</div><canvas id="chartMemDistAnon"></canvas></div>
-        <div class="chart-card"><div class="chart-title">swapfree 分布（KB）</div><canvas id="chartMemDistSwap"></canvas></div>
-      </div>
-      <h3>高亮主进程(主)低内存明细（可展开）</h3>
-      <div class="mem-low-note">按指标筛选后展示最低的 5/10/20/50 条查杀事件（含上层/一体化与底层/LMKD）。</div>
-      <div class="mem-low-filters">
-        <div class="mem-low-item">
-          <label for="memLowMetric">指标</label>
-          <select id="memLowMetric">
-            <option value="mem_free">memfree</option>
-            <option value="file_pages">file</option>
-            <option value="anon_pages">anon</option>
-            <option value="swap_free">swapfree</option>
-          </select>
-        </div>
-        <div class="mem-low-item">
-          <label for="memLowLimit">条数</label>
-          <select id="memLowLimit">
-            <option value="5">5</option>
-            <option value="10" selected>10</option>
-            <option value="20">20</option>
-            <option value="50">50</option>
-          </select>
-        </div>
-      </div>
-      <div id="memLowDetailEmpty" class="kill-index-empty" style="display:none;">无匹配详情</div>
-      <div class="accordion hl-event-list" id="memLowDetailList"></div>
-    </div>
-  </div>
-
-  <div class="tab-panel" id="tab-meminfo">
-    <div class="section">
-      <h3>dumpsys meminfo 结构化视图</h3>
-      <div class="meminfo-source">来源: {html_escape(meminfo_source_desc or "-")}</div>
-      {meminfo_error_html}
-
-      <h3>Total PSS by process (Top 20)</h3>
-      <div class="meminfo-summary-grid">
-        {meminfo_summary_cards_html}
-      </div>
-      <div class="meminfo-subtabs">
-        <button class="meminfo-subtab-btn active" type="button" data-mem-group="topproc" data-mem-panel="table">表格</button>
-        <button class="meminfo-subtab-btn" type="button" data-mem-group="topproc" data-mem-panel="chart">图表</button>
-      </div>
-      <div class="meminfo-subpanel active" data-mem-group="topproc" data-mem-panel="table">
-        <div class="meminfo-table-wrap">
-          <table class="meminfo-table">
-            <thead><tr><th>#</th><th>进程</th><th>PSS(KB)</th><th>Swap(KB)</th></tr></thead>
-            <tbody>{meminfo_top_process_rows_html}</tbody>
-          </table>
-        </div>
-      </div>
-      <div class="meminfo-subpanel" data-mem-group="topproc" data-mem-panel="chart">
-        <div class="meminfo-chart-grid" style="grid-template-columns:1fr;">
-          <div class="chart-card"><div class="chart-title">Top进程 PSS (KB)</div><canvas id="chartMeminfoTopProc"></canvas></div>
-        </div>
-      </div>
-
-      <h3>PSS by OOM adjustment</h3>
-      <div class="meminfo-subtabs">
-        <button class="meminfo-subtab-btn active" type="button" data-mem-group="oom" data-mem-panel="table">表格</button>
-        <button class="meminfo-subtab-btn" type="button" data-mem-group="oom" data-mem-panel="chart">图表</button>
-      </div>
-      <div class="meminfo-subpanel active" data-mem-group="oom" data-mem-panel="table">
-        <div class="meminfo-table-wrap">
-          <table class="meminfo-table">
-            <thead><tr><th>优先级组</th><th>OOM 分类</th><th>进程数</th><th>PSS(KB)</th><th>Swap(KB)</th></tr></thead>
-            <tbody>{meminfo_oom_rows_html}</tbody>
-          </table>
-        </div>
-      </div>
-      <div class="meminfo-subpanel" data-mem-group="oom" data-mem-panel="chart">
-        <div class="meminfo-chart-grid" style="grid-template-columns:1fr;">
-          <div class="chart-card"><div class="chart-title">OOM 分类占用 (KB)</div><canvas id="chartMeminfoOom"></canvas></div>
-        </div>
-      </div>
-
-      <h3>优先级视角 (基于 OOM 类别)</h3>
-      <div class="meminfo-priority-row">
-        <div class="meminfo-table-wrap">
-          <table class="meminfo-table">
-            <thead><tr><th>优先级组</th><th>进程数</th><th>PSS(KB)</th></tr></thead>
-            <tbody>{meminfo_priority_rows_html}</tbody>
-          </table>
-        </div>
-        <div class="chart-card meminfo-priority-chart">
-          <div class="chart-title">优先级占比 (PSS)</div>
-          <div class="meminfo-priority-canvas-wrap"><canvas id="chartMeminfoPriority"></canvas></div>
-        </div>
-        <div class="meminfo-table-wrap">
-          <table class="meminfo-table">
-            <thead><tr><th>优先级组</th><th>规则映射(示例)</th><th>本报告命中类别</th></tr></thead>
-            <tbody>{priority_mapping_rows_html}</tbody>
-          </table>
-        </div>
-      </div>
-    </div>
-  </div>
-
-  <div class="tab-panel" id="tab-device">
-    <div class="section">
-      <h3>Bugreport 设备信息</h3>
-      <div class="cards single">
-        <div class="card card-wide">
-          <div class="device-table-wrap">
-            <table class="device-info-table">
-              <tbody>{device_info_rows_html}</tbody>
-            </table>
-          </div>
-        </div>
-      </div>
-      <h3>自动匹配结果</h3>
-      <div class="cards single">
-        <div class="card card-wide">
-          <pre class="device-info-pre">{auto_match_block_html}</pre>
-        </div>
-      </div>
-      <h3>/proc/mv</h3>
-      <div class="cards single">
-        <div class="card card-wide">
-          <pre class="device-info-pre">{proc_mv_block_html}</pre>
-        </div>
-      </div>
-    </div>
-  </div>
-  </div>
-
-  <script>
-    const charts = {json.dumps(_to_plain({
-        "kill_type": s.get("kill_type_stats", {}),
-        "min_score": min_score_chart_stats,
-        "adj": s.get("adj_stats", {}),
-        "lmk_reason": s.get("lmk_reason_stats", {}),
-        "lmk_adj": s.get("lmk_adj_stats", {}),
-        "main_kill_type": s.get("main_overall", {}).get("kill_type_stats", {}),
-        "main_min_score": main_min_score_chart_stats,
-        "main_lmk_reason": main_lmk_reason_stats,
-        "main_adj": s.get("main_overall", {}).get("adj_stats", {}),
-        "main_lmk_adj": s.get("main_overall", {}).get("lmk_adj_stats", {}),
-        "hl_kill_type": s.get("highlight_overall", {}).get("main_kill_type_stats", {}),
-        "hl_min_score": hl_min_score_chart_stats,
-        "hl_lmk_reason": hl_lmk_reason_stats,
-        "hl_adj": s.get("highlight_overall", {}).get("main_adj_stats", {}),
-        "hl_lmk_adj": s.get("highlight_overall", {}).get("main_lmk_adj_stats", {}),
-        "hl_mem_dist": hl_mem_dist,
-        "meminfo_top_process": meminfo_data.get("chart_top_process", {}),
-        "meminfo_oom": meminfo_data.get("chart_oom", {}),
-        "meminfo_priority": meminfo_data.get("chart_priority", {}),
-    }), ensure_ascii=False)};
-    const hlMemLowEvents = {json.dumps(_to_plain(hl_mem_low_events), ensure_ascii=False)};
-
-    function renderBar(canvasId, dataObj, label) {{
-      const ctx = document.getElementById(canvasId);
-      if (!ctx) return;
-      const labels = Object.keys(dataObj || {{}}); 
-      const values = Object.values(dataObj || {{}});
-      if (labels.length === 0) {{
-        const titleEl = ctx.parentElement.querySelector('.chart-title');
-        const titleHtml = titleEl ? titleEl.outerHTML : '';
-        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
-        return;
-      }}
-      const gradient = ctx.getContext('2d').createLinearGradient(0, 0, 0, 260);
-      gradient.addColorStop(0, 'rgba(123,198,255,0.9)');
-      gradient.addColorStop(1, 'rgba(123,198,255,0.2)');
-      new Chart(ctx, {{
-        type: 'bar',
-        data: {{
-          labels,
-          datasets: [{{
-            label,
-            data: values,
-            backgroundColor: gradient,
-            borderColor: 'rgba(123,198,255,0.95)',
-            borderWidth: 1.2,
-            borderRadius: 6,
-            hoverBackgroundColor: 'rgba(123,198,255,0.95)'
-          }}]
-        }},
-        options: {{
-          responsive: true,
-          plugins: {{
-            legend: {{ display: false }},
-            datalabels: {{
-              anchor: 'end',
-              align: 'end',
-              color: '#f5f7fb',
-              font: {{ size: 11, weight: '600' }},
-              formatter: (value) => value
-            }}
-          }},
-          scales: {{
-            x: {{ ticks: {{ color: '#cdd6e3' }} }},
-            y: {{ ticks: {{ color: '#cdd6e3' }}, beginAtZero:true }}
-          }}
-        }}
-      }});
-    }}
-
-    function renderLine(canvasId, curveObj, label) {{
-      const ctx = document.getElementById(canvasId);
-      if (!ctx) return;
-      const labels = (curveObj && curveObj.labels) || [];
-      const values = (curveObj && curveObj.values) || [];
-      if (!labels.length || !values.length) {{
-        const titleEl = ctx.parentElement.querySelector('.chart-title');
-        const titleHtml = titleEl ? titleEl.outerHTML : '';
-        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
-        return;
-      }}
-
-      const lineColor = 'rgba(123,198,255,0.95)';
-      const fillColor = 'rgba(123,198,255,0.18)';
-      new Chart(ctx, {{
-        type: 'line',
-        data: {{
-          labels,
-          datasets: [{{
-            label,
-            data: values,
-            borderColor: lineColor,
-            backgroundColor: fillColor,
-            pointBackgroundColor: 'rgba(184,225,255,0.95)',
-            pointRadius: 1.8,
-            pointHoverRadius: 3,
-            borderWidth: 1.8,
-            tension: 0.28,
-            fill: true
-          }}]
-        }},
-        options: {{
-          responsive: true,
-          plugins: {{
-            legend: {{ display: false }},
-            datalabels: {{ display: false }}
-          }},
-          scales: {{
-            x: {{ ticks: {{ color: '#cdd6e3', maxTicksLimit: 8 }} }},
-            y: {{
-              ticks: {{
-                color: '#cdd6e3',
-                callback: (value) => Number(value).toLocaleString('en-US')
-              }},
-              beginAtZero: false
-            }}
-          }}
-        }}
-      }});
-    }}
-
-    function renderDoughnut(canvasId, dataObj, label) {{
-      const ctx = document.getElementById(canvasId);
-      if (!ctx) return;
-      const entries = Object.entries(dataObj || {{}})
-        .filter(([, v]) => Number(v) > 0)
-        .sort((a, b) => Number(b[1]) - Number(a[1]));
-      if (!entries.length) {{
-        const titleEl = ctx.parentElement.querySelector('.chart-title');
-        const titleHtml = titleEl ? titleEl.outerHTML : '';
-        ctx.parentElement.innerHTML = titleHtml + '<div style="color:#9fb3c8;font-size:12px;padding:8px;">暂无数据（该范围无样本）</div>';
-        return;
-      }}
-      const palette = [
-        'rgba(123,198,255,0.92)',
-        'rgba(128,226,196,0.92)',
-        'rgba(255,187,120,0.92)',
-        'rgba(247,140,140,0.92)',
-        'rgba(189,156,255,0.92)',
-        'rgba(255,214,92,0.92)',
-      ];
-      const labels = entries.map((e) => e[0]);
-      const values = entries.map((e) => Number(e[1]));
-      const colors = labels.map((_, i) => palette[i % palette.length]);
-      new Chart(ctx, {{
-        type: 'doughnut',
-        data: {{
-          labels,
-          datasets: [{{
-            label,
-            data: values,
-            backgroundColor: colors,
-            borderColor: '#0f1722',
-            borderWidth: 2,
-            hoverOffset: 4,
-          }}]
-        }},
-        options: {{
-          responsive: true,
-          maintainAspectRatio: false,
-          plugins: {{
-            legend: {{
-              position: 'bottom',
-              labels: {{ color: '#cdd6e3', boxWidth: 12, font: {{ size: 11 }} }}
-            }},
-            datalabels: {{ display: false }}
-          }}
-        }}
-      }});
-    }}
-
-    function renderList(listId, dataObj) {{
-      const container = document.getElementById(listId);
-      if (!container) return;
-      const entries = Object.entries(dataObj || {{}}).sort((a,b)=>b[1]-a[1]);
-      if (!entries.length) {{
-        container.innerHTML = '<div style="color:#9fb3c8;">暂无数据</div>';
-        return;
-      }}
-      container.innerHTML = entries.map(([k,v]) => `
-        <div><span class="key">${{k}}</span><span class="val">${{v}}</span></div>
-      `).join('');
-    }}
-
-    renderBar('chartKillType', charts.kill_type, '查杀类型');    renderList('listKillType', charts.kill_type);
-    renderBar('chartMinScore', charts.min_score, '可查杀最低分值'); renderList('listMinScore', charts.min_score);
-    renderBar('chartAdj', charts.adj, 'adj 分布');              renderList('listAdj', charts.adj);
-    renderBar('chartLmkReason', charts.lmk_reason, 'LMK 原因');   renderList('listLmkReason', charts.lmk_reason);
-    renderBar('chartLmkAdj', charts.lmk_adj, 'LMK adj');          renderList('listLmkAdj', charts.lmk_adj);
-
-    renderBar('chartMainKillType', charts.main_kill_type, '主进程 kill 类型'); renderList('listMainKillType', charts.main_kill_type);
-    renderBar('chartMainMinScore', charts.main_min_score, '主进程 minScore');  renderList('listMainMinScore', charts.main_min_score);
-    renderBar('chartMainLmkReason', charts.main_lmk_reason, '主进程 LMK 原因'); renderList('listMainLmkReason', charts.main_lmk_reason);
-    renderBar('chartMainAdj', charts.main_adj, '主进程 adj');                  renderList('listMainAdj', charts.main_adj);
-    renderBar('chartMainLmkAdj', charts.main_lmk_adj, '主进程 LMK adj');       renderList('listMainLmkAdj', charts.main_lmk_adj);
-
-    renderBar('chartHlKillType', charts.hl_kill_type, '高亮主进程 kill 类型'); renderList('listHlKillType', charts.hl_kill_type);
-    renderBar('chartHlMinScore', charts.hl_min_score, '高亮主进程 minScore');  renderList('listHlMinScore', charts.hl_min_score);
-    renderBar('chartHlLmkReason', charts.hl_lmk_reason, '高亮主进程 LMK 原因'); renderList('listHlLmkReason', charts.hl_lmk_reason);
-    renderBar('chartHlAdj', charts.hl_adj, '高亮主进程 adj');                 renderList('listHlAdj', charts.hl_adj);
-    renderBar('chartHlLmkAdj', charts.hl_lmk_adj, '高亮主进程 LMK adj');      renderList('listHlLmkAdj', charts.hl_lmk_adj);
-
-    renderLine('chartMemDistMemfree', charts.hl_mem_dist && charts.hl_mem_dist.mem_free, 'memfree 分布');
-    renderLine('chartMemDistFile', charts.hl_mem_dist && charts.hl_mem_dist.file_pages, 'file 分布');
-    renderLine('chartMemDistAnon', charts.hl_mem_dist && charts.hl_mem_dist.anon_pages, 'anon 分布');
-    renderLine('chartMemDistSwap', charts.hl_mem_dist && charts.hl_mem_dist.swap_free, 'swapfree 分布');
-
-    const meminfoChartRendered = {{
-      topproc: false,
-      oom: false,
-      priority: false,
-    }};
-    function renderMeminfoChart(group) {{
-      if (group === 'topproc' && !meminfoChartRendered.topproc) {{
-        renderBar('chartMeminfoTopProc', charts.meminfo_top_process, 'PSS(KB)');
-        meminfoChartRendered.topproc = true;
-      }}
-      if (group === 'oom' && !meminfoChartRendered.oom) {{
-        renderBar('chartMeminfoOom', charts.meminfo_oom, 'PSS(KB)');
-        meminfoChartRendered.oom = true;
-      }}
-      if (group === 'priority' && !meminfoChartRendered.priority) {{
-        renderDoughnut('chartMeminfoPriority', charts.meminfo_priority, '优先级');
-        meminfoChartRendered.priority = true;
-      }}
-    }}
-
-    // 章节标签页
-    const tabButtons = document.querySelectorAll('.tab-btn');
-    const tabPanels = document.querySelectorAll('.tab-panel');
-    function activateTab(tabId) {{
-      tabButtons.forEach((btn) => {{
-        const isActive = btn.dataset.tab === tabId;
-        btn.classList.toggle('active', isActive);
-      }});
-      tabPanels.forEach((panel) => {{
-        panel.classList.toggle('active', panel.id === tabId);
-      }});
-    }}
-    tabButtons.forEach((btn) => {{
-      btn.addEventListener('click', () => activateTab(btn.dataset.tab));
-    }});
-
-    // Meminfo 子标签页
-    const memSubButtons = document.querySelectorAll('.meminfo-subtab-btn');
-    const memSubPanels = document.querySelectorAll('.meminfo-subpanel');
-    function activateMemSubTab(group, panel) {{
-      memSubButtons.forEach((btn) => {{
-        if (btn.dataset.memGroup !== group) return;
-        btn.classList.toggle('active', btn.dataset.memPanel === panel);
-      }});
-      memSubPanels.forEach((item) => {{
-        if (item.dataset.memGroup !== group) return;
-        item.classList.toggle('active', item.dataset.memPanel === panel);
-      }});
-      if (panel === 'chart') renderMeminfoChart(group);
-    }}
-    memSubButtons.forEach((btn) => {{
-      btn.addEventListener('click', () => activateMemSubTab(btn.dataset.memGroup, btn.dataset.memPanel));
-    }});
-    document.querySelectorAll('.meminfo-subpanel.active[data-mem-panel="chart"]').forEach((panel) => {{
-      if (panel.dataset.memGroup) renderMeminfoChart(panel.dataset.memGroup);
-    }});
-    renderMeminfoChart('priority');
-
-    // 内存低值明细过滤
-    const memLowMetric = document.getElementById('memLowMetric');
-    const memLowLimit = document.getElementById('memLowLimit');
-    const memLowList = document.getElementById('memLowDetailList');
-    const memLowEmpty = document.getElementById('memLowDetailEmpty');
-
-    function escapeHtml(text) {{
-      return String(text ?? '')
-        .replace(/&/g, '&amp;')
-        .replace(/</g, '&lt;')
-        .replace(/>/g, '&gt;')
-        .replace(/\"/g, '&quot;')
-        .replace(/'/g, '&#39;');
-    }}
-
-    function fmtMetric(value) {{
-      if (value === null || value === undefined || value === '') return '-';
-      const num = Number(value);
-      return Number.isFinite(num) ? num.toLocaleString('en-US') : String(value);
-    }}
-
-    function padRight(text, width) {{
-      const src = String(text ?? '');
-      if (src.length > width) {{
-        return width <= 3 ? src.slice(0, width) : src.slice(0, width - 3) + '...';
-      }}
-      return src.padEnd(width, ' ');
-    }}
+        {mem_avg_card_html}
+      </div>
+      <h3>高亮主进程(主)内存分布（查杀时）</h3>
+      <div class="mem-dist-grid">
+        <div class="chart-card"><div class="chart-title">memfree 分布（KB）</div><canvas id="chartMemDistMemfree"></canvas></div>
+        <div class="chart-card"><div class="chart-title">file 分布（KB）</div><canvas id="chartMemDistFile"></canvas></div>
+        <div class="chart-card"><div class="chart-title">anon 分布（KB）</div><canvas id="chartMemDistAnon"></canvas></div>
+        <div class="chart-card"><div class="chart-title">swapfree 分布（KB）</div><canvas id="chartMemDistSwap"></canvas></div>
+      </div>
+      <h3>高亮主进程(主)低内存明细（可展开）</h3>
+      <div class="mem-low-note">按指标筛选后展示最低的 5/10/20/50 条查杀事件（含上层/一体化与底层/LMKD）。</div>
+      <div class="mem-low-filters">
+        <div class="mem-low-item">
+          <label for="memLowMetric">指标</label>
+          <select id="memLowMetric">
+            <option value="mem_free">memfree</option>
+            <option value="file_pages">file</option>
+            <option value="anon_pages">anon</option>
+            <option value="swap_free">swapfree</option>
+          </select>
+        </div>
+        <div class="mem-low-item">
+          <label for="memLowLimit">条数</label>
+          <select id="memLowLimit">
+            <option value="5">5</option>
+            <option value="10" selected>10</option>
+            <option value="20">20</option>
+            <option value="50">50</option>
+          </select>
+        </div>
+      </div>
+      <div id="memLowDetailEmpty" class="kill-index-empty" style="display:none;">无匹配详情</div>
+      <div class="accordion hl-event-list" id="memLowDetailList"></div>
+    </div>
+  </div>
 
-    function buildMemLowSummary(rec) {{
-      return [
-        padRight(`EVENT ${{rec.event_id}}`, 10),
-        padRight(`TYPE ${{rec.type_label}}`, 10),
-        padRight(`PKG ${{rec.process}}`, 34),
-        padRight(`MEMFREE ${{fmtMetric(rec.mem_free)}}`, 18),
-        padRight(`FILE ${{fmtMetric(rec.file_pages)}}`, 14),
-        padRight(`ANON ${{fmtMetric(rec.anon_pages)}}`, 14),
-        padRight(`SWAPFREE ${{fmtMetric(rec.swap_free)}}`, 18),
-        padRight(rec.time || '-', 18),
-      ].join('  ');
-    }}
+  <div class="tab-panel" id="tab-meminfo">
+    <div class="section">
+      <h3>dumpsys meminfo 结构化视图</h3>
+      <div class="meminfo-source">来源: {html_escape(meminfo_source_desc or "-")}</div>
+      {meminfo_error_html}
 
-    function applyMemLowFilter() {{
-      if (!memLowMetric || !memLowLimit || !memLowList || !memLowEmpty) return;
-      const metricKey = memLowMetric.value || 'mem_free';
-      const limit = parseInt(memLowLimit.value || '10', 10);
-      const filtered = (hlMemLowEvents || [])
-        .filter((rec) => rec && rec[metricKey] !== null && rec[metricKey] !== undefined)
-        .sort((a, b) => Number(a[metricKey]) - Number(b[metricKey]))
-        .slice(0, limit);
+      <h3>Total PSS by process (Top 20)</h3>
+      <div class="meminfo-summary-grid">
+        {meminfo_summary_cards_html}
+      </div>
+      <div class="meminfo-subtabs">
+        <button class="meminfo-subtab-btn active" type="button" data-mem-group="topproc" data-mem-panel="table">表格</button>
+        <button class="meminfo-subtab-btn" type="button" data-mem-group="topproc" data-mem-panel="chart">图表</button>
+      </div>
+      <div class="meminfo-subpanel active" data-mem-group="topproc" data-mem-panel="table">
+        <div class="meminfo-table-wrap">
+          <table class="meminfo-table">
+            <thead><tr><th>#</th><th>进程</th><th>PSS(KB)</th><th>Swap(KB)</th></tr></thead>
+            <tbody>{meminfo_top_process_rows_html}</tbody>
+          </table>
+        </div>
+      </div>
+      <div class="meminfo-subpanel" data-mem-group="topproc" data-mem-panel="chart">
+        <div class="meminfo-chart-grid" style="grid-template-columns:1fr;">
+          <div class="chart-card"><div class="chart-title">Top进程 PSS (KB)</div><canvas id="chartMeminfoTopProc"></canvas></div>
+        </div>
+      </div>
 
-      if (!filtered.length) {{
-        memLowList.innerHTML = '';
-        memLowEmpty.style.display = 'block';
-        return;
-      }}
+      <h3>PSS by OOM adjustment</h3>
+      <div class="meminfo-subtabs">
+        <button class="meminfo-subtab-btn active" type="button" data-mem-group="oom" data-mem-panel="table">表格</button>
+        <button class="meminfo-subtab-btn" type="button" data-mem-group="oom" data-mem-panel="chart">图表</button>
+      </div>
+      <div class="meminfo-subpanel active" data-mem-group="oom" data-mem-panel="table">
+        <div class="meminfo-table-wrap">
+          <table class="meminfo-table">
+            <thead><tr><th>优先级组</th><th>OOM 分类</th><th>进程数</th><th>PSS(KB)</th><th>Swap(KB)</th></tr></thead>
+            <tbody>{meminfo_oom_rows_html}</tbody>
+          </table>
+        </div>
+      </div>
+      <div class="meminfo-subpanel" data-mem-group="oom" data-mem-panel="chart">
+        <div class="meminfo-chart-grid" style="grid-template-columns:1fr;">
+          <div class="chart-card"><div class="chart-title">OOM 分类占用 (KB)</div><canvas id="chartMeminfoOom"></canvas></div>
+        </div>
+      </div>
 
-      memLowEmpty.style.display = 'none';
-      memLowList.innerHTML = filtered.map((rec) => {{
-        const summaryLine = buildMemLowSummary(rec);
-        return `
-          <details class="mem-low-event-item">
-            <summary><span class="hl-event-summary-line">${{escapeHtml(summaryLine)}}</span></summary>
-            <pre>${{escapeHtml(rec.detail || '')}}</pre>
-          </details>
-        `;
-      }}).join('');
-    }}
+      <h3>优先级视角 (基于 OOM 类别)</h3>
+      <div class="meminfo-priority-row">
+        <div class="meminfo-table-wrap">
+          <table class="meminfo-table">
+            <thead><tr><th>优先级组</th><th>进程数</th><th>PSS(KB)</th></tr></thead>
+            <tbody>{meminfo_priority_rows_html}</tbody>
+          </table>
+        </div>
+        <div class="chart-card meminfo-priority-chart">
+          <div class="chart-title">优先级占比 (PSS)</div>
+          <div class="meminfo-priority-canvas-wrap"><canvas id="chartMeminfoPriority"></canvas></div>
+        </div>
+        <div class="meminfo-table-wrap">
+          <table class="meminfo-table">
+            <thead><tr><th>优先级组</th><th>规则映射(示例)</th><th>本报告命中类别</th></tr></thead>
+            <tbody>{priority_mapping_rows_html}</tbody>
+          </table>
+        </div>
+      </div>
+    </div>
+  </div>
 
-    [memLowMetric, memLowLimit].forEach((el) => {{
-      if (el) el.addEventListener('change', applyMemLowFilter);
-    }});
-    applyMemLowFilter();
+  <div class="tab-panel" id="tab-device">
+    <div class="section">
+      <h3>Bugreport 设备信息</h3>
+      <div class="cards single">
+        <div class="card card-wide">
+          <div class="device-table-wrap">
+            <table class="device-info-table">
+              <tbody>{device_info_rows_html}</tbody>
+            </table>
+          </div>
+        </div>
+      </div>
+      <h3>自动匹配结果</h3>
+      <div class="cards single">
+        <div class="card card-wide">
+          <pre class="device-info-pre">{auto_match_block_html}</pre>
+        </div>
+      </div>
+      <h3>/proc/mv</h3>
+      <div class="cards single">
+        <div class="card card-wide">
+          <pre class="device-info-pre">{proc_mv_block_html}</pre>
+        </div>
+      </div>
+    </div>
+  </div>
+  </div>
 
-    // 高亮主进程明细索引过滤
-    const hlFilterKillType = document.getElementById('hlFilterKillType');
-    const hlFilterAdj = document.getElementById('hlFilterAdj');
-    const hlFilterProc = document.getElementById('hlFilterProc');
-    function applyHlDetailFilter() {{
-      if (!hlFilterKillType || !hlFilterAdj || !hlFilterProc) return;
-      const killTypeVal = hlFilterKillType.value || '';
-      const adjVal = hlFilterAdj.value || '';
-      const procVal = hlFilterProc.value || '';
-      let visibleEventCount = 0;
-      document.querySelectorAll('.hl-event-item').forEach((itemEl) => {{
-        const matchesKillType = !killTypeVal || itemEl.dataset.killtype === killTypeVal;
-        const matchesAdj = !adjVal || itemEl.dataset.adj === adjVal;
-        const matchesProc = !procVal || itemEl.dataset.proc === procVal;
-        const visible = matchesKillType && matchesAdj && matchesProc;
-        itemEl.style.display = visible ? '' : 'none';
-        if (visible) visibleEventCount += 1;
-      }});
+  <script id="hlMemLowEventsData" type="application/json">"""
+    # 图表数据在写出时再序列化；数据常量与静态脚本逐段写入文件，不拼进 html_tail
+    charts_data = {
+        "kill_type": s.get("kill_type_stats", {}),
+        "min_score": min_score_chart_stats,
+        "adj": s.get("adj_stats", {}),
+        "lmk_reason": s.get("lmk_reason_stats", {}),
+        "lmk_adj": s.get("lmk_adj_stats", {}),
+        "main_kill_type": main_overall.get("kill_type_stats", {}),
+        "main_min_score": main_min_score_chart_stats,
+        "main_lmk_reason": main_lmk_reason_stats,
+        "main_adj": main_overall.get("adj_stats", {}),
+        "main_lmk_adj": main_overall.get("lmk_adj_stats", {}),
+        "hl_kill_type": hl_overall.get("main_kill_type_stats", {}),
+        "hl_min_score": hl_min_score_chart_stats,
+        "hl_lmk_reason": hl_lmk_reason_stats,
+        "hl_adj": hl_overall.get("main_adj_stats", {}),
+        "hl_lmk_adj": hl_overall.get("main_lmk_adj_stats", {}),
+        "hl_mem_dist": hl_mem_dist,
+        "meminfo_top_process": meminfo_data.get("chart_top_process", {}),
+        "meminfo_oom": meminfo_data.get("chart_oom", {}),
+        "meminfo_priority": meminfo_data.get("chart_priority", {}),
+    }
+    if str(output_file).endswith(".gz"):
+        out = gzip.open(output_file, "wt", encoding="utf-8", compresslevel=1)
+    else:
+        out = open(output_file, "w", encoding="utf-8", buffering=1 << 20)
+    with out as f:
+        f.write(html_head)
+        f.writelines(iter_hl_detail())
+        # 内存低值事件放在 application/json 数据标签中，由页面脚本首次展示时再 JSON.parse；
+        # JSON 中的 "<" 只会出现在字符串里，统一写成 \u003c，避免提前闭合 </script>
+        f.writelines((
+            html_tail,
+            _dumps_script_json(hl_mem_low_events).replace("<", "\\u003c"),
+            "</script>\n  <script>\n    const charts = ",
+            _dumps_script_json(charts_data),
+            f";\n    const heatmapLevelStatus = {_HEATMAP_LEVEL_STATUS_JSON};\n",
+            _SUMMARY_REPORT_SCRIPT,
+            "\n  </script>\n</body>\n</html>\n",
+        ))
 
-      const emptyTip = document.getElementById('hlDetailEmpty');
-      if (emptyTip) emptyTip.style.display = visibleEventCount > 0 ? 'none' : 'block';
-    }}
-    const hlFilters = [hlFilterKillType, hlFilterAdj, hlFilterProc].filter(Boolean);
-    function onHlFilterChange(changedEl) {{
-      if (!changedEl) return;
-      const selectedVal = changedEl.value || '';
-      if (selectedVal) {{
-        hlFilters.forEach((el) => {{
-          if (el !== changedEl) el.value = '';
-        }});
-      }}
-      applyHlDetailFilter();
-    }}
-    hlFilters.forEach((el) => {{
-      el.addEventListener('change', () => onHlFilterChange(el));
-    }});
-    applyHlDetailFilter();
 
-    // 折叠明细
-    document.querySelectorAll('.acc-header').forEach(function(h) {{
-      h.addEventListener('click', function() {{
-        var target = document.getElementById(h.dataset.target);
-        if (!target) return;
-        var visible = target.style.display === 'block';
-        target.style.display = visible ? 'none' : 'block';
-      }});
-    }});
-  </script>
-</body>
-</html>
-"""
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html_content)
+def _normalize_app_list(items: List[str]) -> List[str]:
+    # 等价于 _base_name + _looks_like_package（含点即视为包名），dict.fromkeys 保序去重
+    pkgs = (item.strip().partition(":")[0] for item in items if isinstance(item, str))
+    return list(dict.fromkeys(pkg for pkg in pkgs if "." in pkg))
 
 
-def _normalize_app_list(items: List[str]) -> List[str]:
-    apps = []
-    seen = set()
-    for item in items:
-        if not isinstance(item, str):
-            continue
-        pkg = _base_name(item.strip())
-        if not _looks_like_package(pkg):
-            continue
-        if pkg in seen:
-            continue
-        seen.add(pkg)
-        apps.append(pkg)
-    return apps
+# app 列表分隔符：空白 / 逗号 / 分号
+_APP_LIST_SPLIT_PATTERN = re.compile(r"[\s,;]+")
+_APP_LIST_FILE_SUFFIXES = (".txt", ".csv", ".json")
 
 
 def _parse_heatmap_app_list_spec(spec: str) -> List[str]:
@@ -5006,15 +5480,18 @@ def _parse_heatmap_app_list_spec(spec: str) -> List[str]:
     if not text:
         return []
 
-    if len(text) > 1:
-        if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
-            text = text[1:-1].strip()
+    if len(text) > 1 and text[0] in "'\"" and text[-1] == text[0]:
+        text = text[1:-1].strip()
 
     def _split_plain(raw: str) -> List[str]:
-        return [x for x in re.split(r"[\s,;]+", raw) if x]
+        return [x for x in _APP_LIST_SPLIT_PATTERN.split(raw) if x]
 
-    if os.path.isfile(text):
-        lower = text.lower()
+    lower = text.lower()
+    # 含分隔符且不是列表文件后缀时必然是包名串，不必再探测文件系统
+    looks_like_names = (
+        any(c in text for c in ",; \t\n") and not lower.endswith(_APP_LIST_FILE_SUFFIXES)
+    )
+    if not looks_like_names and os.path.isfile(text):
         if lower.endswith(".json"):
             try:
                 with open(text, "r", encoding="utf-8") as fp:
@@ -5056,19 +5533,30 @@ def _parse_heatmap_app_list_spec(spec: str) -> List[str]:
     return _normalize_app_list(_split_plain(text))
 
 
+# 默认 app_config 的可选 app list；_load_app_config 本身已按进程缓存，这里缓存归一化结果
+_NAMED_APP_LISTS_CACHE: Optional[List[Tuple[str, List[str]]]] = None
+
+
 def _extract_named_app_lists_from_config(config_data: Optional[dict] = None) -> List[Tuple[str, List[str]]]:
     """从 app_config 顶层提取可选 app list（仅 list[str]）。"""
-    data = config_data if config_data is not None else _load_app_config()
-    if not isinstance(data, dict):
-        return []
-    options: List[Tuple[str, List[str]]] = []
-    for key, value in data.items():
-        if not isinstance(value, list):
-            continue
-        apps = _normalize_app_list([str(x) for x in value])
-        if apps:
-            options.append((str(key), apps))
-    return options
+    global _NAMED_APP_LISTS_CACHE
+    use_default = config_data is None
+    if use_default and _NAMED_APP_LISTS_CACHE is not None:
+        options = _NAMED_APP_LISTS_CACHE
+    else:
+        data = _load_app_config() if use_default else config_data
+        options = []
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if not isinstance(value, list):
+                    continue
+                apps = _normalize_app_list([str(x) for x in value])
+                if apps:
+                    options.append((str(key), apps))
+        if use_default:
+            _NAMED_APP_LISTS_CACHE = options
+    # 返回副本，调用方改动列表不会污染缓存
+    return [(name, list(apps)) for name, apps in options]
 
 
 def _load_named_app_list_from_config(list_name: str) -> List[str]:
@@ -5211,27 +5699,25 @@ def _select_bugreport_text_member(zip_path: str, zip_file: zipfile.ZipFile) -> z
     if not members:
         raise ValueError(f"压缩包为空: {zip_path}")
 
-    def _pick(candidates: List[zipfile.ZipInfo]) -> Optional[zipfile.ZipInfo]:
-        if not candidates:
-            return None
-        return sorted(candidates, key=lambda x: (-x.file_size, x.filename.lower()))[0]
-
-    bugreport_txt = [
-        m for m in members
-        if "bugreport" in m.filename.lower() and m.filename.lower().endswith(".txt")
-    ]
-    picked = _pick(bugreport_txt)
-    if picked:
-        return picked
-
-    bugreport_any = [m for m in members if "bugreport" in m.filename.lower()]
-    picked = _pick(bugreport_any)
-    if picked:
-        return picked
-
-    txt_any = [m for m in members if m.filename.lower().endswith(".txt")]
-    picked = _pick(txt_any)
-    if picked:
+    # 单次遍历给每个成员定优先级：0=bugreport*.txt，1=含 bugreport，2=任意 .txt；
+    # 同级内取体积最大者，体积相同按文件名（小写）排序
+    best_key = None
+    picked = None
+    for m in members:
+        name_lower = m.filename.lower()
+        is_bugreport = "bugreport" in name_lower
+        is_txt = name_lower.endswith(".txt")
+        if is_bugreport:
+            tier = 0 if is_txt else 1
+        elif is_txt:
+            tier = 2
+        else:
+            continue
+        key = (tier, -m.file_size, name_lower)
+        if best_key is None or key < best_key:
+            best_key = key
+            picked = m
+    if picked is not None:
         return picked
 
     raise ValueError(
@@ -5256,7 +5742,8 @@ def _resolve_log_input_path(file_path: str) -> Tuple[str, Optional[str], str]:
             fd, temp_path = tempfile.mkstemp(prefix="collie_bugreport_", suffix=".txt")
             os.close(fd)
             with zip_file.open(member, "r") as src, open(temp_path, "wb") as dst:
-                shutil.copyfileobj(src, dst)
+                # 解压出的 bugreport 常达数百 MB，按 1 MiB 分块拷贝，减少读写调用次数
+                shutil.copyfileobj(src, dst, 1 << 20)
     except zipfile.BadZipFile as e:
         raise ValueError(f"无效的 zip 文件: {file_path}") from e
     except OSError as e:
@@ -5271,14 +5758,19 @@ def _resolve_log_input_path(file_path: str) -> Tuple[str, Optional[str], str]:
     return temp_path, temp_path, source_desc
 
 
-def _extract_property_value_from_line(line: str, prop_name: str) -> Optional[str]:
+@lru_cache(maxsize=32)
+def _property_value_patterns(prop_name: str) -> tuple:
+    """属性名对应的两种写法（getprop 的 [k]: [v] 与 k=v / k: v），按属性名编译一次"""
     escaped = re.escape(prop_name)
-    patterns = [
-        rf"\[\s*{escaped}\s*\]\s*:\s*\[(?P<value>[^\]]+)\]",
-        rf"\b{escaped}\b\s*[:=]\s*(?P<value>.+)$",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, line)
+    return (
+        re.compile(rf"\[\s*{escaped}\s*\]\s*:\s*\[(?P<value>[^\]]+)\]"),
+        re.compile(rf"\b{escaped}\b\s*[:=]\s*(?P<value>.+)$"),
+    )
+
+
+def _extract_property_value_from_line(line: str, prop_name: str) -> Optional[str]:
+    for pattern in _property_value_patterns(prop_name):
+        match = pattern.search(line)
         if not match:
             continue
         value = (match.group("value") or "").strip().strip('"').strip("'")
@@ -5287,6 +5779,12 @@ def _extract_property_value_from_line(line: str, prop_name: str) -> Optional[str
     return None
 
 
+_BUILD_FINGERPRINT_PATTERN = re.compile(r"Build fingerprint:\s*(?P<value>.+)$", re.IGNORECASE)
+_LINUX_VERSION_PATTERN = re.compile(r"(Linux version\s+\S.*)$", re.IGNORECASE)
+_MEM_TOTAL_LINE_PATTERN = re.compile(r"MemTotal:\s*(?P<value>.+)$", re.IGNORECASE)
+_SWAP_TOTAL_LINE_PATTERN = re.compile(r"SwapTotal:\s*(?P<value>.+)$", re.IGNORECASE)
+
+
 def _extract_device_info_from_bugreport(file_path: str, max_proc_mv_lines: int = 24) -> dict:
     """
     从 bugreport 文本提取设备关键字段：
@@ -5313,80 +5811,106 @@ def _extract_device_info_from_bugreport(file_path: str, max_proc_mv_lines: int =
     mem_total_fallback = ""
     swap_total_fallback = ""
     in_proc_mv_section = False
+    # /proc/mv 首段已截取完毕（段落结束或达到行数上限）后不再做该段的判断
+    proc_mv_done = False
     proc_mv_lines: List[str] = []
 
+    # 逐行先做子串预筛，命中关键字的行才跑正则。忽略大小写的字段用小写行判断；
+    # 非 ASCII 行的大小写折叠与正则 IGNORECASE 不完全一致，这类行直接交给正则
+    fingerprint_pattern = _BUILD_FINGERPRINT_PATTERN
+    linux_version_pattern = _LINUX_VERSION_PATTERN
+    mem_total_pattern = _MEM_TOTAL_LINE_PATTERN
+    swap_total_pattern = _SWAP_TOTAL_LINE_PATTERN
+    # info 中除 proc_mv 外尚未取到的字段数，归零后只需再等 /proc/mv 段结束
+    pending_fields = 6
     with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
         for raw_line in f:
-            line = raw_line.rstrip("\n")
-            stripped = line.strip()
+            stripped = raw_line.strip()
             if not stripped:
                 continue
             lower = stripped.lower()
+            non_ascii = not stripped.isascii()
 
             if not info["build_fingerprint"]:
-                match = re.search(r"Build fingerprint:\s*(?P<value>.+)$", stripped, re.IGNORECASE)
+                match = None
+                if non_ascii or "build fingerprint:" in lower:
+                    match = fingerprint_pattern.search(stripped)
                 if match:
                     info["build_fingerprint"] = (match.group("value") or "").strip()
-                else:
+                elif "ro.build.fingerprint" in stripped:
                     info["build_fingerprint"] = _extract_property_value_from_line(
                         stripped,
                         "ro.build.fingerprint",
                     ) or ""
+                if info["build_fingerprint"]:
+                    pending_fields -= 1
 
-            if not info["ro_product_device"]:
+            if not info["ro_product_device"] and "ro.product.device" in stripped:
                 info["ro_product_device"] = _extract_property_value_from_line(stripped, "ro.product.device") or ""
+                if info["ro_product_device"]:
+                    pending_fields -= 1
 
-            if not info["ro_board_platform"]:
+            if not info["ro_board_platform"] and "ro.board.platform" in stripped:
                 info["ro_board_platform"] = _extract_property_value_from_line(stripped, "ro.board.platform") or ""
+                if info["ro_board_platform"]:
+                    pending_fields -= 1
 
-            if not info["linux_version"]:
-                match = re.search(r"(Linux version\s+\S.*)$", stripped, re.IGNORECASE)
+            if not info["linux_version"] and (non_ascii or "linux version" in lower):
+                match = linux_version_pattern.search(stripped)
                 if match:
                     info["linux_version"] = (match.group(1) or "").strip()
+                    if info["linux_version"]:
+                        pending_fields -= 1
 
             if "/proc/meminfo" in lower:
                 in_proc_meminfo = True
-            elif in_proc_meminfo and stripped.startswith("------") and "/proc/meminfo" not in lower:
+            elif in_proc_meminfo and stripped.startswith("------"):
                 in_proc_meminfo = False
 
-            mem_match = re.match(r"MemTotal:\s*(?P<value>.+)$", stripped, re.IGNORECASE)
-            if mem_match:
-                if in_proc_meminfo and not info["mem_total"]:
-                    info["mem_total"] = (mem_match.group("value") or "").strip()
-                elif not mem_total_fallback:
-                    mem_total_fallback = (mem_match.group("value") or "").strip()
-
-            swap_match = re.match(r"SwapTotal:\s*(?P<value>.+)$", stripped, re.IGNORECASE)
-            if swap_match:
-                if in_proc_meminfo and not info["swap_total"]:
-                    info["swap_total"] = (swap_match.group("value") or "").strip()
-                elif not swap_total_fallback:
-                    swap_total_fallback = (swap_match.group("value") or "").strip()
-
-            if "proc/mv" in lower and not proc_mv_lines:
-                proc_mv_lines.append(stripped)
-                in_proc_mv_section = stripped.startswith("------")
+            if non_ascii or lower.startswith("memtotal:"):
+                mem_match = mem_total_pattern.match(stripped)
+                if mem_match:
+                    if in_proc_meminfo and not info["mem_total"]:
+                        info["mem_total"] = (mem_match.group("value") or "").strip()
+                        if info["mem_total"]:
+                            pending_fields -= 1
+                    elif not mem_total_fallback:
+                        mem_total_fallback = (mem_match.group("value") or "").strip()
+
+            if non_ascii or lower.startswith("swaptotal:"):
+                swap_match = swap_total_pattern.match(stripped)
+                if swap_match:
+                    if in_proc_meminfo and not info["swap_total"]:
+                        info["swap_total"] = (swap_match.group("value") or "").strip()
+                        if info["swap_total"]:
+                            pending_fields -= 1
+                    elif not swap_total_fallback:
+                        swap_total_fallback = (swap_match.group("value") or "").strip()
+
+            if proc_mv_done:
+                if not pending_fields:
+                    break
                 continue
 
-            if in_proc_mv_section:
-                if stripped.startswith("------") and "proc/mv" not in lower:
-                    in_proc_mv_section = False
-                else:
+            if not proc_mv_lines:
+                if "proc/mv" in lower:
                     proc_mv_lines.append(stripped)
-                    if len(proc_mv_lines) >= max_proc_mv_lines:
-                        in_proc_mv_section = False
-
-            if (
-                info["build_fingerprint"]
-                and info["ro_product_device"]
-                and info["ro_board_platform"]
-                and info["mem_total"]
-                and info["swap_total"]
-                and info["linux_version"]
-                and proc_mv_lines
-                and not in_proc_mv_section
-            ):
-                break
+                    in_proc_mv_section = stripped.startswith("------")
+                    proc_mv_done = not in_proc_mv_section
+                    if proc_mv_done and not pending_fields:
+                        break
+                continue
+
+            if stripped.startswith("------") and "proc/mv" not in lower:
+                in_proc_mv_section = False
+            else:
+                proc_mv_lines.append(stripped)
+                if len(proc_mv_lines) >= max_proc_mv_lines:
+                    in_proc_mv_section = False
+            if not in_proc_mv_section:
+                proc_mv_done = True
+                if not pending_fields:
+                    break
 
     if not info["mem_total"]:
         info["mem_total"] = mem_total_fallback
@@ -5397,6 +5921,10 @@ def _extract_device_info_from_bugreport(file_path: str, max_proc_mv_lines: int =
     return info
 
 
+_KB_VALUE_WITH_UNIT_PATTERN = re.compile(r"([0-9][0-9,]*)\s*[Kk]\b")
+_KB_VALUE_NUMBER_PATTERN = re.compile(r"([0-9][0-9,]*)")
+
+
 def _parse_kb_value(value) -> Optional[int]:
     if value is None:
         return None
@@ -5406,13 +5934,33 @@ def _parse_kb_value(value) -> Optional[int]:
         except Exception:
             return None
     text = str(value)
-    match = re.search(r"([0-9][0-9,]*)\s*[Kk]\b", text)
+    # 快速路径：取第一段数字；其后紧跟 "kB" 或后面再无 K/k 时，结果与下方两次正则一致
+    size = len(text)
+    start = 0
+    while start < size and not ("0" <= text[start] <= "9"):
+        start += 1
+    if start == size:
+        return None
+    end = start
+    while end < size and ("0" <= text[end] <= "9" or text[end] == ","):
+        end += 1
+    unit = end
+    while unit < size and text[unit].isspace():
+        unit += 1
+    if unit < size and text[unit] in "Kk":
+        after = unit + 1
+        if after == size or (text[after].isascii() and not (text[after].isalnum() or text[after] == "_")):
+            return int(text[start:end].replace(",", ""))
+    elif "K" not in text and "k" not in text:
+        return int(text[start:end].replace(",", ""))
+
+    match = _KB_VALUE_WITH_UNIT_PATTERN.search(text)
     if match:
         try:
             return int(match.group(1).replace(",", ""))
         except Exception:
             return None
-    match = re.search(r"([0-9][0-9,]*)", text)
+    match = _KB_VALUE_NUMBER_PATTERN.search(text)
     if match:
         try:
             return int(match.group(1).replace(",", ""))
@@ -5466,7 +6014,12 @@ def _build_meminfo_summary_bundle(file_path: str, source_desc: str) -> dict:
         raw_meminfo_text = meminfo_summary._load_meminfo_from_file(file_path)
         total_proc = meminfo_summary._parse_total_pss_by_process(raw_meminfo_text)
         oom_categories = meminfo_summary._parse_pss_by_oom(raw_meminfo_text)
-        report_txt = meminfo_summary.generate_report(raw_meminfo_text, source_desc)
+        report_txt = meminfo_summary.generate_report(
+            raw_meminfo_text,
+            source_desc,
+            total_proc=total_proc,
+            oom_categories=oom_categories,
+        )
     except Exception as exc:
         bundle["error"] = f"解析 meminfo 失败: {exc}"
         return bundle
@@ -5666,6 +6219,16 @@ def _match_last_expected_start_sequence(
     return matched_rev
 
 
+_BUGREPORT_DATETIME_PATTERN = re.compile(
+    r"(?P<y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})[-_](?P<h>\d{2})-(?P<mi>\d{2})-(?P<s>\d{2})"
+)
+# bugreport-{device}[-{BUILD...}]-YYYY-MM-DD...；不带日期时退回取 bugreport- 之后的整段
+_BUGREPORT_DEVICE_PATTERN = re.compile(
+    r"bugreport[-_](?P<name>[A-Za-z0-9._-]+?)(?:[-_][A-Z]{2,}[A-Za-z0-9._-]*)?(?:[-_]\d{4}-\d{2}-\d{2})"
+)
+_BUGREPORT_DEVICE_FALLBACK_PATTERN = re.compile(r"bugreport[-_](?P<name>[A-Za-z0-9._-]+)")
+
+
 def _extract_bugreport_datetime_hint(text: str) -> Optional[datetime]:
     """
     从文件名/路径中提取 bugreport 时间戳，支持:
@@ -5674,25 +6237,20 @@ def _extract_bugreport_datetime_hint(text: str) -> Optional[datetime]:
     """
     if not text:
         return None
-    candidates = [
-        r"(?P<y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})[-_](?P<h>\d{2})-(?P<mi>\d{2})-(?P<s>\d{2})",
-    ]
-    for pattern in candidates:
-        match = re.search(pattern, text)
-        if not match:
-            continue
-        try:
-            return datetime(
-                int(match.group("y")),
-                int(match.group("m")),
-                int(match.group("d")),
-                int(match.group("h")),
-                int(match.group("mi")),
-                int(match.group("s")),
-            )
-        except Exception:
-            continue
-    return None
+    match = _BUGREPORT_DATETIME_PATTERN.search(text)
+    if not match:
+        return None
+    try:
+        return datetime(
+            int(match.group("y")),
+            int(match.group("m")),
+            int(match.group("d")),
+            int(match.group("h")),
+            int(match.group("mi")),
+            int(match.group("s")),
+        )
+    except Exception:
+        return None
 
 
 def _strip_wrapped_quotes(text: str) -> str:
@@ -5721,17 +6279,14 @@ def _guess_output_name_from_log_path(file_path: str, fallback_idx: int = 1) -> s
     stem, _ = os.path.splitext(basename)
     now_part = datetime.now().strftime("%m-%d-%H-%M-%S")
 
-    dt_hint = _extract_bugreport_datetime_hint(basename) or _extract_bugreport_datetime_hint(stem)
+    # stem 是 basename 的前缀，basename 上取不到的时间戳在 stem 上也取不到，无需再查一次
+    dt_hint = _extract_bugreport_datetime_hint(basename)
     time_part = dt_hint.strftime("%m-%d-%H-%M-%S") if dt_hint else now_part
 
     device = ""
-    m = re.search(r"bugreport[-_](?P<name>[A-Za-z0-9._-]+?)(?:[-_][A-Z]{2,}[A-Za-z0-9._-]*)?(?:[-_]\d{4}-\d{2}-\d{2})", stem)
+    m = _BUGREPORT_DEVICE_PATTERN.search(stem) or _BUGREPORT_DEVICE_FALLBACK_PATTERN.search(stem)
     if m:
         device = m.group("name")
-    else:
-        m2 = re.search(r"bugreport[-_](?P<name>[A-Za-z0-9._-]+)", stem)
-        if m2:
-            device = m2.group("name")
     if not device:
         parts = [p for p in re.split(r"[-_]+", stem) if p]
         if parts:
@@ -6410,7 +6965,7 @@ def main(
 def _fmt_event_time(event_time: Optional[datetime]) -> str:
     if not isinstance(event_time, datetime):
         return "-"
-    return event_time.strftime("%m-%d %H:%M:%S.%f")[:-3]
+    return _format_ts_ms(event_time)
 
 
 def _extract_kill_reason(event: dict) -> str:
@@ -16,6 +16,7 @@
 """
 
 import datetime
+import heapq
 import os
 import re
 import subprocess
@@ -106,6 +107,21 @@ def _load_meminfo_from_file(path: str) -> str:
 
 # ------------------- 解析器 ------------------- #
 
+# 逐行匹配的正则在模块加载时编译一次
+_PSS_PROC_LINE_RE = re.compile(r"^\s*([\d,]+)K:\s*(.+)$")
+_PSS_CAT_LINE_RE = re.compile(r"^\s*([\d,]+)K:\s*([^(]+)")
+_SWAP_KB_RE = re.compile(r"([\d,]+)K in swap")
+_GLOBAL_STATUS_LINE_RE = re.compile(r"^\s*([A-Za-z0-9 /]+):\s*([\d,]+)K(.*)$")
+
+
+def _parse_swap_kb(line: str) -> Optional[int]:
+    """行内 "xxxK in swap" 的换出量；大多数行不含该字样，先做子串判断再跑正则"""
+    if "K in swap" not in line:
+        return None
+    swap_match = _SWAP_KB_RE.search(line)
+    return _parse_kb(swap_match.group(1)) if swap_match else None
+
+
 def _parse_total_pss_by_process(text: str) -> Dict:
     start = text.find("Total PSS by process")
     if start == -1:
@@ -113,7 +129,7 @@ def _parse_total_pss_by_process(text: str) -> Dict:
 
     lines = text[start:].splitlines()[1:]
     items = []
-    line_re = re.compile(r"^\s*([\d,]+)K:\s*(.+)$")
+    line_re = _PSS_PROC_LINE_RE
 
     for line in lines:
         stripped = line.strip()
@@ -132,14 +148,13 @@ def _parse_total_pss_by_process(text: str) -> Dict:
         pss_kb = _parse_kb(m.group(1))
         remainder = m.group(2)
         proc_name = remainder.split("(pid")[0].strip()
-        swap_match = re.search(r"([\d,]+)K in swap", line)
-        swap_kb = _parse_kb(swap_match.group(1)) if swap_match else None
+        swap_kb = _parse_swap_kb(line)
         items.append({"name": proc_name, "pss_kb": pss_kb, "swap_kb": swap_kb})
 
     total_kb = sum(i["pss_kb"] for i in items)
-    items_sorted = sorted(items, key=lambda x: x["pss_kb"], reverse=True)
     return {
-        "processes": items_sorted[:20],
+        # 只需前 20，nlargest 与 sorted(reverse=True)[:20] 结果（含同值次序）一致
+        "processes": heapq.nlargest(20, items, key=lambda x: x["pss_kb"]),
         "total_pss_kb": total_kb,
         "count": len(items),
     }
@@ -151,8 +166,8 @@ def _parse_pss_by_oom(text: str) -> List[Dict]:
         return []
 
     lines = text[start:].splitlines()[1:]
-    cat_line_re = re.compile(r"^\s*([\d,]+)K:\s*([^(]+)")
-    proc_line_re = re.compile(r"^\s*([\d,]+)K:\s*(.+)$")
+    cat_line_re = _PSS_CAT_LINE_RE
+    proc_line_re = _PSS_PROC_LINE_RE
 
     categories: List[Dict] = []
     current = None
@@ -175,8 +190,7 @@ def _parse_pss_by_oom(text: str) -> List[Dict]:
                 continue
             pss_kb = _parse_kb(m_proc.group(1))
             proc_name = m_proc.group(2).split("(pid")[0].strip()
-            swap_match = re.search(r"([\d,]+)K in swap", line)
-            swap_kb = _parse_kb(swap_match.group(1)) if swap_match else None
+            swap_kb = _parse_swap_kb(line)
             current["processes"].append({"name": proc_name, "pss_kb": pss_kb, "swap_kb": swap_kb})
             continue
 
@@ -185,8 +199,7 @@ def _parse_pss_by_oom(text: str) -> List[Dict]:
             continue
         pss_kb = _parse_kb(m_cat.group(1))
         label = m_cat.group(2).strip()
-        swap_match = re.search(r"([\d,]+)K in swap", line)
-        swap_kb = _parse_kb(swap_match.group(1)) if swap_match else None
+        swap_kb = _parse_swap_kb(line)
         current = {
             "name": label,
             "total_pss_kb": pss_kb,
@@ -197,14 +210,14 @@ def _parse_pss_by_oom(text: str) -> List[Dict]:
 
     for cat in categories:
         cat["process_count"] = len(cat["processes"])
-        cat["top_processes"] = sorted(cat["processes"], key=lambda x: x["pss_kb"], reverse=True)[:5]
+        cat["top_processes"] = heapq.nlargest(5, cat["processes"], key=lambda x: x["pss_kb"])
 
     return categories
 
 
 def _parse_global_status(text: str) -> Dict[str, str]:
     stats: Dict[str, str] = {}
-    line_re = re.compile(r"^\s*([A-Za-z0-9 /]+):\s*([\d,]+)K(.*)$")
+    line_re = _GLOBAL_STATUS_LINE_RE
     for line in text.splitlines():
         m = line_re.match(line)
         if not m:
@@ -375,9 +388,17 @@ def _render_zram(zram: Dict[str, int]) -> List[str]:
     return lines
 
 
-def generate_report(raw_text: str, source_desc: str) -> str:
-    total_proc = _parse_total_pss_by_process(raw_text)
-    oom_categories = _parse_pss_by_oom(raw_text)
+def generate_report(
+    raw_text: str,
+    source_desc: str,
+    total_proc: Optional[Dict] = None,
+    oom_categories: Optional[List[Dict]] = None,
+) -> str:
+    # 调用方已解析过的进程 / OOM 段可直接传入，避免重复解析
+    if total_proc is None:
+        total_proc = _parse_total_pss_by_process(raw_text)
+    if oom_categories is None:
+        oom_categories = _parse_pss_by_oom(raw_text)
     global_stats = _parse_global_status(raw_text)
     zram_stats = _parse_zram(raw_text)
 